@@ -0,0 +1,144 @@
+import numpy as np
+
+import cheby_halley_motor as motor
+
+# ==========================
+# Subdivisión adaptativa (Mariani–Silver)
+# ==========================
+# Se calcula sólo el borde de cada rectángulo. Si todo el borde tiene la misma
+# clasificación el interior se rellena sin iterar; si no, el rectángulo se parte
+# en cuatro (que comparten las líneas medias) y se repite. Los rectángulos se
+# procesan por niveles para evaluar en un solo lote los bordes de todos ellos.
+#
+# Es una aproximación: las cuencas tienen islas (preimágenes del polo dentro de la
+# cuenca de 0, trozos de cuenca entre órbitas que escapan) y una isla que no toque el
+# borde de ningún rectángulo se pierde. Cerca de una isla el número de iteraciones
+# del borde cambia bruscamente aunque la etiqueta no cambie, así que sólo se rellena
+# si además las iteraciones del borde difieren a lo sumo en SALTO_MAX (o son iguales,
+# si el color depende de ellas). `comprobar_adaptativo` cuenta los píxeles que aun así
+# difieren de la fuerza bruta.
+
+LADO_MIN = 4       # por debajo de este lado se calcula el interior completo
+LADO_INICIAL = 64  # rejilla inicial: evita rellenar de golpe regiones enormes
+SALTO_MAX = 1      # diferencia de iteraciones admitida en el borde de un rectángulo relleno
+
+
+def etiquetas_con_iteracion(plano: str, P):
+    """Etiquetas cuyo color depende además del número de iteraciones.
+
+    Para rellenar un rectángulo de una de estas etiquetas el borde tiene que
+    coincidir también en las iteraciones; para el resto basta la etiqueta.
+    """
+    if plano == "parametros":
+        return (motor.CUENCA0, motor.ESCAPE, motor.PERIODICO)
+    if P.color_escape_mode.lower() == "hsv":
+        return (motor.ESCAPE, motor.POLO, motor.PERIODICO)
+    return (motor.PERIODICO,)
+
+
+def _borde(x0, y0, x1, y1):
+    """Índices (i, j) del borde del rectángulo inclusivo [x0, x1] x [y0, y1]."""
+    xs = np.arange(x0, x1 + 1)
+    ys = np.arange(y0 + 1, y1)
+    i = np.concatenate([xs, xs, np.full(ys.size, x0), np.full(ys.size, x1)])
+    j = np.concatenate([np.full(xs.size, y0), np.full(xs.size, y1), ys, ys])
+    return i, j
+
+
+def _cortes(n: int, lado: int):
+    return list(range(0, n - 1, lado)) + [n - 1]
+
+
+def clasificar_adaptativo(plano: str, P, progress_cb=None, stop_flag=None, lado_min: int = LADO_MIN,
+                          lado_inicial: int = LADO_INICIAL, contador: dict = None):
+    """Clasifica el plano ("dinamico" o "parametros") por subdivisión adaptativa.
+
+    Devuelve (etiquetas, iteraciones) como los motores por fuerza bruta, o None si
+    se cancela. En los rectángulos rellenos de etiquetas cuyo color no depende de
+    las iteraciones, éstas se toman como el mínimo del borde. Si se pasa `contador`, en
+    contador["evaluados"] queda el número de órbitas calculadas.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    pixeles = motor.PIXELES[plano]
+    con_iter = etiquetas_con_iteracion(plano, P)
+    W, H = P.width, P.height
+    etiquetas = np.zeros((H, W), dtype=np.uint8)
+    iteraciones = np.zeros((H, W), dtype=np.int32)
+    hecho = np.zeros((H, W), dtype=bool)
+    evaluados = 0
+
+    def evaluar(i, j):
+        nonlocal evaluados
+        nuevo = ~hecho[j, i]
+        i, j = i[nuevo], j[nuevo]
+        if i.size == 0:
+            return
+        # un mismo píxel puede estar en el borde de dos rectángulos vecinos
+        lin = np.unique(j * W + i)
+        j, i = np.divmod(lin, W)
+        etiquetas[j, i], iteraciones[j, i] = pixeles(P, i, j)
+        hecho[j, i] = True
+        evaluados += i.size
+
+    xs = _cortes(W, lado_inicial)
+    ys = _cortes(H, lado_inicial)
+    rects = [(x0, y0, x1, y1) for x0, x1 in zip(xs, xs[1:] or xs) for y0, y1 in zip(ys, ys[1:] or ys)]
+    while rects:
+        if stop_flag and stop_flag():
+            return None
+        bordes = [_borde(*r) for r in rects]
+        evaluar(np.concatenate([b[0] for b in bordes]), np.concatenate([b[1] for b in bordes]))
+
+        siguientes = []
+        interiores = []
+        for (x0, y0, x1, y1), (bi, bj) in zip(rects, bordes):
+            if x1 - x0 < 2 or y1 - y0 < 2:
+                continue   # sin interior
+            e = etiquetas[bj, bi]
+            n = iteraciones[bj, bi]
+            salto = 0 if e[0] in con_iter else SALTO_MAX
+            uniforme = (e == e[0]).all() and n.max() - n.min() <= salto
+            if uniforme:
+                etiquetas[y0+1:y1, x0+1:x1] = e[0]
+                iteraciones[y0+1:y1, x0+1:x1] = n.min()
+                hecho[y0+1:y1, x0+1:x1] = True
+            elif x1 - x0 <= lado_min or y1 - y0 <= lado_min:
+                interiores.append((x0 + 1, y0 + 1, x1 - 1, y1 - 1))
+            else:
+                xm = (x0 + x1) // 2
+                ym = (y0 + y1) // 2
+                siguientes += [(x0, y0, xm, ym), (xm, y0, x1, ym), (x0, ym, xm, y1), (xm, ym, x1, y1)]
+
+        if interiores:
+            ii, jj = [], []
+            for x0, y0, x1, y1 in interiores:
+                j, i = np.mgrid[y0:y1 + 1, x0:x1 + 1]
+                ii.append(i.ravel())
+                jj.append(j.ravel())
+            evaluar(np.concatenate(ii), np.concatenate(jj))
+
+        rects = siguientes
+        if progress_cb:
+            progress_cb(int(hecho.sum()), W * H)
+
+    if contador is not None:
+        contador["evaluados"] = evaluados
+    return etiquetas, iteraciones
+
+
+def comprobar_adaptativo(plano: str, P, lado_min: int = LADO_MIN, lado_inicial: int = LADO_INICIAL) -> dict:
+    """Compara la subdivisión adaptativa con la fuerza bruta sobre el mismo plano."""
+    contador = {}
+    e_a, n_a = clasificar_adaptativo(plano, P, lado_min=lado_min, lado_inicial=lado_inicial, contador=contador)
+    e_b, n_b = (motor.clasificar_dinamico(P) if plano == "dinamico" else motor.clasificar_parametros(P))
+    con_iter = np.isin(e_b, etiquetas_con_iteracion(plano, P))
+    distintos = (e_a != e_b) | (con_iter & (n_a != n_b))
+    total = P.width * P.height
+    return {
+        "pixeles": total,
+        "evaluados": contador["evaluados"],
+        "ahorro": total / max(1, contador["evaluados"]),
+        "distintos": int(distintos.sum()),
+        "fraccion_distintos": float(distintos.sum()) / total,
+    }
@@ -0,0 +1,120 @@
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+import cheby_halley_motor as motor
+
+# ==========================
+# Salida por bandas con memoria acotada
+# ==========================
+# Para imágenes que no caben en memoria (carteles de decenas de miles de píxeles de
+# lado) el plano se calcula en bandas horizontales. Cada banda se colorea y se
+# comprime al PNG en cuanto está lista, así que la memoria usada depende del tamaño
+# de la banda y no del de la imagen. Opcionalmente la clasificación completa se
+# vuelca a los .npy de cheby_halley_datos, abiertos como memmap.
+
+PIXELES_POR_BANDA = 1 << 18   # alto de banda por defecto: unas 256 K órbitas por banda
+
+
+class EscritorPNG:
+    """PNG RGB de 8 bits escrito fila a fila (filtro 0, un IDAT por bloque comprimido)."""
+
+    def __init__(self, ruta: str, width: int, height: int, nivel: int = 6):
+        self.width, self.height = width, height
+        self.filas = 0
+        self._f = open(ruta, "wb")
+        self._z = zlib.compressobj(nivel)
+        self._f.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, tipo: bytes, datos: bytes):
+        self._f.write(struct.pack(">I", len(datos)))
+        self._f.write(tipo)
+        self._f.write(datos)
+        self._f.write(struct.pack(">I", zlib.crc32(datos, zlib.crc32(tipo))))
+
+    def escribir(self, rgb):
+        """Añade las filas de un array (h, width, 3) uint8."""
+        h = rgb.shape[0]
+        filas = np.zeros((h, 1 + 3 * self.width), dtype=np.uint8)   # primer byte: filtro 0
+        filas[:, 1:] = rgb.reshape(h, -1)
+        datos = self._z.compress(filas.tobytes())
+        if datos:
+            self._chunk(b"IDAT", datos)
+        self.filas += h
+
+    def cerrar(self):
+        if self._f.closed:
+            return
+        try:
+            if self.filas == self.height:
+                self._chunk(b"IDAT", self._z.flush())
+                self._chunk(b"IEND", b"")
+        finally:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def alto_banda(width: int) -> int:
+    return max(1, PIXELES_POR_BANDA // max(1, width))
+
+
+def escribir_por_bandas(plano: str, P, ruta: str, colorear, alto: int = None, workers: int = 1,
+                        progress_cb=None, stop_flag=None, datos=None, stats=None):
+    """Calcula el plano ("dinamico" o "parametros") por bandas y lo escribe en `ruta` (PNG).
+
+    `colorear(etiquetas, iteraciones, j0)` devuelve el RGB (h, width, 3) de la banda
+    que empieza en la fila j0. Con workers > 1 cada banda se reparte por columnas
+    entre procesos. Si se pasa `datos` (un par de arrays, p. ej. memmaps de
+    cheby_halley_datos.crear) se copia en ellos la clasificación de cada banda. Con
+    `stats` (cheby_halley_estadisticas.Estadisticas) se cuentan los resultados y se
+    cronometran el cálculo y la codificación; el color lo cronometra `colorear`.
+    Devuelve False si se cancela (el PNG queda incompleto).
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    tesela = motor.TESELAS[plano]
+    alto = alto or alto_banda(P.width)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    Pw = SimpleNamespace(**vars(P))   # copia sin la clase de P, que puede no importarse en los procesos
+    try:
+        with EscritorPNG(ruta, P.width, P.height) as png:
+            for j0 in range(0, P.height, alto):
+                if stop_flag and stop_flag():
+                    return False
+                j1 = min(j0 + alto, P.height)
+                t0 = time.perf_counter()
+                if pool:
+                    cortes = np.linspace(0, P.width, workers + 1).astype(int)
+                    partes = list(pool.map(tesela, [Pw] * workers, cortes[:-1], cortes[1:],
+                                           [j0] * workers, [j1] * workers))
+                    etiquetas = np.hstack([p[0] for p in partes])
+                    iteraciones = np.hstack([p[1] for p in partes])
+                else:
+                    etiquetas, iteraciones = tesela(P, 0, P.width, j0, j1)
+                if stats is not None:
+                    stats.sumar_tiempo("calculo", time.perf_counter() - t0)
+                    stats.contar(etiquetas, iteraciones)
+                if datos is not None:
+                    datos[0][j0:j1] = etiquetas
+                    datos[1][j0:j1] = iteraciones
+                rgb = colorear(etiquetas, iteraciones, j0)
+                t0 = time.perf_counter()
+                png.escribir(rgb)
+                if stats is not None:
+                    stats.sumar_tiempo("codificacion", time.perf_counter() - t0)
+                if progress_cb:
+                    progress_cb(j1, P.height)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return True
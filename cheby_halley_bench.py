@@ -0,0 +1,222 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cheby_halley_motores as motores
+
+# ==========================
+# Banco de pruebas de rendimiento
+# ==========================
+# Mide cada motor y número de procesos sobre unas escenas fijas: los planos
+# dinámicos de imagenes/ para α = -0.3, 0.2+0.1i y 3.2+0.2i y el plano de
+# parámetros por defecto, a una fracción de su tamaño. Cada caso se ejecuta en un
+# proceso nuevo para que el pico de memoria (RSS) sea sólo suyo. La imagen se
+# compara (por hash) con las referencias guardadas, y los resultados en JSON se
+# pueden comparar con los de otra ejecución para detectar pérdidas de velocidad.
+# Se listan todos los motores de cheby_halley_motores; los que no están instalados
+# aparecen como «no disponible», sin medir, y los no exactos (precisión simple) como
+# «aproximado» si su imagen no coincide con la referencia, sin que cuente como fallo.
+
+REFERENCIAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_referencias.json")
+ESCALA = 0.25
+
+ESCENAS = {
+    "dinamico_-0.3_+0.0": ("dinamico", {"alpha_re": -0.3, "alpha_im": 0.0}),
+    "dinamico_+0.2_+0.1": ("dinamico", {"alpha_re": 0.2, "alpha_im": 0.1}),
+    "dinamico_+3.2_+0.2": ("dinamico", {"alpha_re": 3.2, "alpha_im": 0.2}),
+    "parametros": ("parametros", {}),
+}
+
+
+def _plano(escena: str, escala: float):
+    """Parámetros de la escena a la escala pedida (sin caché: se mide el cálculo)."""
+    tipo, campos = ESCENAS[escena]
+    if tipo == "dinamico":
+        from cheby_halley_nucleo import Params
+        P = Params(**campos, use_cache=False)
+    else:
+        from cheby_halley_parametros import PlanoParametros
+        P = PlanoParametros(**campos, use_cache=False)
+    P.width = max(2, round(P.width * escala))
+    P.height = max(2, round(P.height * escala))
+    return tipo, P
+
+
+def _caso(escena: str, escala: float, motor: str, workers: int) -> dict:
+    """Render de una escena; se ejecuta en un proceso propio."""
+    tipo, P = _plano(escena, escala)
+    t0 = time.perf_counter()
+    if tipo == "dinamico":
+        from cheby_halley_nucleo import render_plane
+        P.engine, P.workers = motor, workers
+        img = render_plane(P)
+    else:
+        from cheby_halley_parametros import construir_imagen
+        img = construir_imagen(P, motor=motor, workers=workers)
+    segundos = time.perf_counter() - t0
+    rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)   # en KB en Linux
+    return {
+        "pixeles": P.width * P.height,
+        "segundos": segundos,
+        "rss_mb": round(rss / 1024, 1),
+        "hash": hashlib.sha256(img.tobytes()).hexdigest(),
+    }
+
+
+def _iteraciones(escena: str, escala: float) -> int:
+    """Iteraciones de órbita de toda la escena (iguales para todos los motores)."""
+    import cheby_halley_motor as motor
+    tipo, P = _plano(escena, escala)
+    if tipo == "dinamico":
+        _, it = motor.clasificar_dinamico(P)
+    else:
+        _, it = motor.clasificar_parametros(P)
+    return int(it.sum(dtype="int64"))
+
+
+def _en_proceso(fn, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def ejecutar(escenas=None, nombres=None, workers=(1,), escala: float = ESCALA,
+             repeticiones: int = 1, progress_cb=None) -> dict:
+    """Mide todos los casos y devuelve el informe (ver el formato en el README).
+
+    `nombres` son los motores a medir (por defecto todos los registrados).
+    """
+    referencias = {}
+    if os.path.exists(REFERENCIAS):
+        with open(REFERENCIAS, encoding="utf-8") as f:
+            referencias = json.load(f)
+    nombres = nombres or motores.nombres()
+    # el bucle escalar no se reparte entre procesos: con varios se usaría numpy
+    casos = [(e, m, w) for e in (escenas or list(ESCENAS)) for m in nombres for w in workers
+             if motores.usa_arrays(m) or w == 1]
+    iteraciones = {}
+    resultados = []
+    for escena, motor, w in casos:
+        if not motores.MOTORES[motor].disponible():
+            r = {"escena": escena, "motor": motor, "workers": w, "referencia": "no disponible"}
+            resultados.append(r)
+            if progress_cb:
+                progress_cb(r)
+            continue
+        if escena not in iteraciones:
+            iteraciones[escena] = _en_proceso(_iteraciones, escena, escala)
+        medidas = [_en_proceso(_caso, escena, escala, motor, w) for _ in range(repeticiones)]
+        mejor = min(medidas, key=lambda m: m["segundos"])
+        ref = referencias.get(f"{escena}@{escala}")
+        r = {
+            "escena": escena,
+            "motor": motor,
+            "workers": w,
+            "pixeles": mejor["pixeles"],
+            "segundos": round(mejor["segundos"], 4),
+            "pixeles_s": round(mejor["pixeles"] / mejor["segundos"], 1),
+            "iteraciones_s": round(iteraciones[escena] / mejor["segundos"], 1),
+            "rss_mb": max(m["rss_mb"] for m in medidas),
+            "hash": mejor["hash"],
+            "referencia": "sin referencia" if ref is None else "ok" if ref == mejor["hash"] else
+                          "distinta" if motores.exacto(motor) else "aproximado",
+        }
+        resultados.append(r)
+        if progress_cb:
+            progress_cb(r)
+    versiones = {}
+    for paquete in ("numpy", "numba"):
+        try:
+            versiones[paquete] = __import__(paquete).__version__
+        except ImportError:
+            versiones[paquete] = None
+    return {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        **versiones,
+        "motores": {m: motores.MOTORES[m].disponible() for m in motores.nombres()},
+        "cpus": os.cpu_count(),
+        "escala": escala,
+        "resultados": resultados,
+    }
+
+
+def guardar_referencias(informe: dict):
+    """Toma los hashes del informe como nuevas referencias de sus escenas."""
+    referencias = {}
+    if os.path.exists(REFERENCIAS):
+        with open(REFERENCIAS, encoding="utf-8") as f:
+            referencias = json.load(f)
+    for r in informe["resultados"]:
+        if "hash" in r and motores.exacto(r["motor"]):
+            referencias[f"{r['escena']}@{informe['escala']}"] = r["hash"]
+    with open(REFERENCIAS, "w", encoding="utf-8") as f:
+        json.dump(referencias, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def comparar(anterior: dict, actual: dict, tolerancia: float = 0.1):
+    """Casos comunes a los dos informes: (caso, velocidad relativa, ¿más lento de la cuenta?)."""
+    def clave(r):
+        return r["escena"], r["motor"], r["workers"], r["pixeles"]
+    medidos = [r for r in actual["resultados"] if "pixeles_s" in r]
+    previos = {clave(r): r for r in anterior["resultados"] if "pixeles_s" in r}
+    filas = []
+    for r in medidos:
+        p = previos.get(clave(r))
+        if p:
+            ratio = r["pixeles_s"] / p["pixeles_s"]
+            filas.append((clave(r), ratio, ratio < 1 - tolerancia))
+    return filas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento de los motores")
+    parser.add_argument('--scenes', nargs='+', choices=list(ESCENAS), help='Escenas a medir (por defecto todas)')
+    parser.add_argument('--engines', nargs='+', choices=motores.nombres(),
+                        help='Motores a medir (por defecto todos; los no instalados se listan sin medir)')
+    parser.add_argument('--workers', nargs='+', type=int,
+                        help='Números de procesos a probar (por defecto 1 y el número de CPUs)')
+    parser.add_argument('--scale', type=float, default=ESCALA, help='Fracción del tamaño de cada escena')
+    parser.add_argument('--repeat', type=int, default=1, help='Repeticiones por caso (se toma la más rápida)')
+    parser.add_argument('--out', default='bench_resultados.json', help='Fichero JSON de resultados')
+    parser.add_argument('--compare', metavar='ANTERIOR.json', help='Compara con los resultados de otra ejecución')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Pérdida de velocidad tolerada con --compare (0.1 = 10%%)')
+    parser.add_argument('--update-references', action='store_true',
+                        help='Guarda los hashes de esta ejecución como referencias')
+    ns = parser.parse_args()
+    workers = ns.workers or sorted({1, os.cpu_count() or 1})
+
+    def linea(r):
+        if "pixeles_s" not in r:
+            print(f"{r['escena']:<20} {r['motor']:<7} x{r['workers']:<3} {'':>12}      {'':>14}       "
+                  f"{'':>8}     {r['referencia']}")
+            return
+        print(f"{r['escena']:<20} {r['motor']:<7} x{r['workers']:<3} {r['pixeles_s']:>12.0f} px/s "
+              f"{r['iteraciones_s']:>14.0f} it/s {r['rss_mb']:>8.1f} MB  {r['referencia']}")
+
+    informe = ejecutar(ns.scenes, ns.engines, workers, ns.scale, ns.repeat, linea)
+    with open(ns.out, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    print(f"Resultados en: {ns.out}")
+    if ns.update_references:
+        guardar_referencias(informe)
+        print(f"Referencias actualizadas en: {REFERENCIAS}")
+
+    fallos = any(r["referencia"] == "distinta" for r in informe["resultados"])
+    if ns.compare:
+        with open(ns.compare, encoding="utf-8") as f:
+            anterior = json.load(f)
+        for (escena, motor, w, _), ratio, lento in comparar(anterior, informe, ns.tolerance):
+            print(f"{escena:<20} {motor:<7} x{w:<3} x{ratio:.2f}{'  ¡MÁS LENTO!' if lento else ''}")
+            fallos |= lento
+    sys.exit(1 if fallos else 0)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+import cheby_halley_motor as motor
+import cheby_halley_motores as motores
+
+# ==========================
+# Caché persistente de teselas
+# ==========================
+# Cada tesela calculada (etiquetas + iteraciones) se guarda en disco con un nombre
+# que es el hash de los campos de los parámetros que influyen en el cálculo, así
+# que los colores, las marcas o el directorio de salida no invalidan la caché. El
+# motor sólo forma parte del nombre si no es exacto (precisión simple): los exactos
+# comparten las teselas.
+# El tamaño total está acotado: al superarlo se borran las teselas usadas hace
+# más tiempo (la fecha de modificación del fichero se renueva en cada acierto)
+# hasta bajar a NIVEL_BAJO del límite, para que con la caché llena no haya que
+# recorrer el directorio en cada tesela nueva.
+
+DIRECTORIO = os.environ.get("CHEBY_HALLEY_CACHE",
+                            os.path.join(os.path.expanduser("~"), ".cache", "cheby_halley"))
+LIMITE_MB = float(os.environ.get("CHEBY_HALLEY_CACHE_MB", 512))
+NIVEL_BAJO = 0.9   # fracción del límite hasta la que se expulsa
+VERSION = 3   # cambiarla invalida todas las teselas guardadas
+
+# Campos de los parámetros que determinan la clasificación de cada plano
+CAMPOS = {
+    "dinamico": ("alpha_re", "alpha_im", "x_min", "x_max", "y_min", "y_max", "width", "height",
+                 "iter_max", "eps", "escape", "basin2_mode", "detect_cycles", "cycle_tol", "basin_radii"),
+    "parametros": ("x_min", "x_max", "y_min", "y_max", "width", "height",
+                   "iter_max", "eps", "detect_cycles", "cycle_tol"),
+}
+
+
+def clave(plano: str, P, tesela) -> str:
+    """Hash canónico de los campos de cálculo de P y del rectángulo de la tesela."""
+    datos = {f: getattr(P, f) for f in CAMPOS[plano]}
+    datos.update(plano=plano, tesela=list(tesela), version=VERSION)
+    if not motores.exacto(getattr(P, "engine", "numpy")):
+        datos["motor"] = P.engine
+    texto = json.dumps(datos, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+class CacheTeselas:
+    """Teselas en disco con límite de tamaño y expulsión LRU.
+
+    `aciertos` y `fallos` cuentan las consultas desde que se creó el objeto.
+    """
+
+    def __init__(self, directorio: str = DIRECTORIO, limite_mb: float = LIMITE_MB):
+        self.directorio = directorio
+        self.limite = int(limite_mb * 1024 * 1024)
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+        os.makedirs(directorio, exist_ok=True)
+        self._total = sum(os.path.getsize(f) for f in self._ficheros())
+
+    def _ruta(self, k: str) -> str:
+        return os.path.join(self.directorio, k[:2], k + ".npz")
+
+    def _ficheros(self):
+        for raiz, _, nombres in os.walk(self.directorio):
+            for n in nombres:
+                if n.endswith(".npz"):
+                    yield os.path.join(raiz, n)
+
+    def get(self, k: str):
+        """(etiquetas, iteraciones) de la tesela, o None si no está."""
+        ruta = self._ruta(k)
+        try:
+            with np.load(ruta) as datos:
+                res = datos["etiquetas"], datos["iteraciones"]
+            os.utime(ruta)
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.fallos += 1
+            return None
+        with self._lock:
+            self.aciertos += 1
+        return res
+
+    def put(self, k: str, etiquetas, iteraciones):
+        ruta = self._ruta(k)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, etiquetas=etiquetas, iteraciones=iteraciones)
+        os.replace(tmp, ruta)
+        with self._lock:
+            self._total += os.path.getsize(ruta)
+            if self._total > self.limite:
+                self._expulsar()
+
+    def _expulsar(self):
+        ficheros = []
+        for f in self._ficheros():
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            ficheros.append((st.st_mtime, st.st_size, f))
+        ficheros.sort()
+        self._total = sum(t for _, t, _ in ficheros)
+        for _, tam, f in ficheros:
+            if self._total <= NIVEL_BAJO * self.limite:
+                break
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+            self._total -= tam
+
+    def vaciar(self):
+        for f in list(self._ficheros()):
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+        with self._lock:
+            self._total = 0
+
+
+_cache = None
+
+
+def cache_por_defecto() -> CacheTeselas:
+    """Caché compartida por todos los renders del proceso."""
+    global _cache
+    if _cache is None:
+        _cache = CacheTeselas()
+    return _cache
+
+
+def clasificar_con_cache(plano: str, P, cache: CacheTeselas = None, progress_cb=None, stop_flag=None,
+                         lado: int = motor.LADO_TESELA):
+    """Clasifica el plano tesela a tesela, reutilizando las que ya están en la caché."""
+    if hasattr(P, "finalize"):
+        P.finalize()
+    cache = cache or cache_por_defecto()
+    tesela = motor.TESELAS[plano]
+    etiquetas = np.empty((P.height, P.width), dtype=np.uint8)
+    iteraciones = np.empty((P.height, P.width), dtype=np.int32)
+    lista = motor.teselas(P.width, P.height, lado)
+    for hechas, t in enumerate(lista, 1):
+        if stop_flag and stop_flag():
+            return None
+        i0, i1, j0, j1 = t
+        k = clave(plano, P, t)
+        res = cache.get(k)
+        if res is None:
+            res = tesela(P, i0, i1, j0, j1)
+            cache.put(k, *res)
+        etiquetas[j0:j1, i0:i1], iteraciones[j0:j1, i0:i1] = res
+        if progress_cb:
+            progress_cb(hechas, len(lista))
+    return etiquetas, iteraciones
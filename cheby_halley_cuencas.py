@@ -0,0 +1,254 @@
+import math
+from functools import lru_cache
+
+import cheby_halley_nucleo as nucleo   # se importan el uno al otro: sólo nucleo.<nombre> dentro de funciones
+
+# ==========================
+# Cuencas inmediatas: radios seguros para cortar órbitas
+# ==========================
+# Para cada alpha se calculan discos en los que el destino de la órbita ya es seguro:
+#
+# - Alrededor de 0 (superatractor de grado 3). Con |c| = |2(alpha - 1)| y |z| <= r,
+#   |O(z)| <= |z|^3 (r + |c|) / (1 - |c| r). Con r <= 1/2, |c| r <= 1/2 y
+#   r^2 (1/2 + |c|) <= 1/4 se cumple |O(z)| <= |z| / 2: el disco es invariante y la
+#   órbita acaba en |z| < eps.
+# - Alrededor de cada punto fijo f atractor (s1, s2 y 1), a partir de su multiplicador
+#   λ = O'(f). Con w = z - f y A = |1 - c f|, desarrollando el numerador en w,
+#   O(z) - f = λ w + w^2 (p2 + λ c + p3 w + w^2) / (1 - c f - c w), con
+#   p2 = 3 f (f - c) + 3 f^2 y p3 = 4 f - c. Para |w| <= ρ <= min(1, A / (2|c|)) basta
+#   ρ (|p2 + λ c| + (|p3| + 1) ρ) <= κ A / 2, con κ = (1 - |λ|)/2, para que
+#   |O(z) - f| <= (1 + |λ|)/2 |w|: el disco es invariante y la órbita converge a f.
+#
+# Los discos se recortan para que la órbita no pueda pasar a menos de eps de otro
+# objetivo ni escapar: una órbita que entra en uno acaba con el resultado del disco.
+# En los de los puntos fijos que no son objetivos no se resolvería nunca y el
+# resultado es «desconocido» con iter_max iteraciones, idéntico al de la iteración
+# completa. En el disco de 0 y en los de los objetivos de la cuenca 2 falta además
+# saber en qué iteración quedaría a menos de eps, y si llegaría antes de iter_max:
+# pasos_cero y pasos_fijo acotan ese número de pasos y la órbita sólo se corta cuando
+# la cota lo fija y cabe en las iteraciones que quedan (si no, se sigue iterando).
+#
+# - En 0 se itera un intervalo [lo, hi] de |z| con |z|^3 (|c| ± |z|) / (1 ∓ |c| |z|).
+# - En f, |w'| = |λ| |w| (1 ± x) con x = |w| B / |λ|, B la cota de |w'- λ w| / |w|^2
+#   en el disco. Como |w| se reduce al menos en (1 + |λ|)/2 por paso, la suma de los
+#   log(1 ± x) es como mucho E = x / ((1 - x)(1 - (1 + |λ|)/2)), y el número de pasos
+#   hasta eps queda entre (L - E) / ℓ y (L + E) / ℓ, L = log(|w| / eps), ℓ = -log|λ|.
+#
+# Las dos cotas dejan una holgura por paso para el redondeo de la iteración (ulp es
+# la precisión del motor).
+#
+# Alrededor de infinito no se corta: las iteraciones hasta escapar dan el color.
+#
+# Con la detección de ciclos no se usan: el método de Brent podría dar el ciclo por
+# detectado antes de llegar a eps del punto fijo.
+#
+# radio_cero, radio_fijo, pasos_cero y pasos_fijo sólo usan aritmética, abs(), _log,
+# _menor y _mayor, así que valen tanto para valores sueltos como para arrays de numpy
+# (un radio por píxel del plano de parámetros, las distancias de las órbitas activas).
+
+MARGEN = 0.9   # se reduce cada radio para cubrir el redondeo de la iteración
+PASO_DISCOS = 8   # plano de parámetros: iteraciones entre comprobaciones de los discos
+ULP = 2.0 ** -52   # precisión de la iteración (float64); el motor float32 pasa la suya
+
+CUENCA0, CUENCA1, DESCONOCIDO = 1, 2, 0   # etiquetas de cheby_halley_motor
+
+
+def _max(x, y):
+    return (x + y + abs(x - y)) / 2
+
+
+def _min(x, y):
+    return (x + y - abs(x - y)) / 2
+
+
+# _min y _max pierden precisión si un valor es mucho mayor que el otro; en las cotas
+# de pasos se usan las de math o numpy según el tipo
+def _log(x):
+    if isinstance(x, float):
+        return math.log(x)
+    import numpy as np
+    return np.log(x)
+
+
+def _menor(x, y: float):
+    if isinstance(x, float):
+        return min(x, y)
+    import numpy as np
+    return np.minimum(x, y)
+
+
+def _mayor(x, y: float):
+    if isinstance(x, float):
+        return max(x, y)
+    import numpy as np
+    return np.maximum(x, y)
+
+
+def _numerador_multiplicador(f, c):
+    # O'(f) = (4 f^3 - 3 c f^2 + c f) / (1 - c f) en un punto fijo f (f^3 (f - c) = f (1 - c f))
+    return 4*f**3 - 3*c*f*f + c*f
+
+
+def radio_cero(c, eps: float, objetivos=()):
+    """Radio del disco alrededor de 0 que sólo lleva a |z| < eps."""
+    ac = abs(c)
+    r = _min(1 / (2 * _max(1.0, ac)), 1 / (2 * (0.5 + ac) ** 0.5))
+    for t in objetivos:
+        r = _min(r, abs(t) - 2*eps)   # sin pasar a menos de eps de otro objetivo
+    return _max(MARGEN * r, 0.0)
+
+
+def radio_fijo(f, c, eps: float, escape: float, evitar=()):
+    """Radio del disco alrededor del punto fijo f en el que la órbita converge a f.
+
+    0 si f no es atractor. El disco queda a más de eps de 0 y de los puntos de
+    `evitar`, y dentro de |z| < escape.
+    """
+    ac = abs(c)
+    af = abs(f)
+    A = _max(abs(1 - c*f), 1e-300)   # A = 0: f es el polo, no un punto fijo
+    lam = _numerador_multiplicador(f, c) / A   # sólo interesa |λ|
+    kappa = _max((1 - abs(lam)) / 2, 0.0)
+    k2 = abs(3*f*(f - c) + 3*f*f) + abs(lam)*ac   # cota de |p2 + λ c|
+    k3 = abs(4*f - c) + 1
+    # raíz positiva de k3 ρ^2 + k2 ρ - κ A / 2 = 0, sin cancelación
+    rho = kappa * A / _max(k2 + (k2*k2 + 2*k3*kappa*A) ** 0.5, 1e-300)
+    rho = _min(rho, A / _max(A, 2*ac))   # min(1, A / (2|c|)): |1 - c z| >= A/2
+    rho = _min(rho, af - 2*eps)
+    rho = _min(rho, escape - af - eps)
+    for t in evitar:
+        rho = _min(rho, abs(f - t) - 2*eps)
+    return _max(MARGEN * rho, 0.0)
+
+
+@lru_cache(maxsize=64)
+def cotas_cero(c, r: float, eps: float, ulp: float = ULP):
+    """Constantes de pasos_cero para el disco de radio r <= radio_cero alrededor de 0."""
+    # |O(z)| <= |z| / 2 en el disco: en n pasos hi baja de r a menos de eps
+    n = int(math.log(max(r, eps) / eps) / math.log(1.9)) + 2
+    return abs(c), 16*ulp, n
+
+
+def pasos_cero(m, cotas, eps: float):
+    """(j_min, j_max): pasos hasta |z| < eps desde |z| = m en el disco de cotas_cero.
+
+    El número de pasos está fijado si j_min == j_max; si no, hay que seguir iterando.
+    """
+    ac, h, n = cotas
+    lo = hi = m
+    j_min = j_max = 0
+    for _ in range(n):
+        sigue = hi >= eps
+        if not (sigue.any() if hasattr(sigue, "any") else sigue):
+            break
+        j_min = j_min + (lo >= eps)
+        j_max = j_max + sigue
+        hi, lo = (hi**3 * (hi + ac) / (1 - ac*hi) * (1 + h),
+                  lo**3 * _mayor(_mayor(ac - hi, lo - ac), 0.0) / (1 + ac*hi) * (1 - h))
+    return j_min, j_max
+
+
+@lru_cache(maxsize=64)
+def cotas_fijo(f, c, r: float, eps: float, ulp: float = ULP):
+    """Constantes de pasos_fijo para el disco de radio r <= radio_fijo alrededor de f."""
+    ac = abs(c)
+    A = abs(1 - c*f)
+    lam = abs(_numerador_multiplicador(f, c)) / max(A, 1e-300)
+    if not 1e-300 < lam < 1 - 1e-12 or A <= ac*r:
+        return 1e30, 0.5, 1.0, 0.0   # sin contracción utilizable: los pasos nunca quedan fijados
+    B = (abs(3*f*(f - c) + 3*f*f) + lam*ac + abs(4*f - c)*r + r*r) / (A - ac*r)
+    # el redondeo desplaza z en unos ulp de |f|, que a |w| >= eps pesan (|f| + 1) / eps
+    return min(B / lam, 1e30), (1 + lam) / 2, -math.log(lam), 8*ulp*(1 + (abs(f) + 1) / eps)
+
+
+def pasos_fijo(d, cotas, eps: float):
+    """(j_min, j_max): pasos hasta |z - f| < eps desde |z - f| = d >= eps en el disco de
+    cotas_fijo. El número de pasos está fijado si j_min == j_max."""
+    b, q, ell, h = cotas
+    # con x >= 1 no hay cota: x = 0.999 la deja más ancha que un paso
+    x = _menor(d*b, 0.999)
+    E = x / ((1 - x) * (1 - q))
+    L = _log(d / eps)
+    E = E + h * ((L + E) / ell + 1)
+    return (L - E) // ell + 1, (L + E) // ell + 1
+
+
+@lru_cache(maxsize=64)
+def radios_dinamico(a: complex, eps: float, escape: float, basin2_mode: str = "s12"):
+    """Radios de parada del plano dinámico de alpha = a: (r0, objetivos, otros).
+
+    Sustituyen a eps en las comprobaciones de la iteración: la órbita va a CUENCA0
+    si |z| < r0 y a CUENCA1 si |z - t| < ρ para algún (t, ρ) de objetivos (s1 y s2,
+    o 1 con basin2_mode="one"); todos son al menos eps. Si |z - f| < ρ para algún
+    (f, ρ) de otros (puntos fijos atractores que no son objetivos) la órbita no se
+    resolvería nunca.
+    """
+    c = 2*(a - 1)
+    s1, s2 = nucleo.extra_fixed_points(a)
+    uno = 1+0j
+    puntos = (uno,) if basin2_mode == "one" else (s1, s2)
+    objetivos = tuple((t, max(eps, radio_fijo(t, c, eps, escape, [u for u in puntos if u != t])))
+                      for t in puntos)
+    otros = []
+    for f in (s1, s2, uno):
+        if f not in puntos:
+            rho = radio_fijo(f, c, eps, escape, puntos)
+            if rho > 0:
+                otros.append((f, rho))
+    return max(eps, radio_cero(c, eps, puntos)), objetivos, tuple(otros)
+
+
+def discos_parametros(a: complex, eps: float):
+    """(f, ρ) de los puntos fijos atractores para la órbita crítica de alpha = a.
+
+    En el plano de parámetros sólo cuentan |z| < eps y |z| > 1/eps, así que una
+    órbita que entra en uno de estos discos termina como desconocida.
+    """
+    c = 2*(a - 1)
+    discos = []
+    for f in nucleo.extra_fixed_points(a) + (1+0j,):
+        if abs(_numerador_multiplicador(f, c)) < abs(1 - c*f):   # atractor: |O'(f)| < 1
+            rho = radio_fijo(f, c, eps, 1/eps)
+            if rho > 0:
+                discos.append((f, rho))
+    return discos
+
+
+def comprobar_radios(plano: str, P) -> dict:
+    """Compara la clasificación (motor numpy) con y sin cuencas inmediatas.
+
+    Cuenta los píxeles cuyo color cambiaría: distinta etiqueta o, en las etiquetas
+    cuyo color depende de ellas, distintas iteraciones.
+    """
+    import time
+    from dataclasses import replace
+    import numpy as np
+    import cheby_halley_motor as motor
+    from cheby_halley_adaptativo import etiquetas_con_iteracion
+    if hasattr(P, "finalize"):
+        P.finalize()
+
+    def clasificar(radios: bool, contador: dict):
+        Q = replace(P, basin_radii=radios)
+        if plano == "dinamico":
+            zr, zi = motor.puntos_dinamico(Q, 0, Q.width)
+            return motor.iterar_dinamico(zr, zi, complex(Q.alpha_re, Q.alpha_im), Q, contador)
+        ar, ai = motor.puntos_parametros(Q, 0, Q.width)
+        return motor.iterar_parametros(ar, ai, Q.iter_max, Q.eps, Q.detect_cycles, Q.cycle_tol, radios, contador)
+
+    contador = {}
+    t0 = time.perf_counter()
+    e_a, n_a = clasificar(False, {})
+    t1 = time.perf_counter()
+    e_b, n_b = clasificar(True, contador)
+    t2 = time.perf_counter()
+    con_iter = np.isin(e_a, etiquetas_con_iteracion(plano, P))
+    distintos = (e_a != e_b) | (con_iter & (n_a != n_b))
+    return {
+        "pixeles": P.width * P.height,
+        "cortadas": contador.get("cortadas", 0),
+        "distintos": int(distintos.sum()),
+        "segundos_sin": t1 - t0,
+        "segundos_con": t2 - t1,
+        "aceleracion": (t1 - t0) / max(t2 - t1, 1e-9),
+    }
@@ -0,0 +1,99 @@
+import json
+import os
+
+import numpy as np
+
+# ==========================
+# Clasificación en bruto: exportar y recolorear
+# ==========================
+# La etiqueta y el número de iteraciones de cada píxel se guardan en dos .npy
+# (se pueden abrir con mmap sin leerlos enteros) junto a un .json con los
+# parámetros del render. Con eso basta para volver a colorear la imagen sin
+# iterar ninguna órbita.
+#
+#   <base>.json               plano, parámetros y nombres de los arrays
+#   <base>.etiquetas.npy      uint8  (height, width), constantes de cheby_halley_motor
+#   <base>.iteraciones.npy    int32  (height, width)
+#   <base>.suavizado.npz      opcional: submuestras de los píxeles de borde
+#                             (j, i, etiquetas, iteraciones; ver cheby_halley_suavizado)
+
+FORMATO = 1
+
+
+def _rutas(base: str):
+    return base + ".json", base + ".etiquetas.npy", base + ".iteraciones.npy"
+
+
+def crear(base: str, plano: str, forma, params: dict, extra: dict = None):
+    """Crea los ficheros de una clasificación vacía y devuelve sus arrays como memmaps.
+
+    Sirve para volcar por partes clasificaciones que no caben en memoria.
+    """
+    ruta_json, ruta_etq, ruta_it = _rutas(base)
+    directorio = os.path.dirname(ruta_json)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    forma = tuple(forma)
+    etiquetas = np.lib.format.open_memmap(ruta_etq, mode="w+", dtype=np.uint8, shape=forma)
+    iteraciones = np.lib.format.open_memmap(ruta_it, mode="w+", dtype=np.int32, shape=forma)
+    datos = {
+        "formato": FORMATO,
+        "plano": plano,
+        "forma": list(forma),
+        "etiquetas": os.path.basename(ruta_etq),
+        "iteraciones": os.path.basename(ruta_it),
+        "params": params,
+        **(extra or {}),
+    }
+    with open(ruta_json, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+    return etiquetas, iteraciones
+
+
+def guardar(base: str, plano: str, etiquetas, iteraciones, params: dict, muestras=None) -> str:
+    """Guarda la clasificación con `base` como prefijo; devuelve la ruta del .json.
+
+    `muestras` son las submuestras de borde de cheby_halley_suavizado.submuestrear, si las hay.
+    """
+    extra = None
+    if muestras is not None:
+        ruta_npz = base + ".suavizado.npz"
+        j, i, sub_e, sub_n = muestras
+        np.savez(ruta_npz, j=j, i=i, etiquetas=sub_e, iteraciones=sub_n)
+        extra = {"suavizado": os.path.basename(ruta_npz)}
+    etq, it = crear(base, plano, etiquetas.shape, params, extra)
+    etq[...] = etiquetas
+    it[...] = iteraciones
+    etq.flush()
+    it.flush()
+    return _rutas(base)[0]
+
+
+def cargar(ruta_json: str, mmap: bool = True):
+    """(plano, params, etiquetas, iteraciones) de una clasificación guardada.
+
+    Los colores vuelven como tuplas; con `mmap` los arrays se abren en sólo lectura
+    sin cargarlos en memoria.
+    """
+    with open(ruta_json, encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("formato") != FORMATO:
+        raise ValueError(f"Formato de datos no soportado: {datos.get('formato')}")
+    directorio = os.path.dirname(ruta_json)
+    modo = "r" if mmap else None
+    etiquetas = np.load(os.path.join(directorio, datos["etiquetas"]), mmap_mode=modo)
+    iteraciones = np.load(os.path.join(directorio, datos["iteraciones"]), mmap_mode=modo)
+    if list(etiquetas.shape) != datos["forma"] or etiquetas.shape != iteraciones.shape:
+        raise ValueError("Los arrays no coinciden con la forma del fichero de datos")
+    params = {k: tuple(v) if isinstance(v, list) else v for k, v in datos["params"].items()}
+    return datos["plano"], params, etiquetas, iteraciones
+
+
+def cargar_suavizado(ruta_json: str):
+    """Submuestras de borde guardadas junto a la clasificación, o None si no las hay."""
+    with open(ruta_json, encoding="utf-8") as f:
+        datos = json.load(f)
+    if "suavizado" not in datos:
+        return None
+    with np.load(os.path.join(os.path.dirname(ruta_json), datos["suavizado"])) as npz:
+        return npz["j"], npz["i"], npz["etiquetas"], npz["iteraciones"]
@@ -1,147 +1,49 @@
 import argparse
-import colorsys
-import cmath
 import os
 import sys
 import time
-from dataclasses import dataclass
-from typing import Tuple
-from PIL import Image, ImageDraw
-import tkinter as tk
-from tkinter import ttk
 
-# ==========================
-# Modelo de parámetros
-# ==========================
-@dataclass
-class Params:
-    alpha_re: float = 0.0
-    alpha_im: float = 0.0
-    x_min: float = -2.5
-    x_max: float = 1.5
-    y_min: float = -2.5
-    y_max: float = 1.5
-    width: int = 1400
-    height: int = 800
-    iter_max: int = 300
-    eps: float = 1e-3
-    escape: float = None  # si None, se usa 1/eps
-    color_basin0: Tuple[int,int,int] = (250,208,36)   # oro
-    color_basin1: Tuple[int,int,int] = (34,209,185)   # turquesa
-    color_unknown: Tuple[int,int,int] = (40,40,40)    # gris
-    color_escape_mode: str = "hsv"                   # "hsv" o un color fijo hexadecimal
-    basin2_mode: str = "s12"                         # "s12" o "one" (1 como segundo atractor)
-    draw_s12: bool = True                            # dibujar s1/s2 como cuadrados
-    draw_marks: bool = True                          # dibujar marcas de 0 y 1
-    outdir: str = "imagenes"
-    filename_prefix: str = "dinamico"
-
-    def finalize(self):
-        if self.escape is None:
-            self.escape = 1.0 / self.eps
-
-# ==========================
-# Utilidades de color
-# ==========================
-def hex_to_rgb255(s: str) -> Tuple[int,int,int]:
-    s = s.strip()
-    if s.startswith('#'):
-        s = s[1:]
-    if len(s) == 3:
-        s = ''.join(ch*2 for ch in s)
-    if len(s) != 6:
-        raise ValueError("Hex color inválido")
-    r = int(s[0:2], 16)
-    g = int(s[2:4], 16)
-    b = int(s[4:6], 16)
-    return (r,g,b)
-
-def hsv_to_rgb255(h: float, s: float, v: float) -> Tuple[int,int,int]:
-    r, g, b = colorsys.hsv_to_rgb(h, s, v)
-    return (int(255*r), int(255*g), int(255*b))
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motores as motores
+from cheby_halley_nucleo import (Params, colorize, draw_marks, hex_to_rgb255, image_name, phase, render_arrays,
+                                 render_plane)
 
-# ==========================
-# Dinámica compleja
-# ==========================
-def O_alpha(z: complex, a: complex) -> complex:
-    num = z**3 * (z - 2*(a - 1))
-    den = 1 - 2*(a - 1)*z
-    if abs(den) < 1e-10:
-        return complex(float("inf"), 0.0)
-    return num/den
-
-def extra_fixed_points(a: complex) -> Tuple[complex, complex]:
-    disc = cmath.sqrt(4*a*a - 12*a + 5)
-    return (2*a - 3 - disc)/2, (2*a - 3 + disc)/2
+# El modelo de parámetros y el cálculo están en cheby_halley_nucleo (sin Tk ni
+# Pillow al importarlo); aquí sólo quedan la salida por bandas, la línea de
+# comandos y la GUI básica, que importa tkinter al abrirse.
 
 # ==========================
-# Render
+# Salida por bandas
 # ==========================
-def classify_color(z0: complex, a: complex, P: Params):
-    z = z0
-    s1, s2 = extra_fixed_points(a)
-    for k in range(1, P.iter_max + 1):
-        if abs(z) < P.eps:
-            return P.color_basin0
-        if P.basin2_mode == "one":
-            if abs(z - 1) < P.eps:
-                return P.color_basin1
-        else:  # s1/s2
-            if abs(z - s1) < P.eps or abs(z - s2) < P.eps:
-                return P.color_basin1
-        if abs(z) > P.escape:
-            if P.color_escape_mode.lower() == "hsv":
-                h = (k % 90) / 90.0
-                return hsv_to_rgb255(h, 0.85, 1.0)
-            else:
-                # color fijo vía hex
-                try:
-                    return hex_to_rgb255(P.color_escape_mode)
-                except Exception:
-                    return (0,0,0)
-        z = O_alpha(z, a)
-    return P.color_unknown
-
-
-def px_to_complex(i: int, j: int, P: Params) -> complex:
-    re = P.x_min + (i / (P.width - 1))  * (P.x_max - P.x_min)
-    im = P.y_min + (j / (P.height - 1)) * (P.y_max - P.y_min)
-    return complex(re, im)
-
-
-def complex_to_px(z: complex, P: Params):
-    x = int((z.real - P.x_min) / (P.x_max - P.x_min) * (P.width - 1))
-    y = int((z.imag - P.y_min) / (P.y_max - P.y_min) * (P.height - 1))
-    return x, y
-
-
-def render_plane(P: Params) -> Image.Image:
+def stream_plane(P: Params, band_rows: int = None, save_data: bool = False, stats=None) -> str:
+    """Calcula el plano por bandas y las va escribiendo al PNG (memoria acotada por la banda).
+
+    Devuelve la ruta de la imagen. Usa un motor de arrays (numpy o numba); con save_data
+    la clasificación se vuelca por bandas a los .npy de cheby_halley_datos.
+    """
+    import dataclasses
+    import numpy as np
+    from PIL import Image
+    import cheby_halley_bandas as bandas
+    import cheby_halley_motor as motor
     P.finalize()
-    a = complex(P.alpha_re, P.alpha_im)
-
-    img = Image.new("RGB", (P.width, P.height), color=(0, 0, 0))
-    put = img.putpixel
-
-    for i in range(P.width):
-        for j in range(P.height):
-            z0 = px_to_complex(i, j, P)
-            put((i, j), classify_color(z0, a, P))
-
-    draw = ImageDraw.Draw(img)
+    ensure_outdir(P.outdir)
+    path = os.path.join(P.outdir, image_name(P))
+    datos = None
+    if save_data:
+        import cheby_halley_datos
+        datos = cheby_halley_datos.crear(os.path.splitext(path)[0], "dinamico", (P.height, P.width),
+                                         dataclasses.asdict(P))
 
-    # Marcas
-    if P.draw_marks:
-        # 0 y 1 como círculos
-        for pf, r in [(0+0j, 6), (1+0j, 6)]:
-            cx, cy = complex_to_px(pf, P)
-            draw.ellipse((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
-    if P.draw_s12:
-        s1, s2 = extra_fixed_points(a)
-        for pf, r in [(s1, 5), (s2, 5)]:
-            cx, cy = complex_to_px(pf, P)
-            draw.rectangle((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
+    def colorear(etiquetas, iteraciones, j0):
+        with phase(stats, "color"):
+            img = Image.fromarray(motor.colorear_dinamico(etiquetas, iteraciones, P), "RGB")
+        with phase(stats, "marcas"):
+            draw_marks(img, P, y0=j0)
+        return np.asarray(img)
 
-    return img
+    bandas.escribir_por_bandas("dinamico", P, path, colorear, band_rows, P.workers, datos=datos, stats=stats)
+    return path
 
 
 # ==========================
@@ -163,25 +65,72 @@ def build_parser():
     p.add_argument('--color-basin0', type=str, help='Hex (#RRGGBB) o por defecto oro')
     p.add_argument('--color-basin1', type=str, help='Hex (#RRGGBB) o por defecto teal')
     p.add_argument('--color-unknown', type=str, help='Hex, por defecto gris #282828')
-    p.add_argument('--color-escape', type=str, default='hsv', help='"hsv" o hex fijo')
+    p.add_argument('--color-escape', type=str, help='"hsv" (por defecto) o hex fijo')
     p.add_argument('--basin2-mode', choices=['s12','one'], default='s12')
     p.add_argument('--draw-s12', action='store_true')
     p.add_argument('--no-draw-s12', action='store_true')
     p.add_argument('--no-draw-marks', action='store_true')
     p.add_argument('--outdir', type=str)
     p.add_argument('--filename-prefix', type=str)
+    p.add_argument('--engine', choices=motores.nombres(), default='python',
+                   help='"python" (píxel a píxel), "numpy" (vectorial), "numba" (compilado; sin numba, python) '
+                        'o "float32" (vectorial en precisión simple, aproximado)')
+    p.add_argument('--workers', type=int, default=1,
+                   help='Procesos para render por teselas (>1 usa en cada proceso numpy, o numba si se elige)')
+    p.add_argument('--adaptive', action='store_true',
+                   help='Subdivisión adaptativa: sólo itera bordes de rectángulos y rellena los uniformes '
+                        '(aproximada: puede perder islas que no toquen ningún borde; ver --check-adaptive)')
+    p.add_argument('--check-adaptive', action='store_true',
+                   help='Compara la subdivisión adaptativa con la fuerza bruta y muestra el informe')
+    p.add_argument('--detect-cycles', action='store_true',
+                   help='Detecta ciclos atractores y colorea esos puntos según su periodo')
+    p.add_argument('--cycle-tol', type=float, help='Tolerancia de la detección de ciclos (por defecto 1e-6)')
+    p.add_argument('--no-basin-radii', action='store_true',
+                   help='No cortar las órbitas que entran en la cuenca inmediata de 0, s1/s2 o 1')
+    p.add_argument('--check-basins', action='store_true',
+                   help='Compara la clasificación con y sin cuencas inmediatas y muestra el informe')
+    p.add_argument('--check-precision', action='store_true',
+                   help='Compara el motor float32 con la doble precisión y muestra el informe')
+    p.add_argument('--no-cache', action='store_true',
+                   help='No usar la caché de teselas (directorio en $CHEBY_HALLEY_CACHE, límite en $CHEBY_HALLEY_CACHE_MB)')
+    p.add_argument('--checkpoint', metavar='FICHERO.npz',
+                   help='Guarda el estado de las órbitas sin resolver; si el fichero ya existe y sólo cambia '
+                        'iter_max (mayor), continúa desde él en vez de empezar de cero (usa numpy)')
+    p.add_argument('--save-data', action='store_true',
+                   help='Guarda también etiquetas e iteraciones (.npy + .json) para recolorear sin recalcular')
+    p.add_argument('--recolor', type=str, metavar='DATOS.json',
+                   help='Colorea una clasificación guardada con --save-data (sólo aplica colores y marcas)')
+    p.add_argument('--stream', action='store_true',
+                   help='Escribe la imagen por bandas horizontales con memoria acotada (imágenes enormes)')
+    p.add_argument('--stats', nargs='?', const='-', metavar='FICHERO',
+                   help='Añade una línea JSON con tiempos por fase, resultados e histograma (por defecto a stdout)')
+    p.add_argument('--band-rows', type=int, help='Filas por banda con --stream (por defecto ~256K píxeles por banda)')
+    p.add_argument('--antialias', type=int, metavar='N',
+                   help='Suaviza los bordes con N x N submuestras sólo en los píxeles de borde (usa numpy)')
     return p
 
 
 def args_to_params(ns: argparse.Namespace) -> Params:
     P = Params()
     for f in ['alpha_re','alpha_im','x_min','x_max','y_min','y_max','width','height',
-              'iter_max','eps','escape','color_escape_mode','basin2_mode','outdir','filename_prefix']:
+              'iter_max','eps','escape','color_escape_mode','basin2_mode','outdir','filename_prefix','engine','workers','adaptive',
+              'detect_cycles','cycle_tol','antialias']:
         v = getattr(ns, f.replace('-', '_'), None)
         if v is not None:
             setattr(P, f if hasattr(P,f) else f.replace('-', '_'), v)
 
-    # colores
+    apply_color_args(ns, P)
+    if ns.no_cache:
+        P.use_cache = False
+    if ns.no_basin_radii:
+        P.basin_radii = False
+    return P
+
+
+def apply_color_args(ns: argparse.Namespace, P: Params):
+    """Opciones que sólo afectan al coloreado (también valen para --recolor)."""
+    if ns.color_escape:
+        P.color_escape_mode = ns.color_escape
     if ns.color_basin0:
         P.color_basin0 = hex_to_rgb255(ns.color_basin0)
     if ns.color_basin1:
@@ -189,7 +138,6 @@ def args_to_params(ns: argparse.Namespace) -> Params:
     if ns.color_unknown:
         P.color_unknown = hex_to_rgb255(ns.color_unknown)
 
-    # flags
     if ns.no_draw_marks:
         P.draw_marks = False
     if ns.draw_s12:
@@ -197,16 +145,14 @@ def args_to_params(ns: argparse.Namespace) -> Params:
     if ns.no_draw_s12:
         P.draw_s12 = False
 
-    return P
-
 
 def ensure_outdir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def save_image(img: Image.Image, P: Params) -> str:
+def save_image(img, P: Params) -> str:
     ts = time.strftime('%Y%m%d_%H%M%S')
-    fname = f"{P.filename_prefix}_{P.alpha_re:+.1f}_{P.alpha_im:+.1f}.png"
+    fname = image_name(P)
     ensure_outdir(P.outdir)
     full = os.path.join(P.outdir, fname)
     img.save(full)
@@ -215,6 +161,8 @@ def save_image(img: Image.Image, P: Params) -> str:
 
 # --------- GUI (Tkinter) ---------
 def launch_gui_and_get_params() -> Params:
+    import tkinter as tk
+    from tkinter import ttk
 
     P = Params()
 
@@ -234,6 +182,8 @@ def launch_gui_and_get_params() -> Params:
         ("color_escape_mode", "hsv"),
         ("basin2_mode", P.basin2_mode),
         ("outdir", P.outdir), ("filename_prefix", P.filename_prefix),
+        ("engine", P.engine), ("workers", P.workers), ("cycle_tol", P.cycle_tol),
+        ("antialias", P.antialias),
     ]
 
     row = 0
@@ -251,6 +201,9 @@ def launch_gui_and_get_params() -> Params:
     draw_s12_var = tk.BooleanVar(value=P.draw_s12)
     ttk.Checkbutton(frm, text="Dibujar s1/s2", variable=draw_s12_var).grid(column=0, row=row, columnspan=2, sticky='w'); row+=1
 
+    detect_cycles_var = tk.BooleanVar(value=P.detect_cycles)
+    ttk.Checkbutton(frm, text="Detectar ciclos", variable=detect_cycles_var).grid(column=0, row=row, columnspan=2, sticky='w'); row+=1
+
     def on_ok():
         try:
             P.alpha_re = float(entries['alpha_re'].get())
@@ -276,9 +229,15 @@ def launch_gui_and_get_params() -> Params:
 
             P.outdir = entries['outdir'].get().strip() or P.outdir
             P.filename_prefix = entries['filename_prefix'].get().strip() or P.filename_prefix
+            engine = entries['engine'].get().strip().lower()
+            P.engine = engine if engine in motores.MOTORES else 'python'
+            P.workers = int(entries['workers'].get())
+            P.cycle_tol = float(entries['cycle_tol'].get())
+            P.antialias = int(entries['antialias'].get())
 
             P.draw_marks = bool(draw_marks_var.get())
             P.draw_s12 = bool(draw_s12_var.get())
+            P.detect_cycles = bool(detect_cycles_var.get())
         except Exception as e:
             import tkinter.messagebox as mb
             mb.showerror("Error en parámetros", str(e))
@@ -302,14 +261,97 @@ def main(argv=None):
     # Si no hay argumentos, lanzar GUI
     use_gui = (len(sys.argv) == 1)
 
+    if not use_gui and ns.recolor:
+        import cheby_halley_datos as datos
+        t0 = time.perf_counter()
+        plano, params, etiquetas, iteraciones = datos.cargar(ns.recolor)
+        if plano != "dinamico":
+            parser.error(f"{ns.recolor} no contiene un plano dinámico")
+        P = Params(**params)
+        apply_color_args(ns, P)
+        if ns.outdir:
+            P.outdir = ns.outdir
+        if ns.filename_prefix:
+            P.filename_prefix = ns.filename_prefix
+        samples = datos.cargar_suavizado(ns.recolor)
+        img = colorize((etiquetas, iteraciones) if samples is None else (etiquetas, iteraciones, samples), P)
+        draw_marks(img, P)
+        path = save_image(img, P)
+        print(f"Imagen recoloreada en {time.perf_counter() - t0:.2f} s: {path}")
+        return
+
     if use_gui:
         P = launch_gui_and_get_params()
     else:
         P = args_to_params(ns)
 
-    img = render_plane(P)
-    path = save_image(img, P)
+    if not use_gui and ns.check_adaptive:
+        import cheby_halley_adaptativo as adaptativo
+        rep = adaptativo.comprobar_adaptativo("dinamico", P)
+        print(f"Órbitas calculadas: {rep['evaluados']} de {rep['pixeles']} (x{rep['ahorro']:.1f} menos)")
+        print(f"Píxeles distintos de la fuerza bruta: {rep['distintos']} ({100*rep['fraccion_distintos']:.4f}%)")
+        return
+
+    if not use_gui and ns.check_basins:
+        rep = cuencas.comprobar_radios("dinamico", P)
+        print(f"Tiempo sin cuencas inmediatas: {rep['segundos_sin']:.2f} s, con ellas: {rep['segundos_con']:.2f} s "
+              f"(x{rep['aceleracion']:.2f})")
+        print(f"Órbitas cortadas antes: {rep['cortadas']} de {rep['pixeles']}")
+        print(f"Píxeles distintos: {rep['distintos']}")
+        return
+
+    if not use_gui and ns.check_precision:
+        import cheby_halley_simple as simple
+        rep = simple.comprobar_precision("dinamico", P)
+        print(f"Tiempo en doble precisión: {rep['segundos_doble']:.2f} s, en simple: {rep['segundos_simple']:.2f} s "
+              f"(x{rep['aceleracion']:.2f})")
+        print(f"Memoria del resultado: {rep['bytes_compacto']} bytes compacto, {rep['bytes_doble']} bytes con RGB")
+        print(f"Píxeles con distinta etiqueta: {rep['distinta_etiqueta']}")
+        print(f"Píxeles de distinto color: {rep['distintos']} ({100*rep['fraccion_distintos']:.4f}%)")
+        return
+
+    stats = None
+    if not use_gui and ns.stats:
+        from cheby_halley_estadisticas import Estadisticas
+        stats = Estadisticas(P.iter_max)
+
+    if not use_gui and ns.stream and P.antialias > 1:
+        parser.error("--antialias no está disponible con --stream")
+    if not use_gui and ns.stream and ns.checkpoint:
+        parser.error("--checkpoint no está disponible con --stream")
+    if not use_gui and ns.stream:
+        path = stream_plane(P, ns.band_rows, ns.save_data, stats)
+        if ns.save_data:
+            print(f"Datos de la clasificación en: {os.path.splitext(path)[0]}.json")
+    elif not use_gui and ns.save_data:
+        import dataclasses
+        import cheby_halley_datos as datos
+        img, data = render_arrays(P, stats=stats, checkpoint=ns.checkpoint)
+        with phase(stats, "marcas"):
+            draw_marks(img, P)
+        with phase(stats, "codificacion"):
+            path = save_image(img, P)
+        ruta = datos.guardar(os.path.splitext(path)[0], "dinamico", data[0], data[1], dataclasses.asdict(P),
+                             data[2] if len(data) > 2 else None)
+        print(f"Datos de la clasificación en: {ruta}")
+    else:
+        img = render_plane(P, stats=stats, checkpoint=None if use_gui else ns.checkpoint)
+        with phase(stats, "codificacion"):
+            path = save_image(img, P)
     print(f"Imagen guardada en: {path}")
+    if not use_gui and ns.checkpoint:
+        print(f"Estado de la iteración en: {ns.checkpoint}")
+    if stats is not None:
+        line = stats.json(alpha=[P.alpha_re, P.alpha_im], width=P.width, height=P.height,
+                          engine=P.engine, workers=P.workers)
+        if ns.stats == '-':
+            print(line)
+        else:
+            with open(ns.stats, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+    if 'cheby_halley_cache' in sys.modules and sys.modules['cheby_halley_cache']._cache:
+        c = sys.modules['cheby_halley_cache']._cache
+        print(f"Caché de teselas: {c.aciertos} aciertos, {c.fallos} fallos")
 
 
 if __name__ == '__main__':
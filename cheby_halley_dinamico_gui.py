@@ -1,172 +1,74 @@
+import queue
 import threading
 import time
 import os
-import colorsys
-import cmath
-from dataclasses import dataclass
-from typing import Tuple, Optional
-from PIL import Image, ImageTk, ImageDraw
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from types import SimpleNamespace
+from typing import Optional
+from PIL import Image, ImageTk
 
 import tkinter as tk
 from tkinter import ttk, filedialog, colorchooser, messagebox
 
-# ==========================
-# Modelo de parámetros
-# ==========================
-@dataclass
-class Params:
-    alpha_re: float = -0.3
-    alpha_im: float = 0.0
-    x_min: float = -2.0
-    x_max: float = 3.0
-    y_min: float = -2.0
-    y_max: float = 2.0
-    width: int = 900
-    height: int = 600
-    iter_max: int = 300
-    eps: float = 1e-3
-    escape: Optional[float] = None  # None => 1/eps
-
-    color_basin0: Tuple[int,int,int] = (250,208,36)   # oro
-    color_basin1: Tuple[int,int,int] = (34,209,185)   # teal
-    color_unknown: Tuple[int,int,int] = (40,40,40)    # gris oscuro
-    color_escape_mode: str = "hsv"                   # "hsv" o un hex "#RRGGBB"
-
-    basin2_mode: str = "s12"                         # "s12" o "one"
-    draw_marks: bool = True                          # dibujar 0 y 1
-    draw_s12: bool = True                            # dibujar s1/s2
-
-    outdir: str = "imagenes"
-    filename_prefix: str = "dinamico"
-
-    def finalize(self):
-        if self.escape is None or self.escape == 0:
-            self.escape = 1.0 / float(self.eps)
-
-# ==========================
-# Utilidades de color
-# ==========================
-
-def hex_to_rgb255(s: str) -> Tuple[int,int,int]:
-    s = s.strip()
-    if s.startswith('#'):
-        s = s[1:]
-    if len(s) == 3:
-        s = ''.join(ch*2 for ch in s)
-    if len(s) != 6:
-        raise ValueError("Color hex inválido")
-    r = int(s[0:2], 16)
-    g = int(s[2:4], 16)
-    b = int(s[4:6], 16)
-    return (r,g,b)
-
-def rgb255_to_hex(rgb: Tuple[int,int,int]) -> str:
-    r,g,b = rgb
-    return f"#{r:02X}{g:02X}{b:02X}"
-
-# ==========================
-# Dinámica compleja
-# ==========================
-
-def O_alpha(z: complex, a: complex) -> complex:
-    num = z**3 * (z - 2*(a - 1))
-    den = 1 - 2*(a - 1)*z
-    if abs(den) < 1e-10:
-        return complex(float("inf"), 0.0)
-    return num/den
-
-def extra_fixed_points(a: complex):
-    disc = cmath.sqrt(4*a*a - 12*a + 5)
-    return (2*a - 3 - disc)/2, (2*a - 3 + disc)/2
+import cheby_halley_motores as motores
+from cheby_halley_nucleo import (Params, colorize, compute_plane, draw_marks, hex_to_rgb255, image_name, phase,
+                                 render_plane, render_region, rgb255_to_hex, supersample, uses_arrays)
 
 # ==========================
-# Render (píxel a píxel)
+# GUI
 # ==========================
 
-def classify_color(z0: complex, a: complex, P: Params):
-    z = z0
-    s1, s2 = extra_fixed_points(a)
-    for k in range(1, P.iter_max + 1):
-        if abs(z) < P.eps:
-            return P.color_basin0
-        if P.basin2_mode == "one":
-            if abs(z - 1) < P.eps:
-                return P.color_basin1
-        else:
-            if abs(z - s1) < P.eps or abs(z - s2) < P.eps:
-                return P.color_basin1
-        if abs(z) > P.escape:
-            if P.color_escape_mode.lower() == "hsv":
-                h = (k % 90) / 90.0
-                r,g,b = colorsys.hsv_to_rgb(h, 0.85, 1.0)
-                return (int(255*r), int(255*g), int(255*b))
-            else:
-                try:
-                    return hex_to_rgb255(P.color_escape_mode)
-                except Exception:
-                    return (0,0,0)
-        z = O_alpha(z, a)
-    return P.color_unknown
-
+# Vista con la que se abre la interfaz (los demás campos, los de Params)
+INITIAL_VIEW = dict(alpha_re=-0.3, x_min=-2.0, x_max=3.0, y_min=-2.0, y_max=2.0, width=900, height=600)
 
-def px_to_complex(i: int, j: int, P: Params) -> complex:
-    re = P.x_min + (i / (P.width - 1))  * (P.x_max - P.x_min)
-    im = P.y_min + (j / (P.height - 1)) * (P.y_max - P.y_min)
-    return complex(re, im)
+ZOOM_STEP = 0.8   # factor del rango por cada paso de la rueda (acercar)
 
+# Plano de parámetros enlazado (panel derecho)
+PARAM_SIZE = (300, 240)   # misma proporción que el plano de 1500x1200 de cheby_halley_parametros
+THUMB_WIDTH = 300         # ancho de la vista previa del plano dinámico al pasar el ratón
+THUMB_MEMO = 512          # vistas previas guardadas (una por píxel del plano de parámetros)
+HOVER_DELAY_MS = 40       # espera antes de calcular la vista previa del α bajo el ratón
 
-def complex_to_px(z: complex, P: Params):
-    x = int((z.real - P.x_min) / (P.x_max - P.x_min) * (P.width - 1))
-    y = int((z.imag - P.y_min) / (P.y_max - P.y_min) * (P.height - 1))
-    return x, y
+# Render en curso
+POLL_MS = 20              # cada cuánto se pintan las teselas terminadas y el progreso
+EDIT_DELAY_MS = 150       # espera tras la última tecla antes de recalcular al editar
+LIVE_FIELDS = ('alpha_re', 'alpha_im', 'x_min', 'x_max', 'y_min', 'y_max')
 
-
-def render_plane(P: Params, progress_cb=None, stop_flag=None) -> Image.Image:
-    P.finalize()
-    a = complex(P.alpha_re, P.alpha_im)
-    img = Image.new("RGB", (P.width, P.height), color=(0, 0, 0))
-    put = img.putpixel
-
-    for i in range(P.width):
-        if stop_flag and stop_flag():
-            return None
-        for j in range(P.height):
-            z0 = px_to_complex(i, j, P)
-            put((i, j), classify_color(z0, a, P))
-        if progress_cb:
-            progress_cb(i+1, P.width)
-
-    draw = ImageDraw.Draw(img)
-
-    # Marcas
-    if P.draw_marks:
-        for pf, r in [(0+0j, 6), (1+0j, 6)]:
-            cx, cy = complex_to_px(pf, P)
-            draw.ellipse((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
-    if P.draw_s12:
-        s1, s2 = extra_fixed_points(a)
-        for pf, r in [(s1, 5), (s2, 5)]:
-            cx, cy = complex_to_px(pf, P)
-            draw.rectangle((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
-
-    return img
-
-# ==========================
-# GUI
-# ==========================
+# Campos que sólo afectan al coloreado: cambiarlos no obliga a recalcular
+COLOR_FIELDS = ('color_basin0', 'color_basin1', 'color_unknown', 'color_escape_mode', 'draw_marks', 'draw_s12')
 
 class App:
     def __init__(self, root):
         self.root = root
         self.root.title("Plano dinámico – Interfaz")
-        self.P = Params()
-        self.worker = None
-        self.stop_req = False
+        self.P = Params(**INITIAL_VIEW)
+        self.job = None                # render en curso (ver _start_job)
+        self.gen = 0
+        self._tiles = None                     # MemoTeselas de los renders (cheby_halley_teselas)
+        self._edit_after = None                # render pendiente de la edición en vivo
+        self._quiet = False                    # los campos se escriben desde el programa, no al editar
         self.current_image: Optional[Image.Image] = None
+        self.current_base: Optional[Image.Image] = None   # current_image sin marcas
+        self.current_data = None               # (etiquetas, iteraciones[, submuestras]) de current_base, si las hay
+        self.last_stats = None                 # Estadisticas del último render, si se pidieron
+        self.checkpoint = None                 # estado de las órbitas sin resolver (cheby_halley_reanudar)
+        self.view_P: Optional[Params] = None   # parámetros de current_image (su tamaño incluido)
+        self._disp = None                      # (escala, x0, y0) de la imagen en el canvas
+        self._drag = None
+        self.current_full = False      # current_image está a resolución completa
+        self.save_after_render = False
         self.tk_img = None
+        self._param = None                     # (PlanoParametros, imagen) del panel, o la excepción
+        self._thumbs = OrderedDict()           # clave de cálculo -> (etiquetas, iteraciones), LRU
+        self._thumb_want = None                # parámetros de la vista previa que se quiere ver
+        self._thumb_job = None
+        self._hover_after = None
 
         self._build_ui()
+        self._build_param_panel()
         self._update_preview_placeholder()
+        self._start_param_plane()
 
     # ---------- UI layout ----------
     def _build_ui(self):
@@ -214,6 +116,7 @@ class App:
         add_entry("iter_max", 'iter_max', self.P.iter_max)
         add_entry("eps", 'eps', self.P.eps)
         add_entry("escape (vacío=1/eps)", 'escape', "")
+        add_entry("cycle_tol", 'cycle_tol', self.P.cycle_tol)
 
         ttk.Separator(ctrl).pack(fill='x', pady=4)
         ttk.Label(ctrl, text="Colores", font=('TkDefaultFont', 10, 'bold')).pack(anchor='w')
@@ -247,6 +150,27 @@ class App:
         ttk.Checkbutton(ctrl, text="Dibujar 0 y 1", variable=self.draw_marks).pack(anchor='w')
         self.draw_s12 = tk.BooleanVar(value=self.P.draw_s12)
         ttk.Checkbutton(ctrl, text="Dibujar s1/s2", variable=self.draw_s12).pack(anchor='w')
+        self.detect_cycles = tk.BooleanVar(value=self.P.detect_cycles)
+        ttk.Checkbutton(ctrl, text="Detectar ciclos (color por periodo)", variable=self.detect_cycles).pack(anchor='w')
+        self.basin_radii = tk.BooleanVar(value=self.P.basin_radii)
+        ttk.Checkbutton(ctrl, text="Cortar órbitas en cuencas inmediatas", variable=self.basin_radii).pack(anchor='w')
+
+        ttk.Separator(ctrl).pack(fill='x', pady=4)
+        ttk.Label(ctrl, text="Motor", font=('TkDefaultFont', 10, 'bold')).pack(anchor='w')
+        self.engine = tk.StringVar(value=self.P.engine)
+        for name in motores.nombres():
+            m = motores.MOTORES[name]
+            text = f"{name}: {m.descripcion}" + ("" if m.disponible() else " (no instalado)")
+            ttk.Radiobutton(ctrl, text=text, variable=self.engine, value=name,
+                            state='normal' if m.disponible() else 'disabled').pack(anchor='w')
+        add_entry("workers", 'workers', self.P.workers)
+        add_entry("antialias (N×N)", 'antialias', self.P.antialias)
+        self.adaptive = tk.BooleanVar(value=self.P.adaptive)
+        ttk.Checkbutton(ctrl, text="Subdivisión adaptativa", variable=self.adaptive).pack(anchor='w')
+        self.use_cache = tk.BooleanVar(value=self.P.use_cache)
+        ttk.Checkbutton(ctrl, text="Usar caché de teselas", variable=self.use_cache).pack(anchor='w')
+        self.show_stats = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ctrl, text="Estadísticas del render", variable=self.show_stats).pack(anchor='w')
 
         ttk.Separator(ctrl).pack(fill='x', pady=4)
         ttk.Label(ctrl, text="Guardado", font=('TkDefaultFont', 10, 'bold')).pack(anchor='w')
@@ -263,13 +187,50 @@ class App:
         self.btn_save = ttk.Button(btns, text="Guardar…", command=self.on_save, state='disabled')
         self.btn_save.pack(side='left', padx=2)
 
-        self.status = ttk.Label(ctrl, text="Listo", foreground='#555')
+        btns2 = ttk.Frame(ctrl)
+        btns2.pack(fill='x')
+        self.progressive = tk.BooleanVar(value=True)
+        ttk.Checkbutton(btns2, text="Vista previa progresiva", variable=self.progressive).pack(side='left')
+        self.btn_full = ttk.Button(btns2, text="Resolución completa", command=self.on_render_full)
+        self.btn_full.pack(side='left', padx=2)
+        # recalcular mientras se escriben α o el rango (ver _on_live_edit)
+        self.live_edit = tk.BooleanVar(value=True)
+        ttk.Checkbutton(ctrl, text="Recalcular al editar α y el rango", variable=self.live_edit).pack(anchor='w')
+        for key in LIVE_FIELDS:
+            self.vars[key].trace_add('write', self._on_live_edit)
+
+        btns3 = ttk.Frame(ctrl)
+        btns3.pack(fill='x', pady=(4,0))
+        self.btn_recolor = ttk.Button(btns3, text="Recolorear", command=self.on_recolor, state='disabled')
+        self.btn_recolor.pack(side='left', padx=2)
+        self.btn_export = ttk.Button(btns3, text="Exportar datos…", command=self.on_export_data, state='disabled')
+        self.btn_export.pack(side='left', padx=2)
+        ttk.Button(btns3, text="Cargar datos…", command=self.on_load_data).pack(side='left', padx=2)
+
+        btns4 = ttk.Frame(ctrl)
+        btns4.pack(fill='x', pady=(4,0))
+        self.btn_continue = ttk.Button(btns4, text="Seguir iterando", command=self.on_continue, state='disabled')
+        self.btn_continue.pack(side='left', padx=2)
+        ttk.Label(btns4, text="(iter_max mayor, o el doble)", foreground='#555').pack(side='left')
+
+        self.status = ttk.Label(ctrl, text="Listo", foreground='#555', wraplength=280)
         self.status.pack(anchor='w', pady=(4,0))
 
         # --- Preview ---
         self.canvas = tk.Canvas(preview, bg='#1e1e1e')
         self.canvas.grid(row=0, column=0, sticky='nsew')
 
+        # Navegación: arrastrar = desplazar, rueda = zoom, botón derecho = zoom a rectángulo
+        self.canvas.bind('<ButtonPress-1>', self._on_pan_start)
+        self.canvas.bind('<B1-Motion>', self._on_pan_move)
+        self.canvas.bind('<ButtonRelease-1>', self._on_pan_end)
+        self.canvas.bind('<ButtonPress-3>', self._on_band_start)
+        self.canvas.bind('<B3-Motion>', self._on_band_move)
+        self.canvas.bind('<ButtonRelease-3>', self._on_band_end)
+        self.canvas.bind('<MouseWheel>', lambda e: self._zoom_at(e.x, e.y, ZOOM_STEP if e.delta < 0 else 1/ZOOM_STEP))
+        self.canvas.bind('<Button-4>', lambda e: self._zoom_at(e.x, e.y, 1/ZOOM_STEP))
+        self.canvas.bind('<Button-5>', lambda e: self._zoom_at(e.x, e.y, ZOOM_STEP))
+
     def pick_color(self, key):
         initial = self.color_vars[key].get()
         try:
@@ -293,17 +254,31 @@ class App:
         except Exception as e:
             messagebox.showerror("Parámetros inválidos", str(e))
             return
-        self._start_render(P)
+        self._start_render(P, full=not self.progressive.get())
+
+    def on_render_full(self):
+        try:
+            P = self._read_params_from_ui()
+        except Exception as e:
+            messagebox.showerror("Parámetros inválidos", str(e))
+            return
+        self._start_render(P, full=True)
 
     def on_cancel(self):
-        self.stop_req = True
+        if self.job:
+            self.job.stop = True
 
     def on_save(self):
         if not self.current_image:
             messagebox.showinfo("Nada para guardar", "Primero genera una imagen.")
             return
+        if not self.current_full:
+            # la vista previa no sirve para guardar: calcular la resolución completa
+            self.save_after_render = True
+            self._start_render(self.P, full=True)
+            return
         P = self.P
-        default_name = f"{P.filename_prefix}_{P.alpha_re:+.1f}_{P.alpha_im:+.1f}.png"
+        default_name = image_name(P)
         initialdir = self.vars['outdir'].get().strip() or P.outdir
         os.makedirs(initialdir, exist_ok=True)
         path = filedialog.asksaveasfilename(defaultextension='.png', initialdir=initialdir, initialfile=default_name,
@@ -311,11 +286,162 @@ class App:
         if not path:
             return
         try:
-            self.current_image.save(path)
+            with phase(self.last_stats, "codificacion"):
+                self.current_image.save(path)
+            if self.last_stats is not None:
+                self.status.configure(text="Guardado" + self._stats_status())
             messagebox.showinfo("Guardado", f"Imagen guardada en:\n{path}")
         except Exception as e:
             messagebox.showerror("Error al guardar", str(e))
 
+    def on_recolor(self):
+        """Aplica los colores y marcas de la interfaz a la clasificación actual, sin iterar."""
+        if self.current_data is None:
+            messagebox.showinfo("Sin clasificación", "Recolorear necesita una imagen generada con el motor NumPy.")
+            return
+        try:
+            U = self._read_params_from_ui()
+        except Exception as e:
+            messagebox.showerror("Parámetros inválidos", str(e))
+            return
+        colors = {f: getattr(U, f) for f in COLOR_FIELDS}
+        self.P = replace(self.P, **colors)
+        VP = replace(self.view_P, **colors)
+        t0 = time.perf_counter()
+        self._show_base(colorize(self.current_data, VP), VP, self.current_data)
+        self.status.configure(text=f"Listo – recoloreado en {1000*(time.perf_counter() - t0):.0f} ms")
+
+    def on_continue(self):
+        """Sube iter_max y sigue iterando sólo las órbitas sin resolver de la imagen actual.
+
+        Se usa el iter_max de los controles si es mayor que el de la imagen; si no, el
+        doble. Las órbitas continúan desde donde se quedaron si hay punto de control de
+        esta vista (el de la última continuación); si no, desde el principio, pero sin
+        volver a iterar las ya resueltas.
+        """
+        if self.current_data is None:
+            messagebox.showinfo("Sin clasificación", "Seguir iterando necesita una imagen generada con el motor NumPy.")
+            return
+        if self.job:
+            messagebox.showwarning("En curso", "Ya hay un render en progreso. Cancélalo o espera a que termine.")
+            return
+        try:
+            U = self._read_params_from_ui()
+        except Exception as e:
+            messagebox.showerror("Parámetros inválidos", str(e))
+            return
+        import cheby_halley_reanudar as reanudar
+        VP = self.view_P
+        iter_max = U.iter_max if U.iter_max > VP.iter_max else 2 * VP.iter_max
+        self.vars['iter_max'].set(str(iter_max))
+        self.P = replace(self.P, iter_max=iter_max)
+        NP = replace(VP, iter_max=iter_max)
+        punto = self.checkpoint
+        if not reanudar.compatible(punto, "dinamico", NP):
+            punto = reanudar.desde_clasificacion("dinamico", VP, *self.current_data[:2])
+
+        def work(job, progress, stop_flag):
+            res = reanudar.clasificar("dinamico", NP, punto, progress_cb=progress, stop_flag=stop_flag)
+            if res is None:
+                return None
+            etiquetas, iteraciones, job.checkpoint = res
+            data = supersample((etiquetas, iteraciones), NP, stop_flag)
+            if data is None:
+                return None
+            return colorize(data, NP), NP, data
+
+        self._start_job(work)
+
+    def on_export_data(self):
+        if self.current_data is None:
+            messagebox.showinfo("Sin clasificación", "Exportar necesita una imagen generada con el motor NumPy.")
+            return
+        VP = self.view_P
+        default_name = image_name(VP, ".json")
+        initialdir = self.vars['outdir'].get().strip() or VP.outdir
+        os.makedirs(initialdir, exist_ok=True)
+        path = filedialog.asksaveasfilename(defaultextension='.json', initialdir=initialdir, initialfile=default_name,
+                                            filetypes=[('Clasificación', '*.json')])
+        if not path:
+            return
+        try:
+            import cheby_halley_datos as datos
+            etiquetas, iteraciones = self.current_data[:2]
+            samples = self.current_data[2] if len(self.current_data) > 2 else None
+            path = datos.guardar(os.path.splitext(path)[0], "dinamico", etiquetas, iteraciones, asdict(VP), samples)
+            messagebox.showinfo("Exportado", f"Clasificación guardada en:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Error al exportar", str(e))
+
+    def on_load_data(self):
+        if self.job:
+            messagebox.showwarning("En curso", "Ya hay un render en progreso. Cancélalo o espera a que termine.")
+            return
+        path = filedialog.askopenfilename(filetypes=[('Clasificación', '*.json')])
+        if not path:
+            return
+        try:
+            import cheby_halley_datos as datos
+            plano, params, etiquetas, iteraciones = datos.cargar(path, mmap=False)
+            if plano != "dinamico":
+                raise ValueError("El fichero no contiene un plano dinámico")
+            VP = Params(**params)
+            samples = datos.cargar_suavizado(path)
+            data = (etiquetas, iteraciones) if samples is None else (etiquetas, iteraciones, samples)
+            base = colorize(data, VP)
+        except Exception as e:
+            messagebox.showerror("Error al cargar", str(e))
+            return
+        self.P = VP
+        self._write_params_to_ui(VP)
+        self._draw_param_marker()
+        self._show_base(base, VP, data)
+        self.current_full = True
+        self._set_rendering_state(False)
+        self.status.configure(text=f"Listo – clasificación cargada de {os.path.basename(path)}")
+
+    def _set_vars(self, values: dict):
+        """Escribe campos de texto sin que cuente como edición (no recalcula)."""
+        self._quiet = True
+        try:
+            for key, val in values.items():
+                self.vars[key].set(val)
+        finally:
+            self._quiet = False
+
+    def _on_live_edit(self, *_):
+        if self._quiet or not self.live_edit.get():
+            return
+        if self._edit_after:
+            self.root.after_cancel(self._edit_after)
+        self._edit_after = self.root.after(EDIT_DELAY_MS, self._live_render)
+
+    def _live_render(self):
+        """Render tras editar α o el rango: sustituye al que esté en curso."""
+        self._edit_after = None
+        try:
+            P = self._read_params_from_ui()
+        except Exception:
+            return   # a medio escribir: se recalcula con la próxima tecla
+        if P == self.P:
+            return
+        self._start_render(P, full=not self.progressive.get())
+
+    def _write_params_to_ui(self, P: Params):
+        self._set_vars({key: str(getattr(P, key)) for key in self.vars})
+        self.color_vars['basin0'].set(rgb255_to_hex(P.color_basin0))
+        self.color_vars['basin1'].set(rgb255_to_hex(P.color_basin1))
+        self.color_vars['unknown'].set(rgb255_to_hex(P.color_unknown))
+        self.color_vars['escape'].set(P.color_escape_mode)
+        self.basin2.set(P.basin2_mode)
+        self.draw_marks.set(P.draw_marks)
+        self.draw_s12.set(P.draw_s12)
+        self.detect_cycles.set(P.detect_cycles)
+        self.basin_radii.set(P.basin_radii)
+        self.engine.set(P.engine)
+        self.adaptive.set(P.adaptive)
+        self.use_cache.set(P.use_cache)
+
     def _read_params_from_ui(self) -> Params:
         P = Params()
         P.alpha_re = float(self.vars['alpha_re'].get())
@@ -330,6 +456,7 @@ class App:
         P.eps = float(self.vars['eps'].get())
         esc = self.vars['escape'].get().strip()
         P.escape = float(esc) if esc else None
+        P.cycle_tol = float(self.vars['cycle_tol'].get())
 
         # colores
         P.color_basin0 = hex_to_rgb255(self.color_vars['basin0'].get())
@@ -340,63 +467,229 @@ class App:
         P.basin2_mode = self.basin2.get()
         P.draw_marks = bool(self.draw_marks.get())
         P.draw_s12 = bool(self.draw_s12.get())
+        P.detect_cycles = bool(self.detect_cycles.get())
+        P.basin_radii = bool(self.basin_radii.get())
+        P.engine = self.engine.get()
+        P.workers = max(1, int(self.vars['workers'].get()))
+        P.antialias = max(1, int(self.vars['antialias'].get()))
+        P.adaptive = bool(self.adaptive.get())
+        P.use_cache = bool(self.use_cache.get())
 
         P.outdir = self.vars['outdir'].get().strip() or P.outdir
         P.filename_prefix = self.vars['filename_prefix'].get().strip() or P.filename_prefix
         return P
 
-    def _start_render(self, P: Params):
-        if self.worker and self.worker.is_alive():
-            messagebox.showwarning("En curso", "Ya hay un render en progreso. Cancélalo o espera a que termine.")
-            return
+    def _preview_sizes(self, P: Params):
+        """Tamaños de las pasadas progresivas: de grueso a fino hasta el tamaño del canvas."""
+        cw = max(self.canvas.winfo_width(), 2)
+        ch = max(self.canvas.winfo_height(), 2)
+        scale = min(cw/P.width, ch/P.height, 1.0)
+        w, h = P.width*scale, P.height*scale
+        sizes = []
+        for d in (8, 4, 2, 1):
+            size = (max(2, int(w/d)), max(2, int(h/d)))
+            if size not in sizes:
+                sizes.append(size)
+        return sizes
+
+    def _start_render(self, P: Params, full: bool = True, placeholder=None):
+        """Lanza el render de P sustituyendo al que esté en curso.
+
+        Con el motor de arrays en un solo proceso y sin subdivisión adaptativa el plano
+        se calcula por teselas (cheby_halley_teselas): el render sustituido se detiene
+        al acabar la tesela en curso, las teselas terminadas se pintan según llegan y
+        las que ya estaban calculadas con los mismos parámetros se reutilizan.
+        """
         self.P = P
-        self.stop_req = False
+        self._draw_param_marker()
+        passes = [(P.width, P.height)] if full else self._preview_sizes(P)
+        want_stats = self.show_stats.get()
+        if want_stats:
+            from cheby_halley_estadisticas import Estadisticas
+        if self._tiles is None:
+            import cheby_halley_teselas
+            self._tiles = cheby_halley_teselas.MemoTeselas()
+        memo = self._tiles
+
+        def classify(job, VP, progress, stop_flag):
+            if VP.adaptive or VP.workers > 1:
+                return compute_plane(VP, progress_cb=progress, stop_flag=stop_flag)
+            import cheby_halley_teselas
+            cache = None
+            if VP.use_cache:
+                import cheby_halley_cache
+                cache = cheby_halley_cache.cache_por_defecto()
+            k = job.pass_idx
+
+            def deliver(i0, i1, j0, j1, e, n):
+                job.tiles.put((k, VP, (i0, j0), colorize((e, n), VP)))
+
+            return cheby_halley_teselas.clasificar_por_teselas("dinamico", VP, memo, entregar=deliver,
+                                                               progress_cb=progress, stop_flag=stop_flag,
+                                                               cache=cache)
+
+        def work(job, progress, stop_flag):
+            res = None
+            for k, (w, h) in enumerate(passes):
+                job.pass_idx = k
+                job.progress = 0
+                VP = replace(P, width=w, height=h)
+                stats = Estadisticas(VP.iter_max) if want_stats else None
+                if uses_arrays(VP):
+                    import cheby_halley_motor  # noqa: F401
+                    with phase(stats, "calculo"):
+                        data = classify(job, VP, progress, stop_flag)
+                    if data is None:
+                        return None
+                    if stats is not None:
+                        stats.contar(*data)
+                    if VP.antialias > 1:
+                        with phase(stats, "suavizado"):
+                            data = supersample(data, VP, stop_flag)
+                        if data is None:
+                            return None
+                    with phase(stats, "color"):
+                        img = colorize(data, VP)
+                else:
+                    data = None
+                    img = render_plane(VP, progress_cb=progress, stop_flag=stop_flag, marks=False, stats=stats)
+                if img is None:
+                    return None
+                job.stats = stats
+                job.pass_done = k
+                res = job.pass_image = (img, VP, data)
+            return res
+
+        self._start_job(work, len(passes), placeholder)
+
+    def _start_job(self, work, n_passes=1, placeholder=None):
+        """Lanza `work(job, progress, stop_flag)` en un hilo; cancela el render anterior.
+
+        `work` devuelve (imagen sin marcas, parámetros de esa imagen, clasificación o
+        None) o None si se cancela, y puede ir dejando resultados intermedios en
+        job.pass_image.
+        """
+        if self.job:
+            self.job.stop = True    # el viewport anterior ya no interesa
+        self.gen += 1
+        job = SimpleNamespace(gen=self.gen, stop=False, progress=0, pass_idx=0, n_passes=n_passes,
+                              pass_image=placeholder, shown=None, result=None, error=None, stats=None,
+                              checkpoint=None, tiles=queue.Queue(), tile_pass=None, pass_done=-1)
+
+        def progress(done, total):
+            job.progress = int(100*done/total)
+
+        def stop_flag():
+            return job.stop
+
+        def run():
+            try:
+                job.result = work(job, progress, stop_flag)
+            except Exception as e:
+                job.error = e
+
+        job.thread = threading.Thread(target=run, daemon=True)
+        self.job = job
         self._set_rendering_state(True)
         self.status.configure(text="Generando… 0%")
-        self.worker = threading.Thread(target=self._render_worker, daemon=True)
-        self.worker.start()
-        self._poll_worker()
+        job.thread.start()
+        self._poll_worker(job)
 
     def _set_rendering_state(self, busy: bool):
-        self.btn_render['state'] = 'disabled' if busy else 'normal'
+        # Generar sigue activo: un render nuevo sustituye al que esté en curso
         self.btn_cancel['state'] = 'normal' if busy else 'disabled'
         self.btn_save['state'] = 'disabled' if busy else ('normal' if self.current_image else 'disabled')
+        idle_data = 'normal' if not busy and self.current_data is not None else 'disabled'
+        self.btn_recolor['state'] = idle_data
+        self.btn_export['state'] = idle_data
+        self.btn_continue['state'] = idle_data
 
-    def _render_worker(self):
-        def progress(done, total):
-            pct = int(100*done/total)
-            self._progress_pct = pct
-        def stop_flag():
-            return self.stop_req
-        self._progress_pct = 0
-        try:
-            img = render_plane(self.P, progress_cb=progress, stop_flag=stop_flag)
-            self._render_result = img
-            self._render_error = None
-        except Exception as e:
-            self._render_result = None
-            self._render_error = e
-
-    def _poll_worker(self):
-        if self.worker and self.worker.is_alive():
-            self.status.configure(text=f"Generando… {getattr(self, '_progress_pct', 0)}%")
-            self.root.after(100, self._poll_worker)
+    def _poll_worker(self, job):
+        if job is not self.job:
+            return   # sustituido por un render más reciente
+        if job.pass_image is not None and job.pass_image is not job.shown:
+            job.shown = job.pass_image
+            self._show_base(*job.pass_image)
+        self._paste_tiles(job)
+        if job.thread.is_alive():
+            txt = f"Generando… {job.progress}%"
+            if job.n_passes > 1:
+                txt = f"Pasada {job.pass_idx + 1}/{job.n_passes} – " + txt
+            self.status.configure(text=txt)
+            self.root.after(POLL_MS, self._poll_worker, job)
             return
         # finished
+        self.job = None
         self._set_rendering_state(False)
-        err = getattr(self, '_render_error', None)
-        img = getattr(self, '_render_result', None)
-        if err:
+        save_after = self.save_after_render
+        self.save_after_render = False
+        if job.error:
             self.status.configure(text="Error")
-            messagebox.showerror("Error durante el render", str(err))
+            messagebox.showerror("Error durante el render", str(job.error))
             return
-        if img is None:
+        if job.result is None:
             self.status.configure(text="Cancelado")
             return
+        self._show_base(*job.result, stats=job.stats)
+        if job.checkpoint is not None:
+            self.checkpoint = job.checkpoint
+        self.current_full = self.current_image.size == (self.P.width, self.P.height)
+        if self.current_full:
+            txt = "Listo – render completado"
+        else:
+            txt = f"Listo – vista previa {self.current_image.size[0]}x{self.current_image.size[1]}"
+        self.status.configure(text=txt + self._cache_status() + self._stats_status())
+        self._set_rendering_state(False)
+        if save_after:
+            self.on_save()
+
+    def _paste_tiles(self, job):
+        """Pinta sobre la imagen mostrada las teselas que el render ha terminado."""
+        pasted = False
+        while True:
+            try:
+                k, VP, pos, tile = job.tiles.get_nowait()
+            except queue.Empty:
+                break
+            if k <= job.pass_done:
+                continue   # su pasada ya se ve entera
+            if job.tile_pass != k:
+                # primera tesela de la pasada: de fondo, lo que se veía, a su tamaño
+                job.tile_pass = k
+                size = (VP.width, VP.height)
+                if self.current_base is not None:
+                    base = self.current_base.resize(size, Image.NEAREST)
+                else:
+                    base = Image.new("RGB", size, color=(0, 0, 0))
+                self.current_base, self.view_P = base, VP
+            self.current_base.paste(tile, pos)
+            pasted = True
+        if pasted:
+            self._show_base(self.current_base, self.view_P)
+
+    def _cache_status(self) -> str:
+        import sys
+        cache_mod = sys.modules.get('cheby_halley_cache')
+        if not (self.P.use_cache and cache_mod and cache_mod._cache):
+            return ""
+        c = cache_mod._cache
+        return f" (caché: {c.aciertos} aciertos, {c.fallos} fallos)"
+
+    def _stats_status(self) -> str:
+        if self.last_stats is None:
+            return ""
+        return "\n" + self.last_stats.resumen()
+
+    def _show_base(self, base: Image.Image, VP: Params, data=None, stats=None):
+        img = base.copy()
+        with phase(stats, "marcas"):
+            draw_marks(img, VP)
+        self.last_stats = stats
+        self.current_data = data
+        self.current_base = base
         self.current_image = img
-        self.status.configure(text="Listo – render completado")
+        self.view_P = VP
         self._show_image_on_canvas(img)
-        self.btn_save['state'] = 'normal'
 
     def _show_image_on_canvas(self, img: Image.Image):
         # Ajustar al tamaño del canvas manteniendo aspect ratio
@@ -410,7 +703,314 @@ class App:
         disp = img.resize((nw, nh), Image.NEAREST)
         self.tk_img = ImageTk.PhotoImage(disp)
         self.canvas.delete('all')
-        self.canvas.create_image(cw//2, ch//2, image=self.tk_img, anchor='center')
+        self.canvas.create_image(cw//2, ch//2, image=self.tk_img, anchor='center', tags='img')
+        self._disp = (scale, cw//2 - nw//2, ch//2 - nh//2)
+
+    # ---------- Navegación ----------
+    def _canvas_to_px(self, x, y):
+        scale, x0, y0 = self._disp
+        return (x - x0)/scale, (y - y0)/scale
+
+    def _set_viewport(self, x_min, x_max, y_min, y_max):
+        """Nuevo rango para el render en curso y los siguientes (también en los campos)."""
+        self.P = replace(self.P, x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+        self._set_vars({key: repr(getattr(self.P, key)) for key in ('x_min', 'x_max', 'y_min', 'y_max')})
+        return replace(self.view_P, x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+
+    def _on_pan_start(self, e):
+        if self.view_P is not None:
+            self._drag = (e.x, e.y, e.x, e.y)
+
+    def _on_pan_move(self, e):
+        if self._drag:
+            x0, y0, xl, yl = self._drag
+            self.canvas.move('img', e.x - xl, e.y - yl)
+            self._drag = (x0, y0, e.x, e.y)
+
+    def _on_pan_end(self, e):
+        if not self._drag:
+            return
+        x0, y0, _, _ = self._drag
+        self._drag = None
+        scale = self._disp[0]
+        dx, dy = round((e.x - x0)/scale), round((e.y - y0)/scale)
+        if dx or dy:
+            self._pan(dx, dy)
+        else:
+            self._show_image_on_canvas(self.current_image)
+
+    def _pan(self, dx: int, dy: int):
+        """Desplaza el contenido (dx, dy) píxeles y calcula sólo las franjas descubiertas."""
+        VP = self.view_P
+        W, H = VP.width, VP.height
+        sx = (VP.x_max - VP.x_min)/(W - 1)
+        sy = (VP.y_max - VP.y_min)/(H - 1)
+        NV = self._set_viewport(VP.x_min - dx*sx, VP.x_max - dx*sx, VP.y_min - dy*sy, VP.y_max - dy*sy)
+        if abs(dx) >= W or abs(dy) >= H:
+            self._start_render(self.P, full=not self.progressive.get())
+            return
+        base = Image.new("RGB", (W, H), color=(0, 0, 0))
+        base.paste(self.current_base, (dx, dy))
+        data = None
+        if self.current_data is not None and uses_arrays(NV):
+            # desplazar también la clasificación para poder recolorear después
+            import numpy as np
+            import cheby_halley_motor as motor
+            data = tuple(np.zeros_like(a) for a in self.current_data[:2])
+            for new, old in zip(data, self.current_data):
+                new[max(dy, 0):H + min(dy, 0), max(dx, 0):W + min(dx, 0)] = \
+                    old[max(-dy, 0):H - max(dy, 0), max(-dx, 0):W - max(dx, 0)]
+        regions = []
+        if dx:
+            regions.append((0, dx, 0, H) if dx > 0 else (W + dx, W, 0, H))
+        if dy:
+            c0, c1 = (dx, W) if dx > 0 else (0, W + dx)
+            regions.append((c0, c1, 0, dy) if dy > 0 else (c0, c1, H + dy, H))
+
+        def work(job, progress, stop_flag):
+            if data is not None:
+                for k, (i0, i1, j0, j1) in enumerate(regions):
+                    if stop_flag():
+                        return None
+                    for new, part in zip(data, motor.tesela_dinamico(NV, i0, i1, j0, j1)):
+                        new[j0:j1, i0:i1] = part
+                    progress(k + 1, len(regions))
+                # los bordes cambian cerca de las franjas nuevas: se vuelven a buscar en todo el plano
+                full = supersample(data, NV, stop_flag)
+                if full is None:
+                    return None
+                return colorize(full, NV), NV, full
+            img = base.copy()
+            for k, (i0, i1, j0, j1) in enumerate(regions):
+                part = render_region(NV, i0, i1, j0, j1, stop_flag=stop_flag)
+                if part is None:
+                    return None
+                img.paste(part, (i0, j0))
+                progress(k + 1, len(regions))
+            return img, NV, None
+
+        self._start_job(work, placeholder=(base, NV))
+
+    def _zoom_to(self, x_min, x_max, y_min, y_max):
+        """Zoom al rango dado: la imagen actual escalada hace de marcador mientras se calcula."""
+        VP = self.view_P
+        W, H = VP.width, VP.height
+        sx = (VP.x_max - VP.x_min)/(W - 1)
+        sy = (VP.y_max - VP.y_min)/(H - 1)
+        box = ((x_min - VP.x_min)/sx, (y_min - VP.y_min)/sy, (x_max - VP.x_min)/sx + 1, (y_max - VP.y_min)/sy + 1)
+        placeholder = self.current_base.transform((W, H), Image.EXTENT, box, Image.NEAREST)
+        NV = self._set_viewport(x_min, x_max, y_min, y_max)
+        self._start_render(self.P, full=not self.progressive.get(), placeholder=(placeholder, NV))
+
+    def _zoom_at(self, x, y, factor: float):
+        if self.view_P is None or self._drag:
+            return
+        VP = self.view_P
+        i, j = self._canvas_to_px(x, y)
+        re = VP.x_min + i/(VP.width - 1)*(VP.x_max - VP.x_min)
+        im = VP.y_min + j/(VP.height - 1)*(VP.y_max - VP.y_min)
+        self._zoom_to(re - (re - VP.x_min)*factor, re + (VP.x_max - re)*factor,
+                      im - (im - VP.y_min)*factor, im + (VP.y_max - im)*factor)
+
+    def _on_band_start(self, e):
+        if self.view_P is not None:
+            self._band = (e.x, e.y)
+            self.canvas.delete('band')
+            self.canvas.create_rectangle(e.x, e.y, e.x, e.y, outline='#fff', dash=(4, 2), tags='band')
+
+    def _on_band_move(self, e):
+        if getattr(self, '_band', None):
+            x0, y0 = self._band
+            self.canvas.coords('band', x0, y0, e.x, e.y)
+
+    def _on_band_end(self, e):
+        if not getattr(self, '_band', None):
+            return
+        x0, y0 = self._band
+        self._band = None
+        self.canvas.delete('band')
+        VP = self.view_P
+        (i0, j0), (i1, j1) = self._canvas_to_px(x0, y0), self._canvas_to_px(e.x, e.y)
+        i0, i1 = sorted((i0, i1))
+        j0, j1 = sorted((j0, j1))
+        if i1 - i0 < 3 or j1 - j0 < 3:
+            return
+        # mantener la proporción de la imagen ampliando el lado corto del rectángulo
+        W, H = VP.width, VP.height
+        bw, bh = i1 - i0, j1 - j0
+        if bw/bh > W/H:
+            j0, j1 = (j0 + j1)/2 - bw*H/W/2, (j0 + j1)/2 + bw*H/W/2
+        else:
+            i0, i1 = (i0 + i1)/2 - bh*W/H/2, (i0 + i1)/2 + bh*W/H/2
+        sx = (VP.x_max - VP.x_min)/(W - 1)
+        sy = (VP.y_max - VP.y_min)/(H - 1)
+        self._zoom_to(VP.x_min + i0*sx, VP.x_min + i1*sx, VP.y_min + j0*sy, VP.y_min + j1*sy)
+
+    # ---------- Plano de parámetros enlazado ----------
+    def _build_param_panel(self):
+        side = ttk.Frame(self.root, padding=8)
+        side.grid(row=0, column=2, sticky='ns')
+        ttk.Label(side, text="Plano de parámetros", font=('TkDefaultFont', 10, 'bold')).pack(anchor='w')
+        ttk.Label(side, text="Ratón encima: vista previa de α · clic: generar ese α",
+                  foreground='#555').pack(anchor='w')
+        self.param_canvas = tk.Canvas(side, width=PARAM_SIZE[0], height=PARAM_SIZE[1], bg='#1e1e1e',
+                                      highlightthickness=0)
+        self.param_canvas.pack(pady=(4, 8))
+        self.param_canvas.create_text(10, 10, anchor='nw', fill='#ccc', text='Calculando…', tags='msg')
+        self.thumb_label = ttk.Label(side, text="", foreground='#555')
+        self.thumb_label.pack(anchor='w')
+        self.thumb_canvas = tk.Canvas(side, width=THUMB_WIDTH, height=THUMB_WIDTH*2//3, bg='#1e1e1e',
+                                      highlightthickness=0)
+        self.thumb_canvas.pack(pady=(4, 0))
+        self.param_canvas.bind('<Motion>', self._on_param_motion)
+        self.param_canvas.bind('<ButtonRelease-1>', self._on_param_click)
+
+    def _start_param_plane(self):
+        """Calcula el plano de parámetros del panel en segundo plano, una sola vez.
+
+        Usa la caché de teselas, así que en las siguientes sesiones sale del disco.
+        """
+        job = SimpleNamespace(result=None)
+
+        def run():
+            try:
+                import cheby_halley_parametros as parametros
+                Q = parametros.PlanoParametros(width=PARAM_SIZE[0], height=PARAM_SIZE[1])
+                etiquetas, iteraciones = parametros.clasificar(Q)
+                job.result = (Q, parametros.colorear(etiquetas, iteraciones, Q))
+            except Exception as e:   # p. ej. sin numpy
+                job.result = e
+
+        job.thread = threading.Thread(target=run, daemon=True)
+        job.thread.start()
+        self._poll_param_plane(job)
+
+    def _poll_param_plane(self, job):
+        if job.thread.is_alive():
+            self.root.after(100, self._poll_param_plane, job)
+            return
+        self._param = job.result
+        self.param_canvas.delete('msg')
+        if isinstance(self._param, Exception):
+            self.param_canvas.create_text(10, 10, anchor='nw', fill='#ccc', width=PARAM_SIZE[0] - 20,
+                                          text=f"No disponible: {self._param}")
+            return
+        self.param_tk = ImageTk.PhotoImage(self._param[1])
+        self.param_canvas.create_image(0, 0, anchor='nw', image=self.param_tk)
+        self._draw_param_marker()
+
+    def _param_alpha(self, x, y) -> Optional[complex]:
+        """alpha del píxel del plano de parámetros bajo (x, y), o None fuera de él."""
+        if not isinstance(self._param, tuple):
+            return None
+        Q = self._param[0]
+        i, j = int(x), int(y)
+        if not (0 <= i < Q.width and 0 <= j < Q.height):
+            return None
+        # misma transformación que cheby_halley_parametros: cada píxel es su propio α
+        return complex(Q.x_min + (i / Q.width) * (Q.x_max - Q.x_min), Q.y_max - (j / Q.height) * (Q.y_max - Q.y_min))
+
+    def _draw_param_marker(self):
+        """Cruz en el α actual sobre el plano de parámetros."""
+        if not isinstance(self._param, tuple):
+            return
+        Q = self._param[0]
+        x = (self.P.alpha_re - Q.x_min) / (Q.x_max - Q.x_min) * Q.width
+        y = (Q.y_max - self.P.alpha_im) / (Q.y_max - Q.y_min) * Q.height
+        self.param_canvas.delete('marker')
+        for dx, dy in ((1, 0), (0, 1)):
+            self.param_canvas.create_line(x - 6*dx, y - 6*dy, x + 7*dx, y + 7*dy, fill='#fff', width=2,
+                                          tags='marker')
+
+    def _on_param_motion(self, e):
+        a = self._param_alpha(e.x, e.y)
+        if a is None:
+            return
+        if self._hover_after:
+            self.root.after_cancel(self._hover_after)
+        self._hover_after = self.root.after(HOVER_DELAY_MS, self._show_thumb, a)
+
+    def _on_param_click(self, e):
+        a = self._param_alpha(e.x, e.y)
+        if a is None:
+            return
+        self._set_vars({'alpha_re': repr(a.real), 'alpha_im': repr(a.imag)})
+        try:
+            P = self._read_params_from_ui()
+        except Exception as err:
+            messagebox.showerror("Parámetros inválidos", str(err))
+            return
+        self._start_render(P, full=not self.progressive.get())
+
+    def _thumb_params(self, a: complex) -> Params:
+        """Parámetros de la vista previa de α: los de los controles a baja resolución."""
+        try:
+            P = self._read_params_from_ui()
+        except Exception:
+            P = self.P
+        VP = replace(P, alpha_re=a.real, alpha_im=a.imag, width=THUMB_WIDTH,
+                     height=max(2, round(THUMB_WIDTH * P.height / P.width)),
+                     engine=P.engine if motores.usa_arrays(motores.elegir(P.engine)) else 'numpy',
+                     workers=1, adaptive=False, antialias=1, use_cache=False)
+        VP.finalize()
+        return VP
+
+    @staticmethod
+    def _thumb_key(VP: Params):
+        import cheby_halley_cache
+        k = tuple(getattr(VP, f) for f in cheby_halley_cache.CAMPOS["dinamico"])
+        return k if motores.exacto(VP.engine) else k + (VP.engine,)
+
+    def _show_thumb(self, a: complex):
+        """Vista previa del plano dinámico de α: de la memoria si ya se calculó, si no en un hilo."""
+        self._hover_after = None
+        VP = self._thumb_params(a)
+        self._thumb_want = VP
+        self.thumb_label.configure(text=f"α = {a.real:.4f} {a.imag:+.4f}i")
+        key = self._thumb_key(VP)
+        if key in self._thumbs:
+            self._thumbs.move_to_end(key)
+            self._draw_thumb(self._thumbs[key], VP)
+        elif self._thumb_job is None:
+            job = SimpleNamespace(VP=VP, data=None, error=None)
+
+            def run():
+                try:
+                    job.data = compute_plane(VP)
+                except Exception as e:
+                    job.error = e
+
+            job.thread = threading.Thread(target=run, daemon=True)
+            self._thumb_job = job
+            job.thread.start()
+            self._poll_thumb(job)
+        # si ya hay una en curso, al terminar se pasa a la última pedida (_thumb_want)
+
+    def _poll_thumb(self, job):
+        if job.thread.is_alive():
+            self.root.after(20, self._poll_thumb, job)
+            return
+        self._thumb_job = None
+        if job.error:
+            self.thumb_label.configure(text=f"Vista previa no disponible: {job.error}")
+            return
+        key = self._thumb_key(job.VP)
+        self._thumbs[key] = job.data
+        if len(self._thumbs) > THUMB_MEMO:
+            self._thumbs.popitem(last=False)
+        want = self._thumb_want
+        if self._thumb_key(want) == key:
+            self._draw_thumb(job.data, want)
+        else:
+            self._show_thumb(complex(want.alpha_re, want.alpha_im))   # el ratón ya está en otro α
+
+    def _draw_thumb(self, data, VP: Params):
+        img = colorize(data, VP)
+        draw_marks(img, VP)
+        self.thumb_tk = ImageTk.PhotoImage(img)
+        self.thumb_canvas.configure(height=img.size[1])
+        self.thumb_canvas.delete('all')
+        self.thumb_canvas.create_image(0, 0, anchor='nw', image=self.thumb_tk)
 
 # ==========================
 # Main
@@ -419,7 +1019,7 @@ class App:
 def main():
     root = tk.Tk()
     # Mejor redimensionamiento
-    root.geometry('1200x720')
+    root.geometry('1560x720')
     app = App(root)
     root.mainloop()
 
@@ -0,0 +1,92 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# ==========================
+# Estadísticas de un render
+# ==========================
+# Objeto opcional que los renders rellenan si se les pasa: tiempo de cada fase
+# (cálculo, color, marcas, codificación), número de píxeles de cada resultado,
+# histograma de las iteraciones hasta resolverse y ritmo de iteraciones de órbita.
+# Las etiquetas son las de cheby_halley_motor; no hace falta numpy para usarlo.
+
+RESULTADOS = {0: "desconocido", 1: "cuenca0", 2: "cuenca1", 3: "escape", 4: "polo", 5: "periodico"}
+PERIODICO = 5   # en estos píxeles `iteraciones` guarda el periodo, no las iteraciones
+
+
+class Estadisticas:
+    """Estadísticas acumuladas de un render (ver a_dict para el formato)."""
+
+    def __init__(self, iter_max: int):
+        self.iter_max = iter_max
+        self.fases = {}
+        self.resultados = Counter()
+        self.histograma = Counter()   # iteraciones hasta resolverse -> píxeles
+        self.pixeles = 0
+
+    @contextmanager
+    def fase(self, nombre: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sumar_tiempo(nombre, time.perf_counter() - t0)
+
+    def sumar_tiempo(self, nombre: str, segundos: float):
+        self.fases[nombre] = self.fases.get(nombre, 0.0) + segundos
+
+    def contar_orbita(self, etiqueta: int, k: int):
+        self.pixeles += 1
+        self.resultados[etiqueta] += 1
+        if etiqueta != 0 and etiqueta != PERIODICO:
+            self.histograma[k] += 1
+
+    def contar(self, etiquetas, iteraciones):
+        """Añade una clasificación completa (arrays de numpy)."""
+        import numpy as np
+        etiquetas = np.ravel(etiquetas)
+        iteraciones = np.ravel(iteraciones)
+        self.pixeles += etiquetas.size
+        for e, n in enumerate(np.bincount(etiquetas, minlength=len(RESULTADOS))):
+            if n:
+                self.resultados[e] += int(n)
+        resueltos = (etiquetas != 0) & (etiquetas != PERIODICO)
+        for k, n in enumerate(np.bincount(iteraciones[resueltos])):
+            if n:
+                self.histograma[k] += int(n)
+
+    @property
+    def iteraciones_orbita(self) -> int:
+        # las órbitas sin resolver agotan iter_max; las periódicas no se cuentan
+        return sum(k * n for k, n in self.histograma.items()) + self.resultados[0] * self.iter_max
+
+    def a_dict(self) -> dict:
+        calculo = self.fases.get("calculo", 0.0)
+        hist = [0] * (max(self.histograma, default=0) + 1)
+        for k, n in self.histograma.items():
+            hist[k] = n
+        return {
+            "pixeles": self.pixeles,
+            "fases": {k: round(v, 6) for k, v in self.fases.items()},
+            "resultados": {RESULTADOS[e]: self.resultados[e] for e in RESULTADOS},
+            "histograma": hist,
+            "iteraciones_orbita": self.iteraciones_orbita,
+            "iteraciones_s": round(self.iteraciones_orbita / calculo, 1) if calculo else None,
+        }
+
+    def json(self, **extra) -> str:
+        """Una línea JSON (para salida en formato JSON Lines)."""
+        return json.dumps({**extra, **self.a_dict()}, ensure_ascii=False)
+
+    def resumen(self) -> str:
+        """Texto breve para una barra de estado."""
+        partes = [f"{nombre} {seg:.2f} s" for nombre, seg in self.fases.items()]
+        calculo = self.fases.get("calculo", 0.0)
+        if calculo:
+            partes.append(f"{self.iteraciones_orbita / calculo / 1e6:.2f} M it/s")
+        total = max(1, self.pixeles)
+        for e in (1, 2, 3, 0):
+            if self.resultados[e]:
+                partes.append(f"{RESULTADOS[e]} {100 * self.resultados[e] / total:.0f}%")
+        return " · ".join(partes)
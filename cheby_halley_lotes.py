@@ -0,0 +1,161 @@
+import argparse
+import dataclasses
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cheby_halley_motores as motores
+from cheby_halley_nucleo import Params, hex_to_rgb255, image_name, render_plane
+
+# ==========================
+# Barridos de alpha por lotes
+# ==========================
+# Un fichero JSON describe los valores de alpha (lista, segmento y/o rejilla) y los
+# parámetros comunes a todos los planos:
+#
+#   {
+#     "alphas":  [[-0.3, 0.0], [0.2, 0.1]],
+#     "linea":   {"desde": [0.0, 0.0], "hasta": [3.0, 0.0], "n": 31},
+#     "rejilla": {"re": [-1.0, 3.0, 9], "im": [-1.0, 1.0, 5]},
+#     "params":  {"width": 1400, "height": 800, "engine": "numpy", "color_escape_mode": "hsv"},
+#     "outdir":  "imagenes/barrido"
+#   }
+#
+# Cada alpha es un trabajo que se reparte entre procesos. En <outdir>/manifest.json
+# quedan el fichero, los parámetros y el tiempo de cada plano; un trabajo se omite si
+# su imagen ya existe y el manifiesto la registra con los mismos parámetros.
+
+MANIFIESTO = "manifest.json"
+
+# Campos que no cambian los píxeles de la imagen (no obligan a repetir un trabajo)
+CAMPOS_SIN_EFECTO = ("outdir", "filename_prefix", "engine", "workers", "use_cache")
+
+
+def _linspace(a: float, b: float, n: int):
+    if n == 1:
+        return [float(a)]
+    return [a + (b - a) * k / (n - 1) for k in range(n)]
+
+
+def alphas_de(spec: dict):
+    """Lista de alphas (re, im) de la especificación, sin repetidos y en orden."""
+    alphas = [tuple(map(float, a)) for a in spec.get("alphas", [])]
+    if "linea" in spec:
+        linea = spec["linea"]
+        (r0, i0), (r1, i1) = linea["desde"], linea["hasta"]
+        alphas += zip(_linspace(r0, r1, linea["n"]), _linspace(i0, i1, linea["n"]))
+    if "rejilla" in spec:
+        rej = spec["rejilla"]
+        res = _linspace(*rej["re"])
+        ims = _linspace(*rej["im"])
+        alphas += [(re, im) for im in ims for re in res]
+    return list(dict.fromkeys(alphas))
+
+
+def params_de(spec: dict) -> dict:
+    """Campos comunes de Params; los colores pueden darse en hexadecimal."""
+    params = dict(spec.get("params", {}))
+    for k, v in params.items():
+        if k.startswith("color_basin") or k == "color_unknown":
+            params[k] = hex_to_rgb255(v) if isinstance(v, str) else tuple(v)
+    if "outdir" in spec:
+        params["outdir"] = spec["outdir"]
+    return params
+
+
+def _huella(P: Params) -> dict:
+    datos = dataclasses.asdict(P)
+    for k in CAMPOS_SIN_EFECTO:
+        if k != "engine" or motores.exacto(P.engine):   # un motor aproximado sí cambia los píxeles
+            datos.pop(k)
+    return json.loads(json.dumps(datos))   # tuplas -> listas, como en el manifiesto
+
+
+def _trabajo(P: Params, ruta: str):
+    t0 = time.perf_counter()
+    render_plane(P).save(ruta)
+    return time.perf_counter() - t0
+
+
+def _guardar_manifiesto(ruta: str, manifiesto: dict):
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, ruta)
+
+
+def ejecutar_lote(spec: dict, procesos: int = None, forzar: bool = False, progress_cb=None) -> dict:
+    """Genera todos los planos de la especificación y devuelve el manifiesto.
+
+    progress_cb recibe (trabajos terminados, total, entrada del manifiesto).
+    """
+    comunes = params_de(spec)
+    trabajos = []
+    for re, im in alphas_de(spec):
+        P = Params(**comunes)
+        P.alpha_re, P.alpha_im = re, im
+        P.workers = 1   # el reparto se hace entre trabajos, no dentro de cada uno
+        P.finalize()
+        trabajos.append(P)
+
+    outdir = comunes.get("outdir", Params.outdir)
+    os.makedirs(outdir, exist_ok=True)
+    ruta_manifiesto = os.path.join(outdir, MANIFIESTO)
+    previas = {}
+    if os.path.exists(ruta_manifiesto):
+        with open(ruta_manifiesto, encoding="utf-8") as f:
+            previas = {e["archivo"]: e for e in json.load(f).get("trabajos", [])}
+
+    entradas = {}
+    pendientes = []
+    for P in trabajos:
+        nombre = image_name(P)
+        entrada = {"archivo": nombre, "alpha": [P.alpha_re, P.alpha_im], "params": _huella(P)}
+        previa = previas.get(nombre)
+        if (not forzar and previa and previa.get("estado") in ("hecho", "omitido") and previa["params"] == entrada["params"]
+                and os.path.exists(os.path.join(outdir, nombre))):
+            entrada.update(estado="omitido", segundos=previa["segundos"])
+        else:
+            pendientes.append(P)
+        entradas[nombre] = entrada
+
+    manifiesto = {"creado": time.strftime("%Y-%m-%d %H:%M:%S"), "trabajos": list(entradas.values())}
+    t0 = time.perf_counter()
+    hechos = len(trabajos) - len(pendientes)
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as pool:
+        futuros = {pool.submit(_trabajo, P, os.path.join(outdir, image_name(P))): image_name(P) for P in pendientes}
+        for f in as_completed(futuros):
+            entrada = entradas[futuros[f]]
+            try:
+                entrada.update(estado="hecho", segundos=round(f.result(), 3))
+            except Exception as e:
+                entrada.update(estado="error", error=str(e))
+            hechos += 1
+            manifiesto["total_segundos"] = round(time.perf_counter() - t0, 3)
+            _guardar_manifiesto(ruta_manifiesto, manifiesto)
+            if progress_cb:
+                progress_cb(hechos, len(trabajos), entrada)
+    manifiesto["total_segundos"] = round(time.perf_counter() - t0, 3)
+    _guardar_manifiesto(ruta_manifiesto, manifiesto)
+    return manifiesto
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera por lotes planos dinámicos para varios valores de alpha")
+    parser.add_argument('spec', help='Fichero JSON con los alphas y los parámetros comunes')
+    parser.add_argument('--workers', type=int, help='Trabajos simultáneos (por defecto, uno por CPU)')
+    parser.add_argument('--force', action='store_true', help='Repite también los trabajos ya hechos')
+    ns = parser.parse_args()
+    with open(ns.spec, encoding="utf-8") as f:
+        spec = json.load(f)
+
+    def informe(hechos, total, entrada):
+        estado = f"{entrada['segundos']:.1f} s" if entrada["estado"] == "hecho" else entrada["estado"]
+        print(f"[{hechos}/{total}] {entrada['archivo']}: {estado}")
+
+    manifiesto = ejecutar_lote(spec, ns.workers, ns.force, informe)
+    omitidos = sum(e["estado"] == "omitido" for e in manifiesto["trabajos"])
+    errores = sum(e["estado"] == "error" for e in manifiesto["trabajos"])
+    print(f"{len(manifiesto['trabajos'])} planos ({omitidos} ya hechos, {errores} con error) "
+          f"en {manifiesto['total_segundos']:.1f} s")
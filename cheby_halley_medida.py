@@ -0,0 +1,200 @@
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+
+import numpy as np
+
+import cheby_halley_motores as motores
+from cheby_halley_lotes import alphas_de, params_de
+from cheby_halley_nucleo import Params
+
+# ==========================
+# Medida de las cuencas por Monte Carlo
+# ==========================
+# Para saber qué fracción del rectángulo [x_min, x_max] x [y_min, y_max] del plano
+# dinámico va a 0, a s1/s2 (o 1), a infinito o queda sin resolver no hace falta
+# pintar la imagen: basta clasificar puntos sueltos y contar. Los puntos salen de la
+# sucesión de Halton en bases 2 y 3 (baja discrepancia: cubren el rectángulo más
+# uniformemente que puntos al azar) con un desplazamiento aleatorio por alpha, y se
+# clasifican por lotes con el motor de arrays de P (mismo criterio que
+# classify_color). Tras cada lote se calcula, para cada desenlace, el intervalo de
+# confianza de Wilson de su fracción, y se para en cuanto el más ancho baja del
+# ancho pedido (o al llegar a max_puntos). Con puntos de baja discrepancia el
+# intervalo binomial es conservador: el error real suele ser menor.
+#
+# El polo cuenta como infinito. Los periódicos sólo aparecen con detect_cycles.
+
+DESENLACES = ("cuenca0", "cuenca1", "infinito", "periodico", "desconocido")
+_DESENLACE = (4, 0, 1, 2, 2, 3)   # etiqueta de cheby_halley_motor -> índice en DESENLACES
+
+ANCHO = 0.01            # ancho total del intervalo de confianza de cada fracción
+CONFIANZA = 0.95
+PUNTOS_POR_LOTE = 4096
+MAX_PUNTOS = 1 << 22
+
+
+def halton(inicio: int, n: int, base: int):
+    """Términos [inicio, inicio + n) de la sucesión de Van der Corput en `base`."""
+    i = np.arange(inicio, inicio + n, dtype=np.int64)
+    res = np.zeros(n)
+    f = 1.0 / base
+    while i.any():
+        res += f * (i % base)
+        i //= base
+        f /= base
+    return res
+
+
+def intervalo(k: int, n: int, z: float):
+    """(centro, semiancho) del intervalo de Wilson de la proporción k/n."""
+    p = k / n
+    den = 1 + z*z/n
+    centro = (p + z*z/(2*n)) / den
+    semiancho = z * math.sqrt(p*(1 - p)/n + z*z/(4*n*n)) / den
+    return centro, semiancho
+
+
+def medir(P: Params, ancho: float = ANCHO, confianza: float = CONFIANZA, lote: int = PUNTOS_POR_LOTE,
+          max_puntos: int = MAX_PUNTOS, semilla: int = None, progress_cb=None) -> dict:
+    """Fracción del rectángulo de P que acaba en cada desenlace, con su intervalo de confianza.
+
+    Devuelve {"alpha", "puntos", "conteos", "fracciones", "semianchos", "intervalos",
+    "convergido", "segundos"}, los del medio por desenlace (DESENLACES): la fracción
+    observada, el semiancho del intervalo de Wilson y sus extremos (centrado algo más
+    cerca de 1/2 que la fracción). progress_cb recibe (puntos, ancho máximo actual)
+    tras cada lote.
+    """
+    P.finalize()
+    t0 = time.perf_counter()
+    a = complex(P.alpha_re, P.alpha_im)
+    iterar = motores.iteradores(P).iterar_dinamico
+    z = NormalDist().inv_cdf((1 + confianza) / 2)
+    desplazamiento = np.random.default_rng(semilla).random(2)
+    conteos = np.zeros(len(DESENLACES), dtype=np.int64)
+    n = 0
+    while True:
+        m = min(lote, max_puntos - n)
+        u = (halton(n + 1, m, 2) + desplazamiento[0]) % 1.0   # el término 0 es (0, 0)
+        v = (halton(n + 1, m, 3) + desplazamiento[1]) % 1.0
+        etiquetas, _ = iterar(P.x_min + u*(P.x_max - P.x_min), P.y_min + v*(P.y_max - P.y_min), a, P)
+        conteos += np.bincount(np.take(_DESENLACE, etiquetas), minlength=len(DESENLACES))
+        n += m
+        intervalos = [intervalo(int(k), n, z) for k in conteos]
+        semianchos = [s for _, s in intervalos]
+        if progress_cb:
+            progress_cb(n, 2*max(semianchos))
+        if 2*max(semianchos) <= ancho or n >= max_puntos:
+            break
+    return {
+        "alpha": [P.alpha_re, P.alpha_im],
+        "puntos": n,
+        "conteos": dict(zip(DESENLACES, map(int, conteos))),
+        "fracciones": {d: int(k) / n for d, k in zip(DESENLACES, conteos)},
+        "semianchos": dict(zip(DESENLACES, semianchos)),
+        "intervalos": {d: [c - s, c + s] for d, (c, s) in zip(DESENLACES, intervalos)},
+        "convergido": 2*max(semianchos) <= ancho,
+        "segundos": time.perf_counter() - t0,
+    }
+
+
+def medir_alphas(alphas, comunes: dict, procesos: int = None, **opciones):
+    """Genera (re, im, resultado de medir) para cada alpha, según van terminando."""
+    trabajos = []
+    for re, im in alphas:
+        P = Params(**comunes)
+        P.alpha_re, P.alpha_im = re, im
+        trabajos.append(P)
+    if procesos == 1 or len(trabajos) == 1:
+        for P in trabajos:
+            yield P.alpha_re, P.alpha_im, medir(P, **opciones)
+        return
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as pool:
+        futuros = {pool.submit(medir, P, **opciones): P for P in trabajos}
+        for f in as_completed(futuros):
+            P = futuros[f]
+            yield P.alpha_re, P.alpha_im, f.result()
+
+
+def _columnas(detect_cycles: bool):
+    return [d for d in DESENLACES if detect_cycles or d != "periodico"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fracción del plano dinámico en cada cuenca, por Monte Carlo")
+    parser.add_argument('--alpha', type=float, nargs=2, action='append', metavar=('RE', 'IM'),
+                        help='Valor de alpha (se puede repetir)')
+    parser.add_argument('--rejilla', type=float, nargs=6, metavar=('RE0', 'RE1', 'NRE', 'IM0', 'IM1', 'NIM'),
+                        help='Rejilla de NRE x NIM valores de alpha')
+    parser.add_argument('--spec', help='Fichero JSON de cheby_halley_lotes (alphas, linea, rejilla y params)')
+    for campo in ('x_min', 'x_max', 'y_min', 'y_max', 'eps', 'cycle_tol'):
+        parser.add_argument('--' + campo.replace('_', '-'), type=float)
+    parser.add_argument('--iter-max', type=int)
+    parser.add_argument('--basin2-mode', choices=['s12', 'one'])
+    parser.add_argument('--detect-cycles', action='store_true')
+    parser.add_argument('--no-basin-radii', action='store_true',
+                        help='No cortar las órbitas que entran en la cuenca inmediata de 0, s1/s2 o 1')
+    parser.add_argument('--engine', choices=[m for m in motores.nombres() if motores.usa_arrays(m)], default='numpy',
+                        help='Motor de arrays con el que se clasifican los puntos')
+    parser.add_argument('--ancho', type=float, default=ANCHO,
+                        help=f'Ancho del intervalo de confianza de cada fracción (por defecto {ANCHO})')
+    parser.add_argument('--confianza', type=float, default=CONFIANZA)
+    parser.add_argument('--max-puntos', type=int, default=MAX_PUNTOS, help='Puntos como máximo por alpha')
+    parser.add_argument('--semilla', type=int, help='Semilla del desplazamiento aleatorio (resultados repetibles)')
+    parser.add_argument('--workers', type=int, help='Alphas simultáneos (por defecto, uno por CPU)')
+    parser.add_argument('--csv', metavar='FICHERO', help='Escribe también la tabla en CSV')
+    parser.add_argument('--json', metavar='FICHERO', help='Añade una línea JSON por alpha')
+    ns = parser.parse_args()
+
+    spec = {}
+    if ns.spec:
+        with open(ns.spec, encoding="utf-8") as f:
+            spec = json.load(f)
+    spec.setdefault("alphas", [])
+    spec["alphas"] = spec["alphas"] + (ns.alpha or [])
+    if ns.rejilla:
+        re0, re1, nre, im0, im1, nim = ns.rejilla
+        spec["rejilla"] = {"re": [re0, re1, int(nre)], "im": [im0, im1, int(nim)]}
+    alphas = alphas_de(spec)
+    if not alphas:
+        parser.error("Indica algún alpha con --alpha, --rejilla o --spec")
+
+    comunes = params_de(spec)
+    for campo in ('x_min', 'x_max', 'y_min', 'y_max', 'eps', 'cycle_tol', 'iter_max', 'basin2_mode'):
+        if getattr(ns, campo) is not None:
+            comunes[campo] = getattr(ns, campo)
+    if ns.detect_cycles:
+        comunes["detect_cycles"] = True
+    if ns.no_basin_radii:
+        comunes["basin_radii"] = False
+    comunes.update(engine=ns.engine, workers=1, use_cache=False)
+    columnas = _columnas(comunes.get("detect_cycles", False))
+
+    print(f"{'alpha':>22}  {'puntos':>8}  " + "  ".join(f"{c:>16}" for c in columnas))
+    filas = []
+    t0 = time.perf_counter()
+    for re, im, res in medir_alphas(alphas, comunes, ns.workers, ancho=ns.ancho, confianza=ns.confianza,
+                                    max_puntos=ns.max_puntos, semilla=ns.semilla):
+        celdas = [f"{res['fracciones'][c]:.4f} ± {res['semianchos'][c]:.4f}" for c in columnas]
+        aviso = "" if res["convergido"] else "  (sin llegar al ancho pedido)"
+        print(f"{complex(re, im)!s:>22}  {res['puntos']:>8}  " + "  ".join(f"{c:>16}" for c in celdas) + aviso)
+        sys.stdout.flush()
+        filas.append((re, im, res))
+        if ns.json:
+            with open(ns.json, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(res) + '\n')
+    print(f"{len(filas)} valores de alpha en {time.perf_counter() - t0:.1f} s")
+
+    if ns.csv:
+        with open(ns.csv, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(["alpha_re", "alpha_im", "puntos"] + [f"{c}{s}" for c in columnas for s in ("", "_semiancho")])
+            for re, im, res in sorted(filas, key=lambda fila: (fila[1], fila[0])):
+                w.writerow([re, im, res["puntos"]]
+                           + [x for c in columnas for x in (res["fracciones"][c], res["semianchos"][c])])
+        print(f"Tabla en: {ns.csv}")
@@ -0,0 +1,541 @@
+import numpy as np
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motores as motores
+from cheby_halley_nucleo import basin_radii, hex_to_rgb255, hsv_to_rgb255, period_color
+
+# ==========================
+# Etiquetas de clasificación
+# ==========================
+DESCONOCIDO = 0   # no resuelto tras iter_max iteraciones
+CUENCA0 = 1       # converge a 0
+CUENCA1 = 2       # converge a s1/s2 (o a 1 con basin2_mode="one")
+ESCAPE = 3        # escapa a infinito
+POLO = 4          # den≈0: la órbita cae en el polo de O_alpha (plano dinámico, se colorea
+                  # como escape) o el punto inicial no existe (plano de parámetros)
+PERIODICO = 5     # cae en un ciclo atractor; `iteraciones` guarda su periodo
+
+COLUMNAS_POR_BLOQUE = 64
+PASO_DISCOS = cuencas.PASO_DISCOS
+LADO_TESELA = 128
+
+
+# ==========================
+# Aritmética compleja sobre arrays
+# ==========================
+# Las operaciones reproducen paso a paso la aritmética de `complex` de CPython
+# (producto, cociente de Smith y potencias enteras por cuadrados) trabajando con
+# partes real e imaginaria por separado, de modo que el motor vectorial da
+# exactamente los mismos valores que el bucle escalar.
+
+def _prod(ar, ai, br, bi):
+    return ar*br - ai*bi, ar*bi + ai*br
+
+
+def _quot(ar, ai, br, bi):
+    abr = np.abs(br)
+    abi = np.abs(bi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # dividir numerador y denominador entre br
+        ratio = bi / br
+        den = br + bi*ratio
+        r1 = (ar + ai*ratio) / den
+        i1 = (ai - ar*ratio) / den
+        # dividir numerador y denominador entre bi
+        ratio = br / bi
+        den = br*ratio + bi
+        r2 = (ar*ratio + ai) / den
+        i2 = (ai*ratio - ar) / den
+    usar_re = abr >= abi
+    return np.where(usar_re, r1, r2), np.where(usar_re, i1, i2)
+
+
+def _pow(xr, xi, n: int):
+    rr, ri = 1.0, 0.0
+    pr, pi = xr, xi
+    mask = 1
+    while n >= mask:
+        if n & mask:
+            rr, ri = _prod(rr, ri, pr, pi)
+        mask <<= 1
+        if n >= mask:
+            pr, pi = _prod(pr, pi, pr, pi)
+    return rr, ri
+
+
+def _sqrt(zr, zi):
+    """Raíz cuadrada principal con el mismo algoritmo que cmath.sqrt."""
+    ax = np.abs(zr)
+    ay = np.abs(zi)
+    pequeno = (ax < np.finfo(float).tiny) & (ay < np.finfo(float).tiny)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = 2.0*np.sqrt(ax/8.0 + np.hypot(ax/8.0, ay/8.0))
+        axs = np.ldexp(ax, 53)
+        s_sub = np.ldexp(np.sqrt(axs + np.hypot(axs, np.ldexp(ay, 53))), -27)
+        s = np.where(pequeno, s_sub, s)
+        d = ay / (2.0*s)
+    pos = zr >= 0.0
+    rr = np.where(pos, s, d)
+    ri = np.copysign(np.where(pos, d, s), zi)
+    cero = (zr == 0.0) & (zi == 0.0)
+    return np.where(cero, 0.0, rr), np.where(cero, zi, ri)
+
+
+def _operador(zr, zi, c2r, c2i, tol):
+    """z**3 * (z - c2) / (1 - c2*z) con c2 = 2*(a - 1); den≈0 => inf."""
+    z3r, z3i = _pow(zr, zi, 3)
+    nr, ni = _prod(z3r, z3i, zr - c2r, zi - c2i)
+    pr, pi = _prod(c2r, c2i, zr, zi)
+    dr, di = 1.0 - pr, 0.0 - pi
+    polo = np.hypot(dr, di) < tol
+    with np.errstate(invalid='ignore'):
+        qr, qi = _quot(nr, ni, dr, di)
+    return np.where(polo, np.inf, qr), np.where(polo, 0.0, qi)
+
+
+# ==========================
+# Plano dinámico
+# ==========================
+def puntos_dinamico(P, i0: int, i1: int, j0: int = 0, j1: int = None):
+    """Puntos iniciales de los píxeles [i0, i1) x [j0, j1), forma (j1-j0, i1-i0)."""
+    j1 = P.height if j1 is None else j1
+    i = np.arange(i0, i1, dtype=float)
+    j = np.arange(j0, j1, dtype=float)
+    re = P.x_min + (i / (P.width - 1)) * (P.x_max - P.x_min)
+    im = P.y_min + (j / (P.height - 1)) * (P.y_max - P.y_min)
+    return np.broadcast_to(re, (j1 - j0, i1 - i0)), np.broadcast_to(im[:, None], (j1 - j0, i1 - i0))
+
+
+def iterar_dinamico(zr, zi, a: complex, P, contador: dict = None, estado: dict = None):
+    """Clasifica todos los puntos a la vez con el mismo criterio que classify_color.
+
+    Mantiene un conjunto activo de puntos sin resolver que se va reduciendo en cada
+    iteración. Devuelve (etiquetas, iteraciones) con la forma de la entrada. Si se
+    pasa `contador`, en contador["cortadas"] se suman las órbitas retiradas por las
+    cuencas inmediatas. Con `estado` la iteración es reanudable (ver _reanudar y
+    _pendientes).
+    """
+    forma = np.shape(zr)
+    zr = np.array(zr, dtype=float).ravel()
+    zi = np.array(zi, dtype=float).ravel()
+    etiquetas = np.full(zr.size, DESCONOCIDO, dtype=np.uint8)
+    iteraciones = np.full(zr.size, P.iter_max, dtype=np.int32)
+    idx = np.arange(zr.size)
+
+    c2 = 2*(a - 1)
+    r0, objetivos, otros = basin_radii(a, P)
+    cotas0 = cuencas.cotas_cero(c2, r0, P.eps)
+    cotas = [cuencas.cotas_fijo(t, c2, r, P.eps) for t, r in objetivos]
+    # puntos de control de la detección de ciclos: el calendario (k_ref, lim) es
+    # común a todos los puntos porque todas las órbitas empiezan a la vez
+    k0, zr, zi, ref_r, ref_i, k_ref, lim = _reanudar(estado, 1, zr, zi)
+
+    for k in range(k0, P.iter_max + 1):
+        if idx.size == 0:
+            break
+        m = np.hypot(zr, zi)
+        # a menos de eps, o dentro de una cuenca inmediata (ver basin_radii en
+        # cheby_halley_nucleo) con el paso en que quedaría a menos de eps ya fijado
+        n = np.full(zr.size, k, dtype=np.int32)
+        b1 = np.zeros(zr.size, dtype=bool)
+        for (t, r), cota in zip(objetivos, cotas):
+            d = np.hypot(zr - t.real, zi - t.imag)
+            b1 |= (d < P.eps) | _cortar(d, r, cota, cuencas.pasos_fijo, P.eps, k, P.iter_max, n)
+        b0 = (m < P.eps) | _cortar(m, r0, cotas0, cuencas.pasos_cero, P.eps, k, P.iter_max, n)
+        b1 &= ~b0
+        esc = (m > P.escape) & ~b0 & ~b1
+        hecho = b0 | b1 | esc
+        nunca = None
+        for f, r in otros:
+            dentro = (np.hypot(zr - f.real, zi - f.imag) < r) & ~hecho
+            nunca = dentro if nunca is None else nunca | dentro
+        if contador is not None:
+            cortadas = (n > k).sum() + (0 if nunca is None else nunca.sum())
+            contador["cortadas"] = contador.get("cortadas", 0) + int(cortadas)
+        ciclo = _ciclos(zr, zi, ref_r, ref_i, hecho, P.cycle_tol) if P.detect_cycles and k > k_ref else None
+        if ciclo is not None:
+            hecho |= ciclo
+        if hecho.any() or (nunca is not None and nunca.any()):
+            etiquetas[idx[b0]] = CUENCA0
+            etiquetas[idx[b1]] = CUENCA1
+            # _operador devuelve inf justo en los puntos con den≈0
+            etiquetas[idx[esc]] = np.where(np.isinf(zr[esc]), POLO, ESCAPE)
+            iteraciones[idx[hecho]] = n[hecho]
+            if ciclo is not None:
+                etiquetas[idx[ciclo]] = PERIODICO
+                iteraciones[idx[ciclo]] = k - k_ref
+            if nunca is not None:
+                hecho |= nunca   # quedan DESCONOCIDO con iter_max iteraciones
+            sigue = ~hecho
+            idx, zr, zi, ref_r, ref_i = idx[sigue], zr[sigue], zi[sigue], ref_r[sigue], ref_i[sigue]
+        if k > k_ref and k - k_ref == lim:
+            ref_r, ref_i, k_ref, lim = zr, zi, k, 2*lim
+        zr, zi = _operador(zr, zi, c2.real, c2.imag, 1e-10)
+
+    _pendientes(estado, max(k0, P.iter_max + 1), idx, zr, zi, ref_r, ref_i, k_ref, lim)
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
+
+
+def _cortar(d, r, cotas, pasos, eps: float, k: int, iter_max: int, n):
+    """Órbitas a distancia eps <= d < r del centro de una cuenca inmediata que se
+    pueden cortar: `pasos` fija en cuántos pasos quedarían a menos de eps y no se
+    pasan de iter_max. Anota en n la iteración en que lo harían."""
+    corta = (d < r) & (d >= eps)
+    if corta.any():
+        sel = np.flatnonzero(corta)
+        j_min, j_max = pasos(d[sel].astype(float), cotas, eps)
+        fijo = (j_min == j_max) & (k + j_max <= iter_max)
+        corta[sel[~fijo]] = False
+        n[sel[fijo]] = k + j_max[fijo]
+    return corta
+
+
+def _reanudar(estado, inicio: int, zr, zi):
+    """Punto de partida de la iteración: (k, zr, zi, ref_r, ref_i, k_ref, lim).
+
+    Sin `estado`, o si no trae "k", las órbitas empiezan en la iteración `inicio`
+    desde (zr, zi). Si lo trae, siguen desde la iteración estado["k"] con los valores
+    estado["zr"], estado["zi"] y los puntos de control de la detección de ciclos
+    (ref_r, ref_i, k_ref, lim) que dejó _pendientes al terminar la pasada anterior.
+    """
+    if not estado or "k" not in estado:
+        return inicio, zr, zi, zr, zi, inicio, 1
+    campos = [np.array(estado[c], dtype=float).ravel() for c in ("zr", "zi", "ref_r", "ref_i")]
+    return (estado["k"], *campos, estado["k_ref"], estado["lim"])
+
+
+def _pendientes(estado, k: int, idx, zr, zi, ref_r, ref_i, k_ref: int, lim: int):
+    """Deja en `estado` lo necesario para seguir iterando las órbitas sin resolver.
+
+    "idx" son sus posiciones en la entrada (aplanada), "k" la siguiente iteración,
+    zr, zi sus valores en ella y ref_r, ref_i, k_ref, lim los puntos de control de la
+    detección de ciclos.
+    """
+    if estado is not None:
+        estado.update(k=k, idx=idx, zr=zr, zi=zi, ref_r=ref_r, ref_i=ref_i, k_ref=k_ref, lim=lim)
+
+
+def _ciclos(zr, zi, ref_r, ref_i, hecho, tol):
+    """Órbitas sin resolver que han vuelto a su punto de control (método de Brent)."""
+    return (np.hypot(zr - ref_r, zi - ref_i) < tol) & ~hecho
+
+
+def coordenadas_dinamico(P, i, j):
+    """Puntos iniciales (re, im) de los píxeles sueltos (i[k], j[k]) del plano dinámico."""
+    re = P.x_min + (np.asarray(i) / (P.width - 1)) * (P.x_max - P.x_min)
+    im = P.y_min + (np.asarray(j) / (P.height - 1)) * (P.y_max - P.y_min)
+    return re, im
+
+
+def pixeles_dinamico(P, i, j):
+    """Clasificación de los píxeles sueltos (i[k], j[k]) del plano dinámico."""
+    re, im = coordenadas_dinamico(P, i, j)
+    return motores.iteradores(P).iterar_dinamico(re, im, complex(P.alpha_re, P.alpha_im), P)
+
+
+def tesela_dinamico(P, i0: int, i1: int, j0: int, j1: int):
+    """Clasificación del rectángulo de píxeles [i0, i1) x [j0, j1) del plano dinámico."""
+    zr, zi = puntos_dinamico(P, i0, i1, j0, j1)
+    return motores.iteradores(P).iterar_dinamico(zr, zi, complex(P.alpha_re, P.alpha_im), P)
+
+
+def clasificar_dinamico(P, progress_cb=None, stop_flag=None, columnas_por_bloque: int = COLUMNAS_POR_BLOQUE):
+    """Etiquetas e iteraciones de todo el plano, por bloques de columnas.
+
+    Devuelve None si se cancela mediante stop_flag.
+    """
+    P.finalize()
+    etiquetas = np.empty((P.height, P.width), dtype=np.uint8)
+    iteraciones = np.empty((P.height, P.width), dtype=np.int32)
+    for i0 in range(0, P.width, columnas_por_bloque):
+        if stop_flag and stop_flag():
+            return None
+        i1 = min(i0 + columnas_por_bloque, P.width)
+        etiquetas[:, i0:i1], iteraciones[:, i0:i1] = tesela_dinamico(P, i0, i1, 0, P.height)
+        if progress_cb:
+            progress_cb(i1, P.width)
+    return etiquetas, iteraciones
+
+
+# Misma paleta que classify_color: h = (k % 90)/90 con s=0.85, v=1
+_PALETA_ESCAPE = np.array(
+    [hsv_to_rgb255(k / 90.0, 0.85, 1.0) for k in range(90)],
+    dtype=np.uint8,
+)
+
+
+def _colorear_periodos(rgb, etiquetas, iteraciones):
+    per = etiquetas == PERIODICO
+    if per.any():
+        periodos, inv = np.unique(iteraciones[per], return_inverse=True)
+        rgb[per] = np.array([period_color(int(p)) for p in periodos], dtype=np.uint8)[inv]
+
+
+def colorear_dinamico(etiquetas, iteraciones, P):
+    """Array RGB (height, width, 3) a partir de la clasificación."""
+    rgb = np.zeros(etiquetas.shape + (3,), dtype=np.uint8)
+    rgb[etiquetas == DESCONOCIDO] = P.color_unknown
+    rgb[etiquetas == CUENCA0] = P.color_basin0
+    rgb[etiquetas == CUENCA1] = P.color_basin1
+    esc = (etiquetas == ESCAPE) | (etiquetas == POLO)
+    if P.color_escape_mode.lower() == "hsv":
+        rgb[esc] = _PALETA_ESCAPE[iteraciones[esc] % 90]
+    else:
+        try:
+            rgb[esc] = hex_to_rgb255(P.color_escape_mode)
+        except Exception:
+            rgb[esc] = (0, 0, 0)
+    _colorear_periodos(rgb, etiquetas, iteraciones)
+    return rgb
+
+
+# ==========================
+# Plano de parámetros
+# ==========================
+def puntos_parametros(Q, i0: int, i1: int, j0: int = 0, j1: int = None):
+    """Valores de alpha de los píxeles [i0, i1) x [j0, j1), forma (j1-j0, i1-i0)."""
+    j1 = Q.height if j1 is None else j1
+    i = np.arange(i0, i1, dtype=float)
+    j = np.arange(j0, j1, dtype=float)
+    re = Q.x_min + (i / Q.width) * (Q.x_max - Q.x_min)
+    im = Q.y_max - (j / Q.height) * (Q.y_max - Q.y_min)
+    return np.broadcast_to(re, (j1 - j0, i1 - i0)), np.broadcast_to(im[:, None], (j1 - j0, i1 - i0))
+
+
+def critico_secundario(ar, ai, signo: float = 1.0):
+    """Versión vectorial de critico_secundario: (zr, zi, valido).
+
+    Con signo=-1 da el otro punto crítico libre, (num - raiz)/den.
+    """
+    a2r, a2i = _pow(ar, ai, 2)
+    a3r, a3i = _pow(ar, ai, 3)
+    a4r, a4i = _pow(ar, ai, 4)
+    # num = 3 - 4*alpha + 2*alpha**2
+    tr, ti = _prod(4.0, 0.0, ar, ai)
+    ur, ui = _prod(2.0, 0.0, a2r, a2i)
+    num_r, num_i = (3.0 - tr) + ur, (0.0 - ti) + ui
+    # disc = -6*alpha + 19*alpha**2 - 16*alpha**3 + 4*alpha**4
+    t1r, t1i = _prod(-6.0, 0.0, ar, ai)
+    t2r, t2i = _prod(19.0, 0.0, a2r, a2i)
+    t3r, t3i = _prod(16.0, 0.0, a3r, a3i)
+    t4r, t4i = _prod(4.0, 0.0, a4r, a4i)
+    disc_r = ((t1r + t2r) - t3r) + t4r
+    disc_i = ((t1i + t2i) - t3i) + t4i
+    rr, ri = _sqrt(disc_r, disc_i)
+    # den = 3*(alpha - 1)
+    den_r, den_i = _prod(3.0, 0.0, ar - 1.0, ai)
+    valido = np.hypot(den_r, den_i) >= 1e-12
+    zr, zi = _quot(num_r + signo*rr, num_i + signo*ri, den_r, den_i)
+    return zr, zi, valido
+
+
+def iterar_parametros(ar, ai, iter_max: int, eps: float, detect_cycles: bool = False, cycle_tol: float = 1e-6,
+                      radios: bool = True, contador: dict = None, signo: float = 1.0, estado: dict = None):
+    """Itera la órbita crítica de cada alpha a la vez, retirando las resueltas.
+
+    Devuelve (etiquetas, iteraciones): POLO si den≈0, CUENCA0/ESCAPE con el número
+    de iteraciones hasta |z| < eps o |z| > 1/eps, PERIODICO con el periodo si se
+    detecta un ciclo y DESCONOCIDO si agota iter_max. Con `radios` (y sin detección
+    de ciclos) las órbitas que entran en la cuenca inmediata de un punto fijo atractor
+    se retiran en seguida como DESCONOCIDO (ver cheby_halley_cuencas); si se pasa
+    `contador`, se suman en contador["cortadas"]. Con signo=-1 se itera el otro punto
+    crítico libre (ver critico_inverso). Con `estado` la iteración es reanudable,
+    como en iterar_dinamico.
+    """
+    forma = np.shape(ar)
+    ar = np.array(ar, dtype=float).ravel()
+    ai = np.array(ai, dtype=float).ravel()
+    etiquetas = np.full(ar.size, DESCONOCIDO, dtype=np.uint8)
+    iteraciones = np.full(ar.size, iter_max, dtype=np.int32)
+    eps_inv = 1 / eps
+
+    with np.errstate(all='ignore'):
+        zr, zi, valido = critico_secundario(ar, ai, signo)
+    etiquetas[~valido] = POLO
+    iteraciones[~valido] = 0
+    radios = radios and not detect_cycles
+    discos = []
+    idx = np.flatnonzero(valido)
+    n0, zr, zi, ref_r, ref_i, n_ref, lim = _reanudar(estado, 0, zr, zi)
+    zr, zi, ref_r, ref_i = zr[idx], zi[idx], ref_r[idx], ref_i[idx]
+    # c2 = 2*(alpha - 1), constante a lo largo de cada órbita
+    c2r, c2i = _prod(2.0, 0.0, ar[idx] - 1.0, ai[idx])
+
+    for n in range(n0, iter_max):
+        if idx.size == 0:
+            break
+        m = np.hypot(zr, zi)
+        b0 = m < eps
+        esc = m > eps_inv
+        hecho = b0 | esc
+        ciclo = _ciclos(zr, zi, ref_r, ref_i, hecho, cycle_tol) if detect_cycles and n > n_ref else None
+        if ciclo is not None:
+            hecho |= ciclo
+        # cuencas inmediatas de s1, s2 o 1: la órbita ya no llegará a 0 ni escapará. Los
+        # discos son invariantes, así que basta mirarlos cada pocas iteraciones; se
+        # calculan sólo para las órbitas que siguen activas tras las primeras, indexados
+        # como los puntos de entrada (se leen con idx)
+        if radios and n == max(PASO_DISCOS, n0):
+            discos = _discos_parametros(ar[idx], ai[idx], eps, idx, etiquetas.size)
+        nunca = None
+        for fr, fi, rho in (discos if n % PASO_DISCOS == 0 else ()):
+            dentro = np.hypot(zr - fr[idx], zi - fi[idx]) < rho[idx]
+            nunca = dentro if nunca is None else nunca | dentro
+        if nunca is not None:
+            nunca &= ~hecho
+            if contador is not None:
+                contador["cortadas"] = contador.get("cortadas", 0) + int(nunca.sum())
+        if hecho.any() or (nunca is not None and nunca.any()):
+            etiquetas[idx[b0]] = CUENCA0
+            etiquetas[idx[esc]] = ESCAPE
+            iteraciones[idx[hecho]] = n
+            if ciclo is not None:
+                etiquetas[idx[ciclo]] = PERIODICO
+                iteraciones[idx[ciclo]] = n - n_ref
+            sigue = ~hecho if nunca is None else ~(hecho | nunca)
+            idx, zr, zi, c2r, c2i = idx[sigue], zr[sigue], zi[sigue], c2r[sigue], c2i[sigue]
+            ref_r, ref_i = ref_r[sigue], ref_i[sigue]
+        if n > n_ref and n - n_ref == lim:
+            ref_r, ref_i, n_ref, lim = zr, zi, n, 2*lim
+        zr, zi = _operador(zr, zi, c2r, c2i, 1e-12)
+
+    _pendientes(estado, max(n0, iter_max), idx, zr, zi, ref_r, ref_i, n_ref, lim)
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
+
+
+def _discos_parametros(ar, ai, eps: float, idx, total: int):
+    """(fr, fi, rho) de los puntos fijos s1, s2 y 1 de cada alpha con algún disco útil.
+
+    Los alphas (ar, ai) son los de las posiciones idx; los arrays devueltos tienen
+    `total` elementos y sólo valen en esas posiciones.
+    """
+    a = ar + 1j*ai
+    c = 2*(a - 1)
+    discos = []
+    with np.errstate(all='ignore'):
+        disc = np.sqrt(4*a*a - 12*a + 5)
+        for f in ((2*a - 3 - disc)/2, (2*a - 3 + disc)/2, np.ones_like(a)):
+            # el radio sólo se calcula donde f es atractor (|O'(f)| < 1), que suele ser poca parte
+            atractor = np.abs(4*f**3 - 3*c*f*f + c*f) < np.abs(1 - c*f)
+            if not atractor.any():
+                continue
+            rho = np.zeros(a.shape)
+            rho[atractor] = np.nan_to_num(cuencas.radio_fijo(f[atractor], c[atractor], eps, 1/eps))
+            if (rho > eps).any():
+                fr, fi, r = np.zeros(total), np.zeros(total), np.zeros(total)
+                fr[idx], fi[idx], r[idx] = f.real, f.imag, rho
+                discos.append((fr, fi, r))
+    return discos
+
+
+def coordenadas_parametros(Q, i, j):
+    """Valores de alpha (re, im) de los píxeles sueltos (i[k], j[k]) del plano de parámetros."""
+    re = Q.x_min + (np.asarray(i) / Q.width) * (Q.x_max - Q.x_min)
+    im = Q.y_max - (np.asarray(j) / Q.height) * (Q.y_max - Q.y_min)
+    return re, im
+
+
+def pixeles_parametros(Q, i, j):
+    """Clasificación de los píxeles sueltos (i[k], j[k]) del plano de parámetros."""
+    re, im = coordenadas_parametros(Q, i, j)
+    return motores.iteradores(Q).iterar_parametros(re, im, Q.iter_max, Q.eps, Q.detect_cycles, Q.cycle_tol,
+                                                   Q.basin_radii)
+
+
+def tesela_parametros(Q, i0: int, i1: int, j0: int, j1: int):
+    """Clasificación del rectángulo de píxeles [i0, i1) x [j0, j1) del plano de parámetros."""
+    ar, ai = puntos_parametros(Q, i0, i1, j0, j1)
+    return motores.iteradores(Q).iterar_parametros(ar, ai, Q.iter_max, Q.eps, Q.detect_cycles, Q.cycle_tol,
+                                                   Q.basin_radii)
+
+
+def clasificar_parametros(Q, progress_cb=None, stop_flag=None, columnas_por_bloque: int = COLUMNAS_POR_BLOQUE):
+    """Etiquetas e iteraciones de todo el plano de parámetros, por bloques de columnas."""
+    etiquetas = np.empty((Q.height, Q.width), dtype=np.uint8)
+    iteraciones = np.empty((Q.height, Q.width), dtype=np.int32)
+    for i0 in range(0, Q.width, columnas_por_bloque):
+        if stop_flag and stop_flag():
+            return None
+        i1 = min(i0 + columnas_por_bloque, Q.width)
+        etiquetas[:, i0:i1], iteraciones[:, i0:i1] = tesela_parametros(Q, i0, i1, 0, Q.height)
+        if progress_cb:
+            progress_cb(i1, Q.width)
+    return etiquetas, iteraciones
+
+
+def critico_inverso(etiquetas, iteraciones):
+    """Clasificación de la órbita del otro punto crítico libre a partir de la del primero.
+
+    Los dos puntos críticos libres son inversos (su producto es 1) y O_alpha(1/z) =
+    1/O_alpha(z), así que la órbita del segundo es la inversa de la del primero: llega
+    a infinito cuando la otra llega a 0 y viceversa, en las mismas iteraciones, y el
+    resto de resultados (ciclos, órbitas sin resolver) se conserva.
+    """
+    inv = etiquetas.copy()
+    inv[etiquetas == CUENCA0] = ESCAPE
+    inv[etiquetas == ESCAPE] = CUENCA0
+    return inv, iteraciones
+
+
+def criticos_libres(etiquetas, iteraciones):
+    """Clasificación conjunta de los dos puntos críticos libres: arrays (..., 2), el
+    último eje es el punto crítico (+raiz, -raiz)."""
+    inv, _ = critico_inverso(etiquetas, iteraciones)
+    return np.stack([etiquetas, inv], axis=-1), np.stack([iteraciones, iteraciones], axis=-1)
+
+
+def colorear_parametros(etiquetas, iteraciones, colores, criticos: str = "combinado"):
+    """Array RGB: colores[n % len(colores)] si la órbita se resuelve, color por
+    periodo si cae en un ciclo y negro en otro caso.
+
+    Con criticos="combinado" el color es el de las iteraciones hasta que los dos
+    puntos críticos libres llegan a una raíz (las mismas para ambos). Con "mas" o
+    "menos" se sigue sólo ese punto crítico y el color se oscurece si llega a
+    infinito en vez de a 0.
+    """
+    paleta = np.array(colores, dtype=np.uint8).reshape(-1, 3)
+    rgb = np.zeros(etiquetas.shape + (3,), dtype=np.uint8)
+    ok = (etiquetas == CUENCA0) | (etiquetas == ESCAPE)
+    rgb[ok] = paleta[iteraciones[ok] % len(paleta)]
+    if criticos != "combinado":
+        infinito = etiquetas == (CUENCA0 if criticos == "menos" else ESCAPE)
+        rgb[infinito] //= 2
+    _colorear_periodos(rgb, etiquetas, iteraciones)
+    return rgb
+
+
+def comprobar_criticos(Q) -> dict:
+    """Itera de verdad el otro punto crítico libre y lo compara con critico_inverso."""
+    ar, ai = puntos_parametros(Q, 0, Q.width)
+    args = (Q.iter_max, Q.eps, Q.detect_cycles, Q.cycle_tol, Q.basin_radii)
+    e_a, n_a = critico_inverso(*iterar_parametros(ar, ai, *args))
+    e_b, n_b = iterar_parametros(ar, ai, *args, signo=-1.0)
+    con_iter = np.isin(e_b, (CUENCA0, ESCAPE, PERIODICO))
+    distintos = (e_a != e_b) | (con_iter & (n_a != n_b))
+    return {
+        "pixeles": Q.width * Q.height,
+        "distintos": int(distintos.sum()),
+        "fraccion_distintos": float(distintos.sum()) / (Q.width * Q.height),
+    }
+
+
+def teselas(width: int, height: int, lado: int = LADO_TESELA):
+    """Rectángulos (i0, i1, j0, j1) que cubren una rejilla width x height."""
+    return [
+        (i0, min(i0 + lado, width), j0, min(j0 + lado, height))
+        for i0 in range(0, width, lado)
+        for j0 in range(0, height, lado)
+    ]
+
+
+# Función de tesela y de píxeles sueltos de cada plano, para los renderizadores
+# que trocean la rejilla o eligen qué píxeles calcular (iteran con el motor de
+# arrays de P.engine, ver cheby_halley_motores)
+TESELAS = {
+    "dinamico": tesela_dinamico,
+    "parametros": tesela_parametros,
+}
+PIXELES = {
+    "dinamico": pixeles_dinamico,
+    "parametros": pixeles_parametros,
+}
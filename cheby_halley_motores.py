@@ -0,0 +1,97 @@
+import importlib
+import importlib.util
+import warnings
+from dataclasses import dataclass
+from functools import lru_cache
+
+# ==========================
+# Registro de motores de cálculo
+# ==========================
+# Cada motor tiene el nombre que se pasa con --engine. "python" es el bucle escalar de
+# los scripts, que colorea píxel a píxel sin arrays. Los demás clasifican rejillas
+# enteras con las funciones iterar_dinamico/iterar_parametros de su módulo, que
+# cheby_halley_motor llama desde todas sus teselas: así la caché, el multiproceso, la
+# subdivisión adaptativa y el suavizado sirven para cualquiera de ellos. Todos dan
+# exactamente la misma clasificación (el banco de pruebas lo comprueba por hash),
+# salvo los marcados como no exactos (precisión simple), que la caché y los lotes
+# guardan aparte.
+#
+# Un motor cuyas dependencias no están instaladas se sustituye por su alternativa
+# con un aviso.
+
+
+@dataclass
+class Motor:
+    nombre: str
+    descripcion: str
+    modulo: str = None          # módulo con iterar_dinamico/iterar_parametros (None: bucle escalar)
+    requiere: tuple = ()        # paquetes que tienen que poder importarse
+    alternativa: str = None     # motor que se usa si falta alguno
+    exacto: bool = True         # misma clasificación que classify_color
+
+    def disponible(self) -> bool:
+        return all(_instalado(p) for p in self.requiere)
+
+
+@lru_cache(maxsize=None)
+def _instalado(paquete: str) -> bool:
+    return importlib.util.find_spec(paquete) is not None
+
+
+MOTORES = {}
+
+
+def registrar(motor: Motor):
+    MOTORES[motor.nombre] = motor
+
+
+registrar(Motor("python", "bucle escalar píxel a píxel"))
+registrar(Motor("numpy", "vectorial (NumPy)", "cheby_halley_motor", ("numpy",)))
+registrar(Motor("numba", "compilado con Numba, en paralelo por órbitas", "cheby_halley_numba",
+                ("numpy", "numba"), alternativa="python"))
+registrar(Motor("float32", "vectorial en precisión simple (aproximado)", "cheby_halley_simple", ("numpy",),
+                exacto=False))
+
+
+def nombres():
+    return list(MOTORES)
+
+
+def disponibles():
+    return [n for n, m in MOTORES.items() if m.disponible()]
+
+
+def elegir(nombre: str) -> str:
+    """El motor `nombre` si está disponible; si no, su alternativa (con un aviso)."""
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor desconocido: {nombre} (disponibles: {', '.join(MOTORES)})")
+    m = MOTORES[nombre]
+    while not m.disponible() and m.alternativa:
+        faltan = [p for p in m.requiere if not _instalado(p)]
+        warnings.warn(f"El motor {m.nombre} requiere {', '.join(faltan)}, que no está instalado; "
+                      f"se usa {m.alternativa}", RuntimeWarning, stacklevel=2)
+        m = MOTORES[m.alternativa]
+    return m.nombre
+
+
+def usa_arrays(nombre: str) -> bool:
+    """True si el motor clasifica rejillas enteras (no es el bucle escalar)."""
+    return MOTORES[nombre].modulo is not None
+
+
+def exacto(nombre: str) -> bool:
+    """True si el motor da exactamente la clasificación de classify_color."""
+    m = MOTORES.get(nombre)
+    return m is None or m.exacto
+
+
+def iteradores(P):
+    """Módulo con iterar_dinamico/iterar_parametros para los parámetros P.
+
+    Es el del motor de P (campo `engine`) o, si éste no trabaja con arrays o no está
+    disponible, el de NumPy.
+    """
+    m = MOTORES.get(getattr(P, "engine", "numpy"))
+    if m is None or m.modulo is None or not m.disponible():
+        m = MOTORES["numpy"]
+    return importlib.import_module(m.modulo)
@@ -0,0 +1,444 @@
+import cmath
+import colorsys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motores as motores
+
+# ==========================
+# Núcleo de cálculo sin interfaz
+# ==========================
+# Lo que comparten cheby_halley_dinamico (CLI), cheby_halley_dinamico_gui y
+# cheby_halley_parametros: el modelo de parámetros del plano dinámico, la iteración
+# escalar de referencia (classify_color y la órbita crítica del plano de parámetros)
+# y las etapas cálculo -> suavizado -> color -> marcas con los motores de arrays.
+#
+# Sólo importa la biblioteca estándar al cargarse: Pillow, numpy y los módulos de
+# caché, procesos, etc. se importan al usarlos, y tkinter nunca. Así lo pueden
+# importar en unas decenas de milisegundos los procesos de lotes y de teselas, que
+# en nodos sin pantalla se lanzan por miles.
+
+# ==========================
+# Modelo de parámetros
+# ==========================
+@dataclass
+class Params:
+    alpha_re: float = 0.0
+    alpha_im: float = 0.0
+    x_min: float = -2.5
+    x_max: float = 1.5
+    y_min: float = -2.5
+    y_max: float = 1.5
+    width: int = 1400
+    height: int = 800
+    iter_max: int = 300
+    eps: float = 1e-3
+    escape: Optional[float] = None  # None (o 0) => 1/eps
+    color_basin0: Tuple[int,int,int] = (250,208,36)   # oro
+    color_basin1: Tuple[int,int,int] = (34,209,185)   # turquesa
+    color_unknown: Tuple[int,int,int] = (40,40,40)    # gris
+    color_escape_mode: str = "hsv"                   # "hsv" o un color fijo hexadecimal
+    basin2_mode: str = "s12"                         # "s12" o "one" (1 como segundo atractor)
+    draw_s12: bool = True                            # dibujar s1/s2 como cuadrados
+    draw_marks: bool = True                          # dibujar marcas de 0 y 1
+    outdir: str = "imagenes"
+    filename_prefix: str = "dinamico"
+    engine: str = "python"                           # motor de cheby_halley_motores: "python", "numpy", "numba", "float32"
+    workers: int = 1                                 # >1: teselas repartidas entre procesos
+    adaptive: bool = False                           # subdivisión adaptativa (Mariani–Silver)
+    detect_cycles: bool = False                      # cortar órbitas que caen en un ciclo atractor
+    cycle_tol: float = 1e-6                          # tolerancia para dar un ciclo por detectado
+    use_cache: bool = True                           # reutilizar teselas de la caché en disco
+    basin_radii: bool = True                         # cortar órbitas en las cuencas inmediatas
+    antialias: int = 1                               # >1: submuestras n x n en los píxeles de borde
+
+    def finalize(self):
+        if self.escape is None or self.escape == 0:
+            self.escape = 1.0 / float(self.eps)
+        self.engine = motores.elegir(self.engine)   # sin sus dependencias, su alternativa
+
+# ==========================
+# Utilidades de color
+# ==========================
+def hex_to_rgb255(s: str) -> Tuple[int,int,int]:
+    s = s.strip()
+    if s.startswith('#'):
+        s = s[1:]
+    if len(s) == 3:
+        s = ''.join(ch*2 for ch in s)
+    if len(s) != 6:
+        raise ValueError("Hex color inválido")
+    r = int(s[0:2], 16)
+    g = int(s[2:4], 16)
+    b = int(s[4:6], 16)
+    return (r,g,b)
+
+def rgb255_to_hex(rgb: Tuple[int,int,int]) -> str:
+    r,g,b = rgb
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+def hsv_to_rgb255(h: float, s: float, v: float) -> Tuple[int,int,int]:
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    return (int(255*r), int(255*g), int(255*b))
+
+def period_color(p: int) -> Tuple[int,int,int]:
+    # tonos apagados separados por la razón áurea para distinguir periodos
+    return hsv_to_rgb255(((p - 1) * 0.618033988749895) % 1.0, 0.45, 0.6)
+
+# ==========================
+# Dinámica compleja
+# ==========================
+def O_alpha(z: complex, a: complex, tol: float = 1e-10) -> complex:
+    num = z**3 * (z - 2*(a - 1))
+    den = 1 - 2*(a - 1)*z
+    if abs(den) < tol:
+        return complex(float("inf"), 0.0)
+    return num/den
+
+def extra_fixed_points(a: complex) -> Tuple[complex, complex]:
+    disc = cmath.sqrt(4*a*a - 12*a + 5)
+    return (2*a - 3 - disc)/2, (2*a - 3 + disc)/2
+
+def critical_point(a: complex) -> Optional[complex]:
+    """Punto crítico libre de O_alpha que itera el plano de parámetros (None si α = 1).
+
+    El otro, (num - raiz)/den, es su inverso y su órbita la inversa de ésta, así que
+    no hace falta iterarlo (ver critico_inverso en cheby_halley_motor).
+    """
+    num = 3 - 4 * a + 2 * a**2
+    disc = -6 * a + 19 * a**2 - 16 * a**3 + 4 * a**4
+    raiz = cmath.sqrt(disc)
+    den = 3 * (a - 1)
+    if abs(den) < 1e-12:
+        return None
+    return (num + raiz) / den
+
+# ==========================
+# Clasificación escalar de órbitas
+# ==========================
+# Resultado de cada órbita (mismos valores que las etiquetas de cheby_halley_motor)
+UNKNOWN, BASIN0, BASIN1, ESCAPE, POLE, PERIODIC = range(6)
+
+
+def basin_radii(a: complex, P: Params):
+    """Radios de parada (r0, objetivos, otros) de cheby_halley_cuencas; sin cuencas
+    inmediatas, eps alrededor de 0 y de los objetivos de la cuenca 2."""
+    if not P.basin_radii or P.detect_cycles:
+        if P.basin2_mode == "one":
+            return P.eps, ((1+0j, P.eps),), ()
+        s1, s2 = extra_fixed_points(a)
+        return P.eps, ((s1, P.eps), (s2, P.eps)), ()
+    return cuencas.radios_dinamico(a, P.eps, P.escape, P.basin2_mode)
+
+
+def classify_orbit(z0: complex, a: complex, P: Params):
+    """(resultado, k): iteración en la que se resuelve la órbita, o su periodo si es PERIODIC."""
+    z = z0
+    # Con las cuencas inmediatas los radios son mayores que eps: dentro de uno la órbita
+    # se da por resuelta si ya se sabe en qué iteración quedaría a menos de eps y no
+    # pasa de iter_max (resultado y k son los de la iteración completa)
+    c = 2*(a - 1)
+    r0, targets, others = basin_radii(a, P)
+    bounds0 = cuencas.cotas_cero(c, r0, P.eps)
+    bounds = [cuencas.cotas_fijo(t, c, r, P.eps) for t, r in targets]
+    z_ref, k_ref, lim = z, 1, 1
+    for k in range(1, P.iter_max + 1):
+        m = abs(z)
+        if m < P.eps:
+            return BASIN0, k
+        if m < r0:
+            j_min, j_max = cuencas.pasos_cero(m, bounds0, P.eps)
+            if j_min == j_max and k + j_max <= P.iter_max:
+                return BASIN0, k + j_max
+        for (t, r), b in zip(targets, bounds):
+            d = abs(z - t)
+            if d < P.eps:
+                return BASIN1, k
+            if d < r:
+                j_min, j_max = cuencas.pasos_fijo(d, b, P.eps)
+                if j_min == j_max and k + j_max <= P.iter_max:
+                    return BASIN1, k + int(j_max)
+        if m > P.escape:
+            # O_alpha devuelve inf si la órbita cae en el polo (den≈0)
+            return (POLE if cmath.isinf(z) else ESCAPE), k
+        for f, r in others:
+            if abs(z - f) < r:
+                return UNKNOWN, P.iter_max   # no se resolvería nunca
+        # Detección de ciclos (Brent): comparar con un punto de control que se
+        # renueva cada vez que se dobla la distancia recorrida desde él
+        if P.detect_cycles and k > k_ref:
+            if abs(z - z_ref) < P.cycle_tol:
+                return PERIODIC, k - k_ref
+            if k - k_ref == lim:
+                z_ref, k_ref, lim = z, k, 2*lim
+        z = O_alpha(z, a)
+    return UNKNOWN, P.iter_max
+
+
+def orbit_color(result: int, k: int, P: Params):
+    if result == BASIN0:
+        return P.color_basin0
+    if result == BASIN1:
+        return P.color_basin1
+    if result == ESCAPE or result == POLE:
+        if P.color_escape_mode.lower() == "hsv":
+            h = (k % 90) / 90.0
+            return hsv_to_rgb255(h, 0.85, 1.0)
+        else:
+            # color fijo vía hex
+            try:
+                return hex_to_rgb255(P.color_escape_mode)
+            except Exception:
+                return (0,0,0)
+    if result == PERIODIC:
+        return period_color(k)
+    return P.color_unknown
+
+
+def classify_color(z0: complex, a: complex, P: Params):
+    return orbit_color(*classify_orbit(z0, a, P), P)
+
+
+def classify_parameter(a: complex, Q):
+    """(resultado, n) de la órbita crítica de α en el plano de parámetros Q.
+
+    BASIN0 si llega a 0 y ESCAPE si escapa en n iteraciones, PERIODIC con n el
+    periodo, UNKNOWN si no se resuelve y POLE (n = 0) si α no tiene punto crítico libre.
+    """
+    z = critical_point(a)
+    if z is None:
+        return POLE, 0
+    eps_inv = 1 / Q.eps
+    radios = Q.basin_radii and not Q.detect_cycles
+    n = 0
+    z_ref, n_ref, lim = z, 0, 1
+    discos = None
+    while n < Q.iter_max:
+        if abs(z) < Q.eps or abs(z) > eps_inv:
+            break
+        # cuencas inmediatas de los puntos fijos (ver cheby_halley_cuencas): se miran
+        # cada PASO_DISCOS iteraciones y sólo en las órbitas que no se resuelven antes
+        if radios and n and n % cuencas.PASO_DISCOS == 0:
+            if discos is None:
+                discos = [(f, rho) for f, rho in cuencas.discos_parametros(a, Q.eps) if rho > Q.eps]
+            if any(abs(z - f) < rho for f, rho in discos):
+                return UNKNOWN, Q.iter_max   # no se resolvería nunca
+        # Detección de ciclos (Brent) respecto a un punto de control
+        if Q.detect_cycles and n > n_ref:
+            if abs(z - z_ref) < Q.cycle_tol:
+                return PERIODIC, n - n_ref
+            if n - n_ref == lim:
+                z_ref, n_ref, lim = z, n, 2 * lim
+        z = O_alpha(z, a, 1e-12)
+        n += 1
+    if n == Q.iter_max:
+        return UNKNOWN, n
+    return (BASIN0 if abs(z) < Q.eps else ESCAPE), n
+
+# ==========================
+# Píxeles
+# ==========================
+def px_to_complex(i: int, j: int, P: Params) -> complex:
+    re = P.x_min + (i / (P.width - 1))  * (P.x_max - P.x_min)
+    im = P.y_min + (j / (P.height - 1)) * (P.y_max - P.y_min)
+    return complex(re, im)
+
+
+def complex_to_px(z: complex, P: Params):
+    x = int((z.real - P.x_min) / (P.x_max - P.x_min) * (P.width - 1))
+    y = int((z.imag - P.y_min) / (P.y_max - P.y_min) * (P.height - 1))
+    return x, y
+
+
+def px_to_alpha(i: int, j: int, Q) -> complex:
+    # plano de parámetros: fila 0 arriba (y_max), como puntos_parametros
+    re = Q.x_min + (i / Q.width) * (Q.x_max - Q.x_min)
+    im = Q.y_max - (j / Q.height) * (Q.y_max - Q.y_min)
+    return complex(re, im)
+
+
+def image_name(P: Params, ext: str = ".png") -> str:
+    # repr completo de alpha (con signo): valores distintos no comparten nombre y los
+    # de un decimal conservan el nombre de siempre (dinamico_-0.3_+0.0.png)
+    return f"{P.filename_prefix}_{float(P.alpha_re):+}_{float(P.alpha_im):+}{ext}"
+
+# ==========================
+# Render del plano dinámico
+# ==========================
+def phase(stats, name: str):
+    # cronometra una fase en `stats` (cheby_halley_estadisticas) si se piden estadísticas
+    return stats.fase(name) if stats is not None else nullcontext()
+
+
+def uses_arrays(P: Params) -> bool:
+    """True si el render pasa por la clasificación en arrays (motor numpy o numba)."""
+    return motores.usa_arrays(motores.elegir(P.engine)) or P.workers > 1 or P.adaptive or P.antialias > 1
+
+
+def compute_plane(P: Params, progress_cb=None, stop_flag=None, checkpoint: str = None):
+    """Etapa de cálculo: (etiquetas, iteraciones) de cada píxel, o None si se cancela.
+
+    Requiere numpy. Con `checkpoint` (ruta .npz) se guarda el estado de las órbitas
+    sin resolver y, si el fichero ya tiene uno compatible con un iter_max menor, sólo
+    se siguen iterando ésas (ver cheby_halley_reanudar).
+    """
+    P.finalize()
+    import cheby_halley_motor as motor
+    if checkpoint:
+        import cheby_halley_reanudar as reanudar
+        res = reanudar.clasificar("dinamico", P, reanudar.cargar(checkpoint), progress_cb=progress_cb,
+                                  stop_flag=stop_flag)
+        if res is None:
+            return None
+        reanudar.guardar(checkpoint, res[2])
+        return res[:2]
+    cache = None
+    if P.use_cache:
+        import cheby_halley_cache
+        cache = cheby_halley_cache.cache_por_defecto()
+    if P.adaptive:
+        import cheby_halley_adaptativo as adaptativo
+        return adaptativo.clasificar_adaptativo("dinamico", P, progress_cb=progress_cb, stop_flag=stop_flag)
+    if P.workers > 1:
+        import cheby_halley_paralelo as paralelo
+        return paralelo.clasificar_paralelo("dinamico", P, P.workers, progress_cb=progress_cb, stop_flag=stop_flag,
+                                            cache=cache)
+    if cache:
+        return cheby_halley_cache.clasificar_con_cache("dinamico", P, cache, progress_cb=progress_cb,
+                                                       stop_flag=stop_flag)
+    return motor.clasificar_dinamico(P, progress_cb=progress_cb, stop_flag=stop_flag)
+
+
+def supersample(data, P: Params, stop_flag=None):
+    """Añade a (etiquetas, iteraciones) las submuestras de los píxeles de borde si
+    P.antialias > 1 (ver cheby_halley_suavizado); None si se cancela."""
+    if P.antialias <= 1:
+        return data[:2]
+    import cheby_halley_suavizado as suavizado
+    samples = suavizado.submuestrear("dinamico", P, data[0], data[1], P.antialias, stop_flag=stop_flag)
+    return None if samples is None else (data[0], data[1], samples)
+
+
+def colorize(data, P: Params):
+    """Etapa de color: imagen (sin marcas) a partir de (etiquetas, iteraciones[, submuestras]).
+
+    Con submuestras los píxeles de borde toman la media de sus colores.
+    """
+    from PIL import Image
+    import cheby_halley_motor as motor
+    rgb = motor.colorear_dinamico(data[0], data[1], P)
+    if len(data) > 2:
+        import cheby_halley_suavizado as suavizado
+        suavizado.mezclar(rgb, data[2], lambda e, n: motor.colorear_dinamico(e, n, P))
+    return Image.fromarray(rgb, "RGB")
+
+
+def render_arrays(P: Params, progress_cb=None, stop_flag=None, stats=None, checkpoint: str = None):
+    """(imagen sin marcas, clasificación) con los motores de arrays, o None si se cancela.
+
+    La clasificación es (etiquetas, iteraciones) y, con antialias, sus submuestras.
+    Si se pasa `stats` (Estadisticas) se rellena con los tiempos y conteos.
+    """
+    import cheby_halley_motor  # noqa: F401  (que la importación de numpy no cuente como cálculo)
+    with phase(stats, "calculo"):
+        data = compute_plane(P, progress_cb, stop_flag, checkpoint)
+    if data is None:
+        return None
+    if stats is not None:
+        stats.contar(*data)
+    if P.antialias > 1:
+        with phase(stats, "suavizado"):
+            data = supersample(data, P, stop_flag)
+        if data is None:
+            return None
+    with phase(stats, "color"):
+        return colorize(data, P), data
+
+
+def render_plane(P: Params, progress_cb=None, stop_flag=None, marks: bool = True, stats=None,
+                 checkpoint: str = None):
+    """Imagen del plano, o None si se cancela mediante stop_flag.
+
+    Si se pasa `stats` (Estadisticas) se rellena con los tiempos y conteos. Con
+    `checkpoint` la clasificación es reanudable (ver compute_plane).
+    """
+    P.finalize()
+    a = complex(P.alpha_re, P.alpha_im)
+
+    if checkpoint or uses_arrays(P):
+        res = render_arrays(P, progress_cb, stop_flag, stats, checkpoint)
+        if res is None:
+            return None
+        img = res[0]
+    else:
+        from PIL import Image
+        img = Image.new("RGB", (P.width, P.height), color=(0, 0, 0))
+        put = img.putpixel
+        t0 = time.perf_counter()
+        t_color = 0.0
+
+        for i in range(P.width):
+            if stop_flag and stop_flag():
+                return None
+            if stats is None:
+                for j in range(P.height):
+                    z0 = px_to_complex(i, j, P)
+                    put((i, j), classify_color(z0, a, P))
+            else:
+                for j in range(P.height):
+                    result, k = classify_orbit(px_to_complex(i, j, P), a, P)
+                    stats.contar_orbita(result, k)
+                    t = time.perf_counter()
+                    put((i, j), orbit_color(result, k, P))
+                    t_color += time.perf_counter() - t
+            if progress_cb:
+                progress_cb(i+1, P.width)
+        if stats is not None:
+            stats.sumar_tiempo("calculo", time.perf_counter() - t0 - t_color)
+            stats.sumar_tiempo("color", t_color)
+
+    if marks:
+        with phase(stats, "marcas"):
+            draw_marks(img, P)
+    return img
+
+
+def render_region(P: Params, i0: int, i1: int, j0: int, j1: int, stop_flag=None):
+    """Imagen (sin marcas) de los píxeles [i0, i1) x [j0, j1) del plano de P."""
+    P.finalize()
+    if uses_arrays(P):
+        import cheby_halley_motor as motor
+        return colorize(motor.tesela_dinamico(P, i0, i1, j0, j1), P)
+    from PIL import Image
+    a = complex(P.alpha_re, P.alpha_im)
+    img = Image.new("RGB", (i1 - i0, j1 - j0), color=(0, 0, 0))
+    for i in range(i0, i1):
+        if stop_flag and stop_flag():
+            return None
+        for j in range(j0, j1):
+            img.putpixel((i - i0, j - j0), classify_color(px_to_complex(i, j, P), a, P))
+    return img
+
+
+def draw_marks(img, P: Params, y0: int = 0):
+    # y0: fila del plano que corresponde a la primera fila de img (salida por bandas)
+    from PIL import ImageDraw
+    a = complex(P.alpha_re, P.alpha_im)
+    draw = ImageDraw.Draw(img)
+
+    # Marcas
+    if P.draw_marks:
+        # 0 y 1 como círculos
+        for pf, r in [(0+0j, 6), (1+0j, 6)]:
+            cx, cy = complex_to_px(pf, P)
+            cy -= y0
+            draw.ellipse((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
+    if P.draw_s12:
+        s1, s2 = extra_fixed_points(a)
+        for pf, r in [(s1, 5), (s2, 5)]:
+            cx, cy = complex_to_px(pf, P)
+            cy -= y0
+            draw.rectangle((cx-r, cy-r, cx+r, cy+r), outline=(255,255,255), width=2)
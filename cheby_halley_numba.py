@@ -0,0 +1,188 @@
+import numpy as np
+from numba import njit, prange
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motor as motor
+from cheby_halley_motor import CUENCA0, CUENCA1, DESCONOCIDO, ESCAPE, PERIODICO, POLO
+
+# ==========================
+# Motor compilado (Numba)
+# ==========================
+# Los mismos núcleos que el bucle escalar de los scripts (classify_orbit y el bucle
+# de construir_imagen), compilados con Numba y repartidos por órbitas entre los
+# hilos. Cada órbita se itera hasta resolverse sin pasar por arrays intermedios, así
+# que no hay conjunto activo que compactar. Los puntos iniciales, los radios de las
+# cuencas inmediatas y los puntos críticos se calculan con cheby_halley_motor, y la
+# aritmética compleja de Numba es la de CPython (producto, cociente de Smith), así
+# que la clasificación es idéntica a la de los otros motores.
+#
+# La primera llamada compila los núcleos (unos segundos); con cache=True la versión
+# compilada se guarda junto al módulo para las siguientes ejecuciones.
+
+
+@njit(cache=True)
+def _operador(z, c2, tol):
+    """O_alpha con c2 = 2*(alpha - 1), igual que O_alpha/operador: den≈0 => inf."""
+    den = 1.0 - c2*z
+    if abs(den) < tol:
+        return complex(np.inf, 0.0)
+    return z*(z*z) * (z - c2) / den   # z**3 de CPython: z*(z*z)
+
+
+@njit(cache=True)
+def _pasos_cero(m, cotas0, eps):
+    """cheby_halley_cuencas.pasos_cero con cotas0 = cotas_cero(...) en un array."""
+    ac, h, n = cotas0[0], cotas0[1], int(cotas0[2])
+    lo = hi = m
+    j_min = j_max = 0
+    for _ in range(n):
+        if hi < eps:
+            break
+        j_min += lo >= eps
+        j_max += 1
+        hi, lo = (hi**3 * (hi + ac) / (1 - ac*hi) * (1 + h),
+                  lo**3 * max(ac - hi, lo - ac, 0.0) / (1 + ac*hi) * (1 - h))
+    return j_min, j_max
+
+
+@njit(cache=True)
+def _pasos_fijo(d, cotas, eps):
+    """cheby_halley_cuencas.pasos_fijo con cotas = cotas_fijo(...) en una fila de array."""
+    b, q, ell, h = cotas[0], cotas[1], cotas[2], cotas[3]
+    x = min(d*b, 0.999)
+    E = x / ((1 - x) * (1 - q))
+    L = np.log(d / eps)
+    E = E + h * ((L + E) / ell + 1)
+    return int((L - E) // ell) + 1, int((L + E) // ell) + 1
+
+
+@njit(cache=True)
+def _orbita_dinamica(z, c2, iter_max, eps, r0, cotas0, objetivos, r_objetivos, cotas, otros, r_otros, escape,
+                     ciclos, tol_ciclo):
+    z_ref, k_ref, lim = z, 1, 1
+    for k in range(1, iter_max + 1):
+        m = abs(z)
+        if m < eps:
+            return CUENCA0, k
+        # cuencas inmediatas: se corta si ya se sabe en qué iteración quedaría a menos de eps
+        if m < r0:
+            j_min, j_max = _pasos_cero(m, cotas0, eps)
+            if j_min == j_max and k + j_max <= iter_max:
+                return CUENCA0, k + j_max
+        for t in range(objetivos.size):
+            d = abs(z - objetivos[t])
+            if d < eps:
+                return CUENCA1, k
+            if d < r_objetivos[t]:
+                j_min, j_max = _pasos_fijo(d, cotas[t], eps)
+                if j_min == j_max and k + j_max <= iter_max:
+                    return CUENCA1, k + j_max
+        if m > escape:
+            return (POLO if np.isinf(z.real) or np.isinf(z.imag) else ESCAPE), k
+        for t in range(otros.size):
+            if abs(z - otros[t]) < r_otros[t]:
+                return DESCONOCIDO, iter_max
+        if ciclos and k > k_ref:
+            if abs(z - z_ref) < tol_ciclo:
+                return PERIODICO, k - k_ref
+            if k - k_ref == lim:
+                z_ref, k_ref, lim = z, k, 2*lim
+        z = _operador(z, c2, 1e-10)
+    return DESCONOCIDO, iter_max
+
+
+@njit(cache=True, parallel=True)
+def _dinamico(z0, c2, iter_max, eps, r0, cotas0, objetivos, r_objetivos, cotas, otros, r_otros, escape, ciclos,
+              tol_ciclo, etiquetas, iteraciones):
+    for p in prange(z0.size):
+        e, k = _orbita_dinamica(z0[p], c2, iter_max, eps, r0, cotas0, objetivos, r_objetivos, cotas, otros,
+                                r_otros, escape, ciclos, tol_ciclo)
+        etiquetas[p] = e
+        iteraciones[p] = k
+
+
+@njit(cache=True)
+def _orbita_parametros(z, c2, iter_max, eps, eps_inv, discos, r_discos, p, paso, ciclos, tol_ciclo):
+    z_ref, n_ref, lim = z, 0, 1
+    for n in range(iter_max):
+        m = abs(z)
+        if m < eps:
+            return CUENCA0, n
+        if m > eps_inv:
+            return ESCAPE, n
+        # cuencas inmediatas de los puntos fijos, cada `paso` iteraciones (ver cheby_halley_cuencas)
+        if n > 0 and n % paso == 0:
+            for d in range(discos.shape[0]):
+                if abs(z - discos[d, p]) < r_discos[d, p]:
+                    return DESCONOCIDO, iter_max
+        if ciclos and n > n_ref:
+            if abs(z - z_ref) < tol_ciclo:
+                return PERIODICO, n - n_ref
+            if n - n_ref == lim:
+                z_ref, n_ref, lim = z, n, 2*lim
+        z = _operador(z, c2, 1e-12)
+    return DESCONOCIDO, iter_max
+
+
+@njit(cache=True, parallel=True)
+def _parametros(z0, c2, valido, iter_max, eps, discos, r_discos, paso, ciclos, tol_ciclo, etiquetas, iteraciones):
+    eps_inv = 1 / eps
+    for p in prange(z0.size):
+        if not valido[p]:
+            etiquetas[p] = POLO
+            iteraciones[p] = 0
+            continue
+        e, n = _orbita_parametros(z0[p], c2[p], iter_max, eps, eps_inv, discos, r_discos, p, paso,
+                                  ciclos, tol_ciclo)
+        etiquetas[p] = e
+        iteraciones[p] = n
+
+
+def _complejos(re, im):
+    z = np.empty(np.size(re), dtype=np.complex128)
+    z.real = np.ravel(re)
+    z.imag = np.ravel(im)
+    return z
+
+
+def iterar_dinamico(zr, zi, a: complex, P):
+    """Como cheby_halley_motor.iterar_dinamico: (etiquetas, iteraciones) con la forma de la entrada."""
+    forma = np.shape(zr)
+    z0 = _complejos(zr, zi)
+    c2 = 2*(a - 1)
+    r0, objetivos, otros = motor.basin_radii(a, P)
+    etiquetas = np.empty(z0.size, dtype=np.uint8)
+    iteraciones = np.empty(z0.size, dtype=np.int32)
+    _dinamico(z0, c2, P.iter_max, float(P.eps), r0,
+              np.array(cuencas.cotas_cero(c2, r0, P.eps), dtype=np.float64),
+              np.array([t for t, _ in objetivos], dtype=np.complex128),
+              np.array([r for _, r in objetivos], dtype=np.float64),
+              np.array([cuencas.cotas_fijo(t, c2, r, P.eps) for t, r in objetivos], dtype=np.float64).reshape(-1, 4),
+              np.array([f for f, _ in otros], dtype=np.complex128),
+              np.array([r for _, r in otros], dtype=np.float64),
+              float(P.escape), bool(P.detect_cycles), float(P.cycle_tol), etiquetas, iteraciones)
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
+
+
+def iterar_parametros(ar, ai, iter_max: int, eps: float, detect_cycles: bool = False, cycle_tol: float = 1e-6,
+                      radios: bool = True):
+    """Como cheby_halley_motor.iterar_parametros: (etiquetas, iteraciones) con la forma de la entrada."""
+    forma = np.shape(ar)
+    ar = np.array(ar, dtype=float).ravel()
+    ai = np.array(ai, dtype=float).ravel()
+    with np.errstate(all='ignore'):
+        zr, zi, valido = motor.critico_secundario(ar, ai)
+    c2r, c2i = motor._prod(2.0, 0.0, ar - 1.0, ai)
+    discos = np.zeros((0, ar.size), dtype=np.complex128)
+    r_discos = np.zeros((0, ar.size))
+    if radios and not detect_cycles:
+        idx = np.flatnonzero(valido)
+        lista = motor._discos_parametros(ar[idx], ai[idx], eps, idx, ar.size)
+        if lista:
+            discos = np.array([_complejos(fr, fi) for fr, fi, _ in lista])
+            r_discos = np.array([rho for _, _, rho in lista])
+    etiquetas = np.empty(ar.size, dtype=np.uint8)
+    iteraciones = np.empty(ar.size, dtype=np.int32)
+    _parametros(_complejos(zr, zi), _complejos(c2r, c2i), valido, iter_max, eps, discos, r_discos,
+                motor.PASO_DISCOS, bool(detect_cycles), float(cycle_tol), etiquetas, iteraciones)
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
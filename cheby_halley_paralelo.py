@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import numpy as np
+
+import cheby_halley_motor as motor
+from cheby_halley_cache import clave as _clave
+
+# ==========================
+# Render multiproceso por teselas
+# ==========================
+# Cada proceso del pool se engancha una sola vez (en su inicializador) a dos
+# bloques de memoria compartida con las etiquetas y las iteraciones de todo el
+# plano. Las tareas sólo llevan las coordenadas de su tesela y los resultados se
+# escriben directamente en el lienzo compartido, sin serializar píxeles.
+
+_lienzo = None   # estado de cada proceso del pool
+
+
+def _iniciar_proceso(plano, params, nombre_etq, nombre_it, forma):
+    global _lienzo
+    shm_etq = shared_memory.SharedMemory(name=nombre_etq)
+    shm_it = shared_memory.SharedMemory(name=nombre_it)
+    _lienzo = SimpleNamespace(
+        tesela=motor.TESELAS[plano],
+        P=SimpleNamespace(**params),
+        shm=(shm_etq, shm_it),
+        etiquetas=np.ndarray(forma, dtype=np.uint8, buffer=shm_etq.buf),
+        iteraciones=np.ndarray(forma, dtype=np.int32, buffer=shm_it.buf),
+    )
+
+
+def _calcular_tesela(i0, i1, j0, j1):
+    e, n = _lienzo.tesela(_lienzo.P, i0, i1, j0, j1)
+    _lienzo.etiquetas[j0:j1, i0:i1] = e
+    _lienzo.iteraciones[j0:j1, i0:i1] = n
+    return i0, i1, j0, j1
+
+
+def clasificar_paralelo(plano: str, P, workers: int = None, progress_cb=None, stop_flag=None,
+                        lado: int = motor.LADO_TESELA, cache=None):
+    """Clasifica el plano ("dinamico" o "parametros") repartiendo teselas entre procesos.
+
+    Devuelve (etiquetas, iteraciones) como clasificar_dinamico/clasificar_parametros,
+    o None si se cancela mediante stop_flag. progress_cb recibe (teselas hechas, total).
+    Con una `cache` (cheby_halley_cache.CacheTeselas) sólo se calculan las teselas
+    que no estén ya guardadas, y las nuevas se guardan al terminar.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    workers = workers or os.cpu_count() or 1
+    forma = (P.height, P.width)
+    n_pix = P.height * P.width
+    shm_etq = shared_memory.SharedMemory(create=True, size=max(1, n_pix))
+    shm_it = shared_memory.SharedMemory(create=True, size=max(1, 4 * n_pix))
+    etiquetas = np.ndarray(forma, dtype=np.uint8, buffer=shm_etq.buf)
+    iteraciones = np.ndarray(forma, dtype=np.int32, buffer=shm_it.buf)
+    try:
+        lista = motor.teselas(P.width, P.height, lado)
+        total = len(lista)
+        pendientes = []
+        for t in lista:
+            res = cache.get(_clave(plano, P, t)) if cache else None
+            if res is None:
+                pendientes.append(t)
+            else:
+                i0, i1, j0, j1 = t
+                etiquetas[j0:j1, i0:i1], iteraciones[j0:j1, i0:i1] = res
+        hechas = total - len(pendientes)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_iniciar_proceso,
+            initargs=(plano, dict(vars(P)), shm_etq.name, shm_it.name, forma),
+        ) as pool:
+            futuros = {pool.submit(_calcular_tesela, *t) for t in pendientes}
+            try:
+                while futuros:
+                    if stop_flag and stop_flag():
+                        return None
+                    listos, futuros = wait(futuros, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for f in listos:
+                        f.result()
+                        hechas += 1
+                    if listos and progress_cb:
+                        progress_cb(hechas, total)
+            finally:
+                # cancelación o error: descartar las teselas que aún no han empezado
+                pool.shutdown(wait=True, cancel_futures=True)
+        if cache:
+            for i0, i1, j0, j1 in pendientes:
+                cache.put(_clave(plano, P, (i0, i1, j0, j1)),
+                          etiquetas[j0:j1, i0:i1], iteraciones[j0:j1, i0:i1])
+        return etiquetas.copy(), iteraciones.copy()
+    finally:
+        del etiquetas, iteraciones   # las vistas deben soltarse antes de cerrar la memoria
+        shm_etq.close()
+        shm_etq.unlink()
+        shm_it.close()
+        shm_it.unlink()
@@ -1,7 +1,13 @@
-import cmath
+import argparse
 import os
+import time
 import colorsys
-from PIL import Image
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+
+import cheby_halley_cuencas
+import cheby_halley_motores
+import cheby_halley_nucleo as nucleo
 
 # =====================================
 # CONFIGURACIÓN GENERAL DEL PROGRAMA
@@ -21,6 +27,49 @@ EPS_INV = 1 / EPS
 FILENAME = "imagenes/plano_parametros.png"
 GUARDAR = True
 
+# Motor de cálculo (cheby_halley_motores): "python" (bucle escalar), "numpy" (vectorial)
+# o "numba" (compilado; si numba no está instalado se usa "python")
+MOTOR = "python"
+
+# Detección de ciclos atractores de la órbita crítica (se colorean por periodo)
+DETECTAR_CICLOS = False
+TOL_CICLO = 1e-6
+
+# Reutilizar teselas ya calculadas (caché en disco de cheby_halley_cache)
+USAR_CACHE = True
+
+# Cortar las órbitas críticas que entran en la cuenca inmediata de s1, s2 o 1
+# (cheby_halley_cuencas): nunca llegarían a 0 ni escaparían
+RADIOS_CUENCA = True
+
+# Suavizado de bordes: N x N submuestras sólo en los píxeles de borde (1 = desactivado)
+SUBMUESTRAS = 1
+
+# Color de los puntos críticos libres: "combinado" (iteraciones hasta que los dos llegan
+# a una raíz) o "mas"/"menos" (sólo ese punto crítico, más oscuro si va a infinito).
+# El segundo no se itera: su órbita es la inversa de la del primero
+COLOR_CRITICOS = "combinado"
+
+
+@dataclass
+class PlanoParametros:
+    """Región, resolución y criterio de parada del plano de parámetros."""
+    x_min: float = X_MIN
+    x_max: float = X_MAX
+    y_min: float = Y_MIN
+    y_max: float = Y_MAX
+    width: int = WIDTH
+    height: int = HEIGHT
+    iter_max: int = ITER_MAX
+    eps: float = EPS
+    detect_cycles: bool = DETECTAR_CICLOS
+    cycle_tol: float = TOL_CICLO
+    use_cache: bool = USAR_CACHE
+    antialias: int = SUBMUESTRAS
+    basin_radii: bool = RADIOS_CUENCA
+    critical_color: str = COLOR_CRITICOS
+    engine: str = MOTOR
+
 
 # =====================================
 # FUNCIONES AUXILIARES
@@ -34,52 +83,132 @@ def paleta_colores(n):
     ]
 
 
-def critico_secundario(alpha):
-    """Cálculo de un punto crítico no trivial."""
-    num = 3 - 4 * alpha + 2 * alpha**2
-    disc = -6 * alpha + 19 * alpha**2 - 16 * alpha**3 + 4 * alpha**4
-    raiz = cmath.sqrt(disc)
-    den = 3 * (alpha - 1)
-    if abs(den) < 1e-12:
+def clasificar(Q, workers=1, adaptativo=False, punto_control=None):
+    """(etiquetas, iteraciones) de cada píxel del plano de parámetros (requiere numpy).
+
+    Con `punto_control` (ruta .npz) se guarda el estado de las órbitas sin resolver y,
+    si el fichero ya tiene uno compatible con un iter_max menor, sólo se siguen
+    iterando ésas (ver cheby_halley_reanudar).
+    """
+    import cheby_halley_motor as motor_np
+    if punto_control:
+        import cheby_halley_reanudar
+        etiquetas, iteraciones, punto = cheby_halley_reanudar.clasificar(
+            "parametros", Q, cheby_halley_reanudar.cargar(punto_control))
+        cheby_halley_reanudar.guardar(punto_control, punto)
+        return etiquetas, iteraciones
+    cache = None
+    if Q.use_cache:
+        import cheby_halley_cache
+        cache = cheby_halley_cache.cache_por_defecto()
+    if adaptativo:
+        import cheby_halley_adaptativo
+        return cheby_halley_adaptativo.clasificar_adaptativo("parametros", Q)
+    if workers > 1:
+        import cheby_halley_paralelo as paralelo
+        return paralelo.clasificar_paralelo("parametros", Q, workers, cache=cache)
+    if cache:
+        return cheby_halley_cache.clasificar_con_cache("parametros", Q, cache)
+    return motor_np.clasificar_parametros(Q)
+
+
+def submuestrear(etiquetas, iteraciones, Q, stats=None):
+    """Submuestras de los píxeles de borde (cheby_halley_suavizado), o None sin antialias."""
+    if Q.antialias <= 1:
         return None
-    return (num + raiz) / den
+    import cheby_halley_suavizado
+    with _fase(stats, "suavizado"):
+        return cheby_halley_suavizado.submuestrear("parametros", Q, etiquetas, iteraciones, Q.antialias)
 
 
-def operador(z, alpha):
-    """Operador normalizado de la familia Chebyshev-Halley."""
-    numer = z**3 * (z - 2 * (alpha - 1))
-    denom = 1 - 2 * (alpha - 1) * z
-    if abs(denom) < 1e-12:
-        return float("inf")  # Divergencia
-    return numer / denom
+def colorear(etiquetas, iteraciones, Q, muestras=None):
+    """Imagen a partir de la clasificación, sin volver a iterar.
 
+    Con `muestras` (ver submuestrear) los píxeles de borde toman la media de sus submuestras.
+    """
+    from PIL import Image
+    import cheby_halley_motor as motor_np
+    colores = paleta_colores(Q.iter_max)
+    rgb = motor_np.colorear_parametros(etiquetas, iteraciones, colores, Q.critical_color)
+    if muestras is not None:
+        import cheby_halley_suavizado
+        cheby_halley_suavizado.mezclar(rgb, muestras,
+                                       lambda e, n: motor_np.colorear_parametros(e, n, colores, Q.critical_color))
+    return Image.fromarray(rgb, "RGB")
 
-def construir_imagen():
-    """Genera la imagen del espacio de parámetros."""
-    colores = paleta_colores(ITER_MAX)
-    imagen = Image.new("RGB", (WIDTH, HEIGHT))
-    pix = imagen.load()
 
-    for i in range(WIDTH):
-        for j in range(HEIGHT):
-            re = X_MIN + (i / WIDTH) * (X_MAX - X_MIN)
-            im = Y_MAX - (j / HEIGHT) * (Y_MAX - Y_MIN)
-            alpha = complex(re, im)
+def escribir_por_bandas(Q, ruta=FILENAME, workers=1, alto=None, guardar_datos=False, stats=None):
+    """Escribe el plano directamente al PNG por bandas, con memoria acotada por la banda."""
+    import dataclasses
+    import cheby_halley_bandas
+    import cheby_halley_motor as motor_np
+    colores = paleta_colores(Q.iter_max)
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    datos = None
+    if guardar_datos:
+        import cheby_halley_datos
+        datos = cheby_halley_datos.crear(os.path.splitext(ruta)[0], "parametros", (Q.height, Q.width),
+                                         dataclasses.asdict(Q))
+    def colorear_banda(etiquetas, iteraciones, j0):
+        with _fase(stats, "color"):
+            return motor_np.colorear_parametros(etiquetas, iteraciones, colores, Q.critical_color)
+
+    cheby_halley_bandas.escribir_por_bandas("parametros", Q, ruta, colorear_banda, alto=alto, workers=workers,
+                                            datos=datos, stats=stats)
 
-            z0 = critico_secundario(alpha)
-            if z0 is None:
-                pix[i, j] = (0, 0, 0)
-                continue
 
-            n = 0
-            while n < ITER_MAX:
-                if abs(z0) < EPS or abs(z0) > EPS_INV:
-                    break
-                z0 = operador(z0, alpha)
-                n += 1
+def _fase(stats, nombre):
+    return stats.fase(nombre) if stats is not None else nullcontext()
 
-            pix[i, j] = (0, 0, 0) if n == ITER_MAX else colores[n % len(colores)]
 
+def construir_imagen(Q=None, motor=None, workers=1, adaptativo=False, stats=None, punto_control=None):
+    """Genera la imagen del espacio de parámetros.
+
+    `motor` es un motor de cheby_halley_motores (por defecto Q.engine).
+    Con workers > 1 las teselas se reparten entre procesos (numpy, o numba si se elige,
+    en cada uno); con adaptativo=True se usa la subdivisión adaptativa de
+    cheby_halley_adaptativo. Con Q.antialias > 1 se suavizan los bordes (también con arrays).
+    Si se pasa `stats` (cheby_halley_estadisticas.Estadisticas) se rellena con los
+    tiempos y los resultados de las órbitas críticas. Con `punto_control` la
+    clasificación es reanudable (ver clasificar).
+    """
+    Q = Q or PlanoParametros()
+    motor = cheby_halley_motores.elegir(motor or Q.engine)
+    Q = replace(Q, engine=motor)   # las teselas iteran con el motor de Q
+    colores = paleta_colores(Q.iter_max)
+
+    if punto_control or cheby_halley_motores.usa_arrays(motor) or workers > 1 or adaptativo or Q.antialias > 1:
+        import cheby_halley_motor  # noqa: F401  (que la importación de numpy no cuente como cálculo)
+        with _fase(stats, "calculo"):
+            etiquetas, iteraciones = clasificar(Q, workers, adaptativo, punto_control)
+        if stats is not None:
+            stats.contar(etiquetas, iteraciones)
+        muestras = submuestrear(etiquetas, iteraciones, Q, stats)
+        with _fase(stats, "color"):
+            return colorear(etiquetas, iteraciones, Q, muestras)
+
+    from PIL import Image
+    t0 = time.perf_counter()
+    imagen = Image.new("RGB", (Q.width, Q.height))
+    pix = imagen.load()
+
+    # la órbita crítica de cada α con la iteración escalar de cheby_halley_nucleo
+    for i in range(Q.width):
+        for j in range(Q.height):
+            resultado, n = nucleo.classify_parameter(nucleo.px_to_alpha(i, j, Q), Q)
+            if resultado == nucleo.PERIODIC:
+                pix[i, j] = nucleo.period_color(n)
+            elif resultado == nucleo.UNKNOWN or resultado == nucleo.POLE:
+                pix[i, j] = (0, 0, 0)
+            elif Q.critical_color != "combinado" and (resultado == nucleo.BASIN0) == (Q.critical_color == "menos"):
+                pix[i, j] = tuple(c // 2 for c in colores[n % len(colores)])   # ese punto crítico va a infinito
+            else:
+                pix[i, j] = colores[n % len(colores)]
+            if stats is not None:
+                stats.contar_orbita(resultado, n)
+
+    if stats is not None:
+        stats.sumar_tiempo("calculo", time.perf_counter() - t0)   # incluye el color
     return imagen
 
 
@@ -88,10 +217,141 @@ def construir_imagen():
 # =====================================
 
 if __name__ == "__main__":
-    img = construir_imagen()
-    img.show()
+    parser = argparse.ArgumentParser(description="Plano de parámetros de la familia Chebyshev-Halley")
+    parser.add_argument('--engine', choices=cheby_halley_motores.nombres(), default=MOTOR,
+                        help='"python" (bucle escalar), "numpy" (vectorial), "numba" (compilado; sin numba, '
+                             'python) o "float32" (vectorial en precisión simple, aproximado)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para render por teselas (>1 usa en cada proceso numpy, o numba si se elige)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Subdivisión adaptativa: sólo itera bordes de rectángulos y rellena los uniformes '
+                             '(aproximada: puede perder islas que no toquen ningún borde; ver --check-adaptive)')
+    parser.add_argument('--check-adaptive', action='store_true',
+                        help='Compara la subdivisión adaptativa con la fuerza bruta y muestra el informe')
+    parser.add_argument('--detect-cycles', action='store_true', default=DETECTAR_CICLOS,
+                        help='Detecta ciclos atractores de la órbita crítica y los colorea por periodo')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='No usar la caché de teselas (directorio en $CHEBY_HALLEY_CACHE)')
+    parser.add_argument('--no-basin-radii', action='store_true',
+                        help='No cortar las órbitas que entran en la cuenca inmediata de s1, s2 o 1')
+    parser.add_argument('--check-basins', action='store_true',
+                        help='Compara la clasificación con y sin cuencas inmediatas y muestra el informe')
+    parser.add_argument('--check-precision', action='store_true',
+                        help='Compara el motor float32 con la doble precisión y muestra el informe')
+    parser.add_argument('--critical-color', choices=['combinado', 'mas', 'menos'],
+                        help='Color de los puntos críticos libres: los dos a la vez o sólo uno '
+                             f'(por defecto {COLOR_CRITICOS}; con --recolor, el de los datos)')
+    parser.add_argument('--check-critical', action='store_true',
+                        help='Itera también el otro punto crítico libre y lo compara con el deducido')
+    parser.add_argument('--checkpoint', metavar='FICHERO.npz',
+                        help='Guarda el estado de las órbitas sin resolver; si el fichero ya existe y sólo cambia '
+                             'iter_max (mayor), continúa desde él en vez de empezar de cero (usa numpy)')
+    parser.add_argument('--save-data', action='store_true',
+                        help='Guarda también etiquetas e iteraciones (.npy + .json) junto a la imagen')
+    parser.add_argument('--recolor', metavar='DATOS.json',
+                        help='Genera la imagen a partir de una clasificación guardada, sin iterar')
+    parser.add_argument('--width', type=int, default=WIDTH)
+    parser.add_argument('--height', type=int, default=HEIGHT)
+    parser.add_argument('--iter-max', type=int, default=ITER_MAX)
+    parser.add_argument('--stream', action='store_true',
+                        help='Escribe la imagen por bandas horizontales con memoria acotada (imágenes enormes)')
+    parser.add_argument('--band-rows', type=int, help='Filas por banda con --stream')
+    parser.add_argument('--antialias', type=int, default=SUBMUESTRAS, metavar='N',
+                        help='Suaviza los bordes con N x N submuestras sólo en los píxeles de borde (usa numpy)')
+    parser.add_argument('--stats', nargs='?', const='-', metavar='FICHERO',
+                        help='Añade una línea JSON con tiempos por fase, resultados e histograma (por defecto a stdout)')
+    ns = parser.parse_args()
+    plano = PlanoParametros(width=ns.width, height=ns.height, iter_max=ns.iter_max,
+                            detect_cycles=ns.detect_cycles, use_cache=USAR_CACHE and not ns.no_cache, antialias=ns.antialias,
+                            basin_radii=RADIOS_CUENCA and not ns.no_basin_radii,
+                            critical_color=ns.critical_color or COLOR_CRITICOS,
+                            engine=cheby_halley_motores.elegir(ns.engine))
+    if ns.stream and plano.antialias > 1:
+        parser.error("--antialias no está disponible con --stream")
+    if ns.stream and ns.checkpoint:
+        parser.error("--checkpoint no está disponible con --stream")
+
+    if ns.check_adaptive:
+        import cheby_halley_adaptativo
+        rep = cheby_halley_adaptativo.comprobar_adaptativo("parametros", plano)
+        print(f"Órbitas calculadas: {rep['evaluados']} de {rep['pixeles']} (x{rep['ahorro']:.1f} menos)")
+        print(f"Píxeles distintos de la fuerza bruta: {rep['distintos']} ({100*rep['fraccion_distintos']:.4f}%)")
+        raise SystemExit
 
-    if GUARDAR:
-        os.makedirs(os.path.dirname(FILENAME), exist_ok=True)
-        img.save(FILENAME)
+    if ns.check_critical:
+        import cheby_halley_motor
+        rep = cheby_halley_motor.comprobar_criticos(plano)
+        print(f"Píxeles en los que el otro punto crítico iterado difiere del deducido: "
+              f"{rep['distintos']} ({100*rep['fraccion_distintos']:.4f}%)")
+        raise SystemExit
+
+    if ns.check_basins:
+        rep = cheby_halley_cuencas.comprobar_radios("parametros", plano)
+        print(f"Tiempo sin cuencas inmediatas: {rep['segundos_sin']:.2f} s, con ellas: {rep['segundos_con']:.2f} s "
+              f"(x{rep['aceleracion']:.2f})")
+        print(f"Órbitas cortadas antes: {rep['cortadas']} de {rep['pixeles']}")
+        print(f"Píxeles distintos: {rep['distintos']}")
+        raise SystemExit
+
+    if ns.check_precision:
+        import cheby_halley_simple
+        rep = cheby_halley_simple.comprobar_precision("parametros", plano)
+        print(f"Tiempo en doble precisión: {rep['segundos_doble']:.2f} s, en simple: {rep['segundos_simple']:.2f} s "
+              f"(x{rep['aceleracion']:.2f})")
+        print(f"Memoria del resultado: {rep['bytes_compacto']} bytes compacto, {rep['bytes_doble']} bytes con RGB")
+        print(f"Píxeles con distinta etiqueta: {rep['distinta_etiqueta']}")
+        print(f"Píxeles de distinto color: {rep['distintos']} ({100*rep['fraccion_distintos']:.4f}%)")
+        raise SystemExit
+
+    stats = None
+    if ns.stats:
+        from cheby_halley_estadisticas import Estadisticas
+        stats = Estadisticas(plano.iter_max)
+
+    if ns.stream:
+        escribir_por_bandas(plano, FILENAME, ns.workers, ns.band_rows, ns.save_data, stats)
         print(f"Imagen exportada en: {FILENAME}")
+
+    elif ns.recolor:
+        import cheby_halley_datos
+        tipo, params, etiquetas, iteraciones = cheby_halley_datos.cargar(ns.recolor)
+        if tipo != "parametros":
+            parser.error(f"{ns.recolor} no contiene un plano de parámetros")
+        plano = PlanoParametros(**params)
+        if ns.critical_color:
+            plano.critical_color = ns.critical_color
+        img = colorear(etiquetas, iteraciones, plano, cheby_halley_datos.cargar_suavizado(ns.recolor))
+    elif ns.save_data:
+        import dataclasses
+        import cheby_halley_datos
+        with _fase(stats, "calculo"):
+            etiquetas, iteraciones = clasificar(plano, ns.workers, ns.adaptive, ns.checkpoint)
+        if stats is not None:
+            stats.contar(etiquetas, iteraciones)
+        muestras = submuestrear(etiquetas, iteraciones, plano, stats)
+        with _fase(stats, "color"):
+            img = colorear(etiquetas, iteraciones, plano, muestras)
+        ruta = cheby_halley_datos.guardar(os.path.splitext(FILENAME)[0], "parametros", etiquetas, iteraciones,
+                                          dataclasses.asdict(plano), muestras)
+        print(f"Datos de la clasificación en: {ruta}")
+    else:
+        img = construir_imagen(plano, workers=ns.workers, adaptativo=ns.adaptive, stats=stats,
+                               punto_control=ns.checkpoint)
+
+    if not ns.stream:
+        img.show()
+        if GUARDAR:
+            os.makedirs(os.path.dirname(FILENAME), exist_ok=True)
+            with _fase(stats, "codificacion"):
+                img.save(FILENAME)
+            print(f"Imagen exportada en: {FILENAME}")
+    if ns.checkpoint:
+        print(f"Estado de la iteración en: {ns.checkpoint}")
+
+    if stats is not None:
+        linea = stats.json(width=plano.width, height=plano.height, engine=plano.engine, workers=ns.workers)
+        if ns.stats == '-':
+            print(linea)
+        else:
+            with open(ns.stats, 'a', encoding='utf-8') as f:
+                f.write(linea + '\n')
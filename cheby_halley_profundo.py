@@ -0,0 +1,564 @@
+import argparse
+import decimal
+import math
+import os
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+
+import numpy as np
+from PIL import Image
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motor as motor
+import cheby_halley_parametros as parametros
+from cheby_halley_nucleo import Params
+from cheby_halley_motor import CUENCA0, CUENCA1, DESCONOCIDO, ESCAPE, POLO
+
+# ==========================
+# Zoom profundo por perturbaciones
+# ==========================
+# Con vistas de menos de ~1e-13 de ancho los píxeles ya no se distinguen en doble
+# precisión. Aquí sólo se itera en alta precisión (decimal) la órbita de un punto de
+# referencia, y cada píxel itera en doble precisión su diferencia δ con ella. Con
+# c = 2(alpha - 1), D = 1 - cZ y γ la diferencia entre la c del píxel y la de la
+# referencia (0 en el plano dinámico), la diferencia pasa a
+#
+#   δ' = [δ E - γ (Z + δ) (K + δ (2Z + δ))] / (D - c δ - γ (Z + δ))
+#   E  = G + δ (6Z² - 3cZ + δ (4Z - c + δ))
+#
+# donde G = D O'(Z) y K = Z² (1 - Z²) / D se calculan en la referencia con toda la
+# precisión. La fórmula es exacta (no se linealiza) y no resta cantidades casi iguales,
+# ni siquiera cerca de los puntos críticos o del polo.
+#
+# Cuando |δ| supera TAU |Z| el píxel se ha separado de la referencia lo bastante para
+# seguir con su propia órbita z = Z + δ en doble precisión (se rebasa al origen: el
+# redondeo de z ya es despreciable frente a δ). Si la referencia se resuelve (llega a
+# 0 o escapa) antes que un píxel que aún la sigue, al píxel le falta referencia (un
+# «glitch»): esos píxeles se repiten con una referencia nueva elegida entre ellos,
+# hasta MAX_REFERENCIAS.
+#
+# En el plano de parámetros el punto de partida es el punto crítico libre del alpha
+# del píxel; su diferencia con el de la referencia sale del desarrollo de Taylor del
+# punto crítico, con derivadas calculadas en alta precisión.
+#
+# La clasificación y los colores son los de cheby_halley_motor, con los radios de las
+# cuencas inmediatas y sin detección de ciclos.
+
+TAU = 1e-6              # |δ| > TAU |Z|: el píxel sigue con su propia órbita
+MAX_REFERENCIAS = 16    # referencias por imagen (la primera es el centro de la vista)
+DIGITOS_MIN = 80        # precisión mínima de la referencia, en cifras decimales
+DIGITOS_EXTRA = 40      # cifras por encima de las del ancho de la vista
+A_SERIE = 1e-5          # |alpha - alpha_ref| hasta el que se usa el desarrollo de Taylor
+MUESTRAS = 100          # píxeles que se comparan con la iteración en alta precisión
+
+NINGUNA = 255   # parada: la órbita sigue sin resolver
+TOLERANCIA_POLO = {"dinamico": 1e-10, "parametros": 1e-12}   # las de los operadores
+DESFASE = {"dinamico": 1, "parametros": 0}   # iteraciones que cuenta cada plano al parar en la n-ésima
+
+
+class Alta:
+    """Complejo con partes Decimal; opera con la precisión del contexto decimal activo."""
+    __slots__ = ("re", "im")
+
+    def __init__(self, re, im=0):
+        self.re = Decimal(re)
+        self.im = Decimal(im)
+
+    def __add__(self, o):
+        o = _alta(o)
+        return Alta(self.re + o.re, self.im + o.im)
+
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        o = _alta(o)
+        return Alta(self.re - o.re, self.im - o.im)
+
+    def __rsub__(self, o):
+        return _alta(o) - self
+
+    def __neg__(self):
+        return Alta(-self.re, -self.im)
+
+    def __mul__(self, o):
+        o = _alta(o)
+        return Alta(self.re*o.re - self.im*o.im, self.re*o.im + self.im*o.re)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        o = _alta(o)
+        n = o.re*o.re + o.im*o.im
+        return Alta((self.re*o.re + self.im*o.im) / n, (self.im*o.re - self.re*o.im) / n)
+
+    def __rtruediv__(self, o):
+        return _alta(o) / self
+
+    def __abs__(self):
+        return (self.re*self.re + self.im*self.im).sqrt()
+
+    def __complex__(self):
+        return complex(float(self.re), float(self.im))
+
+    def sqrt(self):
+        """Raíz principal, con la misma rama que cmath.sqrt."""
+        r = abs(self)
+        if r == 0:
+            return Alta(0)
+        if self.re >= 0:
+            t = ((r + self.re) / 2).sqrt()
+            return Alta(t, self.im / (2*t))
+        t = ((r - self.re) / 2).sqrt()
+        return Alta(abs(self.im) / (2*t), t.copy_sign(self.im))
+
+
+def _alta(x) -> Alta:
+    if isinstance(x, Alta):
+        return x
+    if isinstance(x, complex):
+        return Alta(x.real, x.imag)
+    return Alta(x)
+
+
+def critico_alta(a: Alta) -> Alta:
+    """critical_point de cheby_halley_nucleo en alta precisión."""
+    a2 = a*a
+    num = 3 - 4*a + 2*a2
+    disc = -6*a + 19*a2 - 16*a2*a + 4*a2*a2
+    return (num + disc.sqrt()) / (3*(a - 1))
+
+
+def digitos(ancho: float) -> int:
+    """Precisión de la referencia para una vista de ese ancho."""
+    return max(DIGITOS_MIN, int(-math.log10(ancho)) + DIGITOS_EXTRA)
+
+
+# ==========================
+# Órbita de referencia
+# ==========================
+@dataclass
+class Referencia:
+    z: np.ndarray     # Z_n redondeados
+    d: np.ndarray     # D_n = 1 - c Z_n
+    g: np.ndarray     # G_n = D_n O'(Z_n)
+    k: np.ndarray     # K_n = Z_n² (1 - Z_n²) / D_n
+    c: complex
+    fin: int          # iteración en la que se resuelve (o iter_max si no)
+
+
+def referencia(z0: Alta, c: Alta, iter_max: int, eps: float, escape: float, tol: float) -> Referencia:
+    """Itera en alta precisión (contexto decimal activo) hasta |Z| < eps, |Z| > escape o iter_max."""
+    zs, ds, gs, ks = [], [], [], []
+    z = z0
+    fin = iter_max
+    for n in range(iter_max):
+        zs.append(complex(z))
+        m = abs(zs[-1])
+        if m < eps or m > escape:
+            fin = n
+            break
+        d = 1 - c*z
+        z2 = z*z
+        ds.append(complex(d))
+        if abs(ds[-1]) < tol:   # polo: la órbita va a infinito
+            gs.append(0j)
+            ks.append(0j)
+            zs.append(complex(math.inf, 0.0))
+            fin = n + 1
+            break
+        gs.append(complex(-z2*(3*c*z2 - (4 + 2*c*c)*z + 3*c) / d))
+        ks.append(complex(z2*(1 - z2) / d))
+        z = z*z2*(z - c) / d
+    else:
+        zs.append(complex(z))
+    return Referencia(np.array(zs), np.array(ds), np.array(gs), np.array(ks), complex(c), fin)
+
+
+# ==========================
+# Criterios de parada (los de cheby_halley_motor)
+# ==========================
+def parada_dinamico(a: complex, P):
+    c2 = 2*(a - 1)
+    r0, objetivos, otros = motor.basin_radii(a, P)
+    cotas0 = cuencas.cotas_cero(c2, r0, P.eps)
+    cotas = [cuencas.cotas_fijo(t, c2, r, P.eps) for t, r in objetivos]
+
+    def parada(z, pos, k):
+        m = np.abs(z)
+        e = np.full(z.size, NINGUNA, dtype=np.uint8)
+        n = np.full(z.size, k, dtype=np.int32)
+        # de menor a mayor prioridad: cada asignación pisa a las anteriores
+        for f, r in otros:
+            e[np.abs(z - f) < r] = DESCONOCIDO
+        esc = m > P.escape
+        e[esc] = np.where(np.isinf(z.real[esc]), POLO, ESCAPE)
+        for (t, r), cota in zip(objetivos, cotas):
+            d = np.abs(z - t)
+            e[(d < P.eps) | motor._cortar(d, r, cota, cuencas.pasos_fijo, P.eps, k, P.iter_max, n)] = CUENCA1
+        e[(m < P.eps) | motor._cortar(m, r0, cotas0, cuencas.pasos_cero, P.eps, k, P.iter_max, n)] = CUENCA0
+        return e, n
+    return parada
+
+
+def parada_parametros(alphas, Q):
+    """Parada de las órbitas críticas de los alphas (complex128) de cada píxel."""
+    total = alphas.size
+    discos = []
+    if Q.basin_radii:
+        discos = [(fr + 1j*fi, r) for fr, fi, r in
+                  motor._discos_parametros(alphas.real, alphas.imag, Q.eps, np.arange(total), total)]
+
+    def parada(z, pos, k):
+        m = np.abs(z)
+        e = np.full(z.size, NINGUNA, dtype=np.uint8)
+        for f, r in discos:
+            e[np.abs(z - f[pos]) < r[pos]] = DESCONOCIDO
+        e[m > 1 / Q.eps] = ESCAPE
+        e[m < Q.eps] = CUENCA0
+        return e, np.full(z.size, k, dtype=np.int32)
+    return parada
+
+
+# ==========================
+# Iteración de los píxeles
+# ==========================
+def _operador(z, c, tol):
+    den = 1 - c*z
+    with np.errstate(all='ignore'):
+        z = z*(z*z) * (z - c) / den
+    return np.where(np.abs(den) < tol, complex(math.inf, 0.0), z)
+
+
+def _pasada(ref: Referencia, delta, gamma, parada, iter_max: int, desfase: int, tol: float,
+            ultima: bool, contador: dict):
+    """Clasifica los píxeles de diferencias iniciales `delta` respecto a la referencia.
+
+    `gamma` es la diferencia de c de cada píxel (None en el plano dinámico). Devuelve
+    (etiquetas, iteraciones, sin_referencia); los píxeles sin referencia quedan por
+    resolver, salvo en la última pasada, en la que siguen con su propia órbita.
+    """
+    total = delta.size
+    etiquetas = np.full(total, DESCONOCIDO, dtype=np.uint8)
+    iteraciones = np.full(total, iter_max, dtype=np.int32)
+    sin_ref = np.zeros(total, dtype=bool)
+    pos = np.arange(total)
+    delta = np.array(delta, dtype=np.complex128)
+    c_pix = ref.c if gamma is None else ref.c + gamma
+    z = ref.z[0] + delta
+    propia = np.zeros(total, dtype=bool)   # sigue su propia órbita en doble precisión
+
+    for n in range(iter_max):
+        if pos.size == 0:
+            break
+        e, k = parada(z, pos, n + desfase)
+        hecho = e != NINGUNA
+        if n < ref.fin:
+            separa = ~propia & ~hecho & (np.abs(delta) > TAU * abs(ref.z[n]))
+        else:
+            # la referencia ya está resuelta: los píxeles que la seguían no tienen con qué seguir
+            quedan = ~propia & ~hecho
+            separa = quedan if ultima else np.zeros(pos.size, dtype=bool)
+            if not ultima:
+                sin_ref[pos[quedan]] = True
+                hecho |= quedan
+        propia |= separa
+        contador["propia"] = contador.get("propia", 0) + int(separa.sum())
+        if hecho.any():
+            etiquetas[pos[hecho]] = e[hecho]
+            iteraciones[pos[hecho]] = np.where(e[hecho] == DESCONOCIDO, iter_max, k[hecho])
+            sigue = ~hecho
+            pos, z, delta, propia = pos[sigue], z[sigue], delta[sigue], propia[sigue]
+            if gamma is not None:
+                gamma, c_pix = gamma[sigue], c_pix[sigue]
+
+        pert = ~propia
+        if pert.any():
+            Z, D, G, K, c = ref.z[n], ref.d[n], ref.g[n], ref.k[n], ref.c
+            dl = delta[pert]
+            E = G + dl*(6*Z*Z - 3*c*Z + dl*(4*Z - c + dl))
+            num = dl*E
+            den = D - c*dl
+            if gamma is not None:
+                gm = gamma[pert]
+                zl = Z + dl
+                num = num - gm*zl*(K + dl*(2*Z + dl))
+                den = den - gm*zl
+            with np.errstate(all='ignore'):
+                dl = num / den
+            polo = np.abs(den) < tol
+            delta[pert] = dl
+            z[pert] = ref.z[n + 1] + dl
+            if polo.any():
+                enpolo = np.flatnonzero(pert)[polo]
+                z[enpolo] = complex(math.inf, 0.0)
+                propia[enpolo] = True
+        if propia.any():
+            cp = c_pix if gamma is None else c_pix[propia]
+            z[propia] = _operador(z[propia], cp, tol)
+    return etiquetas, iteraciones, sin_ref
+
+
+# ==========================
+# Vista profunda
+# ==========================
+def desplazamientos(plano: str, width: int, height: int, ancho: float):
+    """Posición de cada píxel respecto al centro de la vista, complex128 (height, width).
+
+    Con las mismas transformaciones de píxel que puntos_dinamico/puntos_parametros.
+    """
+    i = np.arange(width, dtype=float)
+    j = np.arange(height, dtype=float)
+    if plano == "dinamico":
+        d = ancho / (width - 1)
+        return ((i - (width - 1) / 2) * d)[None, :] + 1j * ((j - (height - 1) / 2) * d)[:, None]
+    d = ancho / width
+    return ((i - width / 2) * d)[None, :] + 1j * ((height / 2 - j) * d)[:, None]
+
+
+def region(plano: str, P, centro_re: str, centro_im: str, ancho: float):
+    """(x_min, x_max, y_min, y_max) en doble precisión de la vista (para comparar con el motor)."""
+    cx, cy = float(centro_re), float(centro_im)
+    if plano == "dinamico":
+        alto = ancho / (P.width - 1) * (P.height - 1)
+    else:
+        alto = ancho / P.width * P.height
+    return cx - ancho / 2, cx + ancho / 2, cy - alto / 2, cy + alto / 2
+
+
+def clasificar_profundo(plano: str, P, centro_re: str, centro_im: str, ancho: float, contador: dict = None,
+                        progress_cb=None):
+    """(etiquetas, iteraciones) de la vista de ancho `ancho` centrada en el centro dado.
+
+    El centro se da como texto decimal con tantas cifras como haga falta; P aporta el
+    tamaño en píxeles, iter_max, eps, alpha (plano dinámico), etc.; su región no se usa.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    contador = {} if contador is None else contador
+    tol = TOLERANCIA_POLO[plano]
+    offs = desplazamientos(plano, P.width, P.height, ancho).ravel()
+    etiquetas = np.empty(offs.size, dtype=np.uint8)
+    iteraciones = np.empty(offs.size, dtype=np.int32)
+    centro = Alta(Decimal(centro_re), Decimal(centro_im))
+
+    if plano == "dinamico":
+        a = complex(P.alpha_re, P.alpha_im)
+        parada = parada_dinamico(a, P)
+        escape = P.escape
+    else:
+        alphas = complex(centro) + offs
+        parada = parada_parametros(alphas, P)
+        escape = 1 / P.eps
+        with np.errstate(all='ignore'):
+            zr, zi, valido = motor.critico_secundario(alphas.real, alphas.imag)
+        etiquetas[~valido] = POLO
+        iteraciones[~valido] = 0
+
+    pendientes = np.arange(offs.size) if plano == "dinamico" else np.flatnonzero(valido)
+    desplazamiento = 0j   # de la referencia respecto al centro
+    with decimal.localcontext() as ctx:
+        ctx.prec = digitos(ancho)
+        for r in range(MAX_REFERENCIAS):
+            if pendientes.size == 0:
+                break
+            origen = centro + desplazamiento
+            rel = offs[pendientes] - desplazamiento
+            gamma = None
+            if plano == "dinamico":
+                c = 2*(_alta(a) - 1)
+                z0, delta = origen, rel
+            else:
+                c = 2*(origen - 1)
+                z0 = critico_alta(origen)
+                delta, otra_rama = _delta_critico(origen, rel, zr[pendientes] + 1j*zi[pendientes])
+                gamma = 2*rel
+            ref = referencia(z0, c, P.iter_max, P.eps, escape, tol)
+            e, n, sin_ref = _pasada(ref, delta, gamma, _parada_en(parada, pendientes), P.iter_max,
+                                    DESFASE[plano], tol, r == MAX_REFERENCIAS - 1, contador)
+            if plano == "parametros":
+                # al otro lado del corte se ha seguido la órbita del punto crítico inverso
+                e[otra_rama] = motor.critico_inverso(e[otra_rama], n[otra_rama])[0]
+            etiquetas[pendientes[~sin_ref]] = e[~sin_ref]
+            iteraciones[pendientes[~sin_ref]] = n[~sin_ref]
+            contador["referencias"] = r + 1
+            contador["sin_referencia"] = contador.get("sin_referencia", 0) + int(sin_ref.sum())
+            pendientes = pendientes[sin_ref]
+            if pendientes.size:
+                desplazamiento = offs[pendientes[pendientes.size // 2]]
+            if progress_cb:
+                progress_cb(offs.size - pendientes.size, offs.size)
+    return etiquetas.reshape(P.height, P.width), iteraciones.reshape(P.height, P.width)
+
+
+def _parada_en(parada, pendientes):
+    """La parada de los píxeles `pendientes` (pos indexa ese subconjunto)."""
+    return lambda z, pos, k: parada(z, pendientes[pos], k)
+
+
+def _mul(p, q):
+    """Producto de dos series de Taylor truncadas al orden de p."""
+    r = []
+    for k in range(len(p)):
+        s = p[0]*q[k]
+        for i in range(1, k + 1):
+            s = s + p[i]*q[k - i]
+        r.append(s)
+    return r
+
+
+def serie_critico(a: Alta):
+    """Coeficientes de Taylor hasta orden 3 en a del punto crítico y del discriminante.
+
+    El punto crítico sigue la rama de la raíz principal en a (su prolongación analítica).
+    """
+    t = [a, Alta(1), Alta(0), Alta(0)]
+    t2 = _mul(t, t)
+    t3 = _mul(t2, t)
+    t4 = _mul(t2, t2)
+    num = [2*t2[k] - 4*t[k] for k in range(4)]
+    num[0] = num[0] + 3
+    disc = [-6*t[k] + 19*t2[k] - 16*t3[k] + 4*t4[k] for k in range(4)]
+    # sqrt(disc) = sqrt(disc_0) sqrt(1 + q), sqrt(1 + q) = 1 + q/2 - q²/8 + q³/16 + ...
+    q = [Alta(0)] + [disc[k] / disc[0] for k in range(1, 4)]
+    q2 = _mul(q, q)
+    q3 = _mul(q2, q)
+    s0 = disc[0].sqrt()
+    raiz = [s0] + [s0*(q[k]/2 - q2[k]/8 + q3[k]/16) for k in range(1, 4)]
+    d0 = 3*(a - 1)
+    r = 3 / d0
+    inv = [1/d0, -r/d0, r*r/d0, -r*r*r/d0]   # 1 / (d0 + 3t)
+    return _mul([num[k] + raiz[k] for k in range(4)], inv), disc
+
+
+def _delta_critico(origen: Alta, rel, directo):
+    """Diferencia entre el punto crítico de cada alpha = origen + rel y el de origen.
+
+    Para |rel| <= A_SERIE sale del desarrollo de Taylor, que sigue la rama de origen;
+    devuelve también qué alphas quedan al otro lado del corte de la raíz principal (su
+    punto crítico es el inverso del de la serie: ver critico_inverso). Para |rel| mayor
+    basta la resta en doble precisión de `directo`, el punto crítico de cada alpha.
+    """
+    coef, disc = serie_critico(origen)
+    c1, c2, c3 = (complex(x) for x in coef[1:])
+    d = [complex(x) for x in disc]
+    cerca = np.abs(rel) <= A_SERIE
+    serie = rel*(c1 + rel*(c2 + rel*c3))
+    # el corte es disc < 0: se cruza si cambia el signo de su parte imaginaria
+    disc_pix = d[0] + rel*(d[1] + rel*(d[2] + rel*d[3]))
+    otra_rama = cerca & (d[0].real < 0) & (np.signbit(disc_pix.imag) != np.signbit(d[0].imag))
+    return np.where(cerca, serie, directo - complex(coef[0])), otra_rama
+
+
+# ==========================
+# Comprobación con la iteración en alta precisión
+# ==========================
+def clasificar_alta(plano: str, P, z0: Alta, c: Alta, parada, pos: int):
+    """(etiqueta, iteraciones) de una órbita iterada entera en alta precisión."""
+    tol = TOLERANCIA_POLO[plano]
+    z = z0
+    posicion = np.array([pos])
+    for n in range(P.iter_max):
+        e, k = parada(np.array([complex(z)]), posicion, n + DESFASE[plano])
+        if e[0] != NINGUNA:
+            return e[0], (P.iter_max if e[0] == DESCONOCIDO else int(k[0]))
+        d = 1 - c*z
+        if abs(complex(d)) < tol:
+            z = Alta(Decimal("Infinity"))
+        else:
+            z = z*z*z*(z - c) / d
+    return DESCONOCIDO, P.iter_max
+
+
+def comprobar_profundo(plano: str, P, centro_re: str, centro_im: str, ancho: float,
+                       muestras: int = MUESTRAS, semilla: int = 0) -> dict:
+    """Compara píxeles al azar de clasificar_profundo con su órbita en alta precisión.
+
+    Cuenta los que cambiarían de color: distinta etiqueta o, en las etiquetas cuyo
+    color depende de ellas, distintas iteraciones.
+    """
+    from cheby_halley_adaptativo import etiquetas_con_iteracion
+    if hasattr(P, "finalize"):
+        P.finalize()
+    contador = {}
+    t0 = time.perf_counter()
+    etq, it = clasificar_profundo(plano, P, centro_re, centro_im, ancho, contador)
+    t1 = time.perf_counter()
+    offs = desplazamientos(plano, P.width, P.height, ancho).ravel()
+    elegidos = np.random.default_rng(semilla).choice(offs.size, min(muestras, offs.size), replace=False)
+    con_iter = etiquetas_con_iteracion(plano, P)
+    distintos = 0
+    with decimal.localcontext() as ctx:
+        ctx.prec = digitos(ancho)
+        centro = Alta(Decimal(centro_re), Decimal(centro_im))
+        if plano == "dinamico":
+            parada = parada_dinamico(complex(P.alpha_re, P.alpha_im), P)
+        else:
+            parada = parada_parametros(complex(centro) + offs, P)
+        for p in elegidos:
+            punto = centro + complex(offs[p])
+            if plano == "dinamico":
+                z0, c = punto, 2*(_alta(complex(P.alpha_re, P.alpha_im)) - 1)
+            else:
+                if abs(complex(3*(punto - 1))) < 1e-12:
+                    continue
+                z0, c = critico_alta(punto), 2*(punto - 1)
+            e, n = clasificar_alta(plano, P, z0, c, parada, p)
+            j, i = divmod(int(p), P.width)
+            if e != etq[j, i] or (e in con_iter and n != it[j, i]):
+                distintos += 1
+    return {
+        "pixeles": P.width * P.height,
+        "muestras": len(elegidos),
+        "distintos": distintos,
+        "referencias": contador.get("referencias", 0),
+        "sin_referencia": contador.get("sin_referencia", 0),
+        "segundos": t1 - t0,
+    }
+
+
+def colorear(plano: str, etiquetas, iteraciones, P):
+    """Imagen PIL con los colores del plano."""
+    if plano == "dinamico":
+        return Image.fromarray(motor.colorear_dinamico(etiquetas, iteraciones, P), "RGB")
+    return parametros.colorear(etiquetas, iteraciones, P)
+
+
+# ==========================
+# Main
+# ==========================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zoom profundo por perturbaciones (más allá de la doble precisión)")
+    parser.add_argument('plano', choices=['dinamico', 'parametros'])
+    parser.add_argument('--center-re', required=True, help='Parte real del centro (texto decimal, todas las cifras)')
+    parser.add_argument('--center-im', required=True, help='Parte imaginaria del centro')
+    parser.add_argument('--span', type=float, required=True, help='Ancho de la vista en el plano complejo (p. ej. 1e-50)')
+    parser.add_argument('--alpha-re', type=float, default=-0.3, help='Plano dinámico: parte real de alpha')
+    parser.add_argument('--alpha-im', type=float, default=0.0, help='Plano dinámico: parte imaginaria de alpha')
+    parser.add_argument('--width', type=int, default=800)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--iter-max', type=int, default=1000)
+    parser.add_argument('--no-basin-radii', action='store_true',
+                        help='No cortar las órbitas en las cuencas inmediatas')
+    parser.add_argument('--check', type=int, nargs='?', const=MUESTRAS, default=0, metavar='N',
+                        help='Comparar N píxeles al azar con su órbita en alta precisión')
+    parser.add_argument('--output', default=None, help='PNG de salida (por defecto imagenes/profundo_<plano>.png)')
+    ns = parser.parse_args()
+
+    comunes = {"width": ns.width, "height": ns.height, "iter_max": ns.iter_max, "basin_radii": not ns.no_basin_radii}
+    if ns.plano == "dinamico":
+        P = Params(alpha_re=ns.alpha_re, alpha_im=ns.alpha_im, engine="numpy", **comunes)
+    else:
+        P = parametros.PlanoParametros(engine="numpy", **comunes)
+    if ns.check:
+        print(comprobar_profundo(ns.plano, P, ns.center_re, ns.center_im, ns.span, ns.check))
+    else:
+        contador = {}
+        t0 = time.perf_counter()
+        etq, it = clasificar_profundo(ns.plano, P, ns.center_re, ns.center_im, ns.span, contador)
+        ruta = ns.output or os.path.join("imagenes", f"profundo_{ns.plano}.png")
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        colorear(ns.plano, etq, it, P).save(ruta)
+        print(f"{time.perf_counter() - t0:.2f} s, {contador.get('referencias', 0)} referencias, "
+              f"{contador.get('sin_referencia', 0)} píxeles recalculados")
+        print(f"Imagen exportada en: {ruta}")
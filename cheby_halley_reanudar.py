@@ -0,0 +1,155 @@
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+import cheby_halley_motor as motor
+from cheby_halley_cache import CAMPOS
+
+# ==========================
+# Estado reanudable de la iteración
+# ==========================
+# Un punto de control guarda la clasificación del plano y, para cada órbita que
+# agotó iter_max sin resolverse, su valor actual, el número de iteraciones hechas y
+# los puntos de control de la detección de ciclos. Con un iter_max mayor y el resto
+# de campos de cálculo iguales (los de cheby_halley_cache) sólo se siguen iterando
+# esas órbitas desde donde se quedaron: las comprobaciones de cada iteración no
+# dependen de iter_max, así que el resultado es idéntico al de empezar de cero. Las
+# órbitas cortadas por las cuencas inmediatas no se guardan (nunca se resolverían)
+# y quedan desconocidas con el nuevo iter_max. Con otro eps (u otro campo) el punto
+# de control no sirve: las órbitas ya resueltas podrían acabar de otra forma, y se
+# empieza de cero.
+#
+# La iteración es la del motor numpy (cheby_halley_motor con `estado`) por lotes de
+# píxeles, sin caché, procesos ni subdivisión adaptativa.
+#
+# En disco es un .npz con la clasificación, las órbitas pendientes (índice del
+# píxel, z y punto de control de ciclos) y los campos de cálculo en JSON.
+
+FORMATO = 1
+PUNTOS_POR_LOTE = 1 << 18   # órbitas iteradas a la vez
+
+COORDENADAS = {
+    "dinamico": motor.coordenadas_dinamico,
+    "parametros": motor.coordenadas_parametros,
+}
+ARRAYS = ("idx", "zr", "zi", "ref_r", "ref_i")
+
+
+@dataclass
+class PuntoControl:
+    plano: str
+    campos: dict              # campos de cálculo salvo iter_max
+    iter_max: int
+    etiquetas: np.ndarray     # (height, width)
+    iteraciones: np.ndarray
+    estado: dict              # órbitas pendientes: k, k_ref, lim y los arrays de ARRAYS
+
+    def pendientes(self) -> int:
+        return int(np.size(self.estado["idx"]))
+
+
+def _campos(plano: str, P) -> dict:
+    datos = {f: getattr(P, f) for f in CAMPOS[plano] if f != "iter_max"}
+    return json.loads(json.dumps(datos))   # tuplas -> listas, como al leerlo del disco
+
+
+def compatible(punto: PuntoControl, plano: str, P) -> bool:
+    """True si se puede seguir iterando `punto` hasta P.iter_max."""
+    return (punto is not None and punto.plano == plano and punto.campos == _campos(plano, P)
+            and P.iter_max >= punto.iter_max)
+
+
+def desde_clasificacion(plano: str, P, etiquetas, iteraciones) -> PuntoControl:
+    """Punto de control de una clasificación hecha sin guardar el estado.
+
+    Las órbitas sin resolver se vuelven a iterar desde el principio, pero las ya
+    resueltas (normalmente casi todo el plano) no se tocan.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    idx = np.flatnonzero(np.asarray(etiquetas) == motor.DESCONOCIDO)
+    return PuntoControl(plano, _campos(plano, P), P.iter_max, np.array(etiquetas), np.array(iteraciones),
+                        {"idx": idx})
+
+
+def _iterar(plano: str, P, p, estado: dict):
+    j, i = np.divmod(p, P.width)
+    re, im = COORDENADAS[plano](P, i, j)
+    if plano == "dinamico":
+        return motor.iterar_dinamico(re, im, complex(P.alpha_re, P.alpha_im), P, estado=estado)
+    return motor.iterar_parametros(re, im, P.iter_max, P.eps, P.detect_cycles, P.cycle_tol, P.basin_radii,
+                                   estado=estado)
+
+
+def clasificar(plano: str, P, punto: PuntoControl = None, progress_cb=None, stop_flag=None):
+    """(etiquetas, iteraciones, punto de control) del plano.
+
+    Si `punto` es compatible con P sólo se iteran sus órbitas pendientes hasta
+    P.iter_max; si no, todo el plano. Devuelve None si se cancela mediante stop_flag.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    if compatible(punto, plano, P):
+        etiquetas = punto.etiquetas.ravel().copy()
+        iteraciones = punto.iteraciones.ravel().copy()
+        iteraciones[etiquetas == motor.DESCONOCIDO] = P.iter_max
+        previo = punto.estado
+    else:
+        etiquetas = np.empty(P.width * P.height, dtype=np.uint8)
+        iteraciones = np.empty(P.width * P.height, dtype=np.int32)
+        previo = {"idx": np.arange(P.width * P.height)}
+    total = previo["idx"].size
+    partes = [{"idx": np.empty(0, dtype=np.intp), **{c: np.empty(0) for c in ARRAYS[1:]}}]
+    comun = {"k": 0, "k_ref": 0, "lim": 1}
+    for p0 in range(0, total, PUNTOS_POR_LOTE):
+        if stop_flag and stop_flag():
+            return None
+        p1 = min(p0 + PUNTOS_POR_LOTE, total)
+        p = previo["idx"][p0:p1]
+        estado = {}
+        if "k" in previo:
+            estado = {c: previo[c] for c in ("k", "k_ref", "lim")}
+            estado.update({c: previo[c][p0:p1] for c in ARRAYS[1:]})
+        etiquetas[p], iteraciones[p] = _iterar(plano, P, p, estado)
+        estado["idx"] = p[estado["idx"]]
+        partes.append(estado)
+        if estado["idx"].size:
+            comun = {c: estado[c] for c in ("k", "k_ref", "lim")}   # iguales en todos los lotes con órbitas
+        if progress_cb:
+            progress_cb(p1, total)
+    pendiente = {c: np.concatenate([e[c] for e in partes]) for c in ARRAYS}
+    pendiente.update(comun)
+    forma = (P.height, P.width)
+    etiquetas, iteraciones = etiquetas.reshape(forma), iteraciones.reshape(forma)
+    return etiquetas, iteraciones, PuntoControl(plano, _campos(plano, P), P.iter_max, etiquetas, iteraciones,
+                                                pendiente)
+
+
+def guardar(ruta: str, punto: PuntoControl):
+    """Escribe el punto de control en `ruta` (.npz), sustituyendo el anterior de golpe."""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    meta = {"formato": FORMATO, "plano": punto.plano, "campos": punto.campos, "iter_max": punto.iter_max,
+            **{c: int(punto.estado.get(c, 0)) for c in ("k", "k_ref", "lim")}}
+    tmp = f"{ruta}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), etiquetas=punto.etiquetas,
+                            iteraciones=punto.iteraciones, **{c: punto.estado[c] for c in ARRAYS})
+    os.replace(tmp, ruta)
+
+
+def cargar(ruta: str):
+    """Punto de control guardado en `ruta`, o None si el fichero no existe."""
+    if not os.path.exists(ruta):
+        return None
+    with np.load(ruta) as datos:
+        meta = json.loads(str(datos["meta"]))
+        if meta.get("formato") != FORMATO:
+            raise ValueError(f"Formato de punto de control no soportado: {meta.get('formato')}")
+        estado = {c: datos[c] for c in ARRAYS}
+        estado.update({c: meta[c] for c in ("k", "k_ref", "lim")})
+        return PuntoControl(meta["plano"], meta["campos"], meta["iter_max"], datos["etiquetas"],
+                            datos["iteraciones"], estado)
@@ -0,0 +1,439 @@
+import argparse
+import io
+import json
+import os
+import select
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from PIL import Image
+
+import cheby_halley_cache
+import cheby_halley_motor as motor
+import cheby_halley_motores as motores
+import cheby_halley_parametros as parametros
+from cheby_halley_nucleo import Params
+
+# ==========================
+# Servidor local de teselas
+# ==========================
+# Sirve los planos como un mapa de teselas (al estilo de OpenStreetMap) en
+#
+#   http://127.0.0.1:<puerto>/{plano}/{alpha}/{z}/{x}/{y}.png
+#
+# con plano "dinamico" o "parametros", alpha "re,im" (el plano de parámetros no lo usa;
+# vale cualquier texto, p. ej. "-") y (x, y) la tesela de LADO x LADO píxeles en el
+# nivel de zoom z. El nivel 0 es una sola tesela con el cuadrado que contiene la región
+# por defecto del plano, y cada nivel divide cada tesela en cuatro. En / hay un visor
+# sin dependencias externas: todo funciona sin conexión y sólo escucha en localhost.
+#
+# Cada tesela se clasifica con las teselas de cheby_halley_cache (así las ya vistas no
+# se recalculan) en un conjunto de hilos. Las peticiones de una tesela que ya se está
+# calculando esperan al mismo trabajo en lugar de lanzar otro, y si todos los clientes
+# que la esperaban cierran la conexión (el visor descarta las que salen de la vista)
+# el trabajo se cancela entre dos teselas de la caché. Los últimos PNG se guardan en
+# memoria para no recolorearlos.
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+LADO = 256          # píxeles de lado de cada tesela servida
+ZOOM_MAX = 40       # a partir de ahí la precisión de float64 ya no separa los píxeles
+PNG_MEMO = 1024     # PNG recientes guardados en memoria
+ESPERA = 0.2        # s entre comprobaciones de que el cliente sigue conectado
+
+PLANOS = ("dinamico", "parametros")
+CLASIFICAR = {
+    "dinamico": motor.clasificar_dinamico,
+    "parametros": motor.clasificar_parametros,
+}
+
+
+def cuadrado_base(plano: str, P):
+    """(x0, y0, lado, sentido) del nivel 0: esquina de la primera fila y sentido de y.
+
+    En el plano dinámico las filas avanzan hacia y creciente y en el de parámetros
+    hacia y decreciente, como en las imágenes de los scripts.
+    """
+    lado = max(P.x_max - P.x_min, P.y_max - P.y_min)
+    cx, cy = (P.x_min + P.x_max) / 2, (P.y_min + P.y_max) / 2
+    if plano == "dinamico":
+        return cx - lado / 2, cy - lado / 2, lado, 1.0
+    return cx - lado / 2, cy + lado / 2, lado, -1.0
+
+
+def parametros_tesela(plano: str, base, z: int, x: int, y: int, alpha=None):
+    """Parámetros de la tesela (z, x, y) a partir de los del plano completo `base`.
+
+    Los píxeles de todas las teselas de un nivel forman una única rejilla de paso
+    lado / (LADO * 2^z), con las transformaciones de puntos_dinamico/puntos_parametros.
+    """
+    x0, y0, lado, sentido = cuadrado_base(plano, base)
+    d = lado / (LADO << z)
+    x_min = x0 + (x * LADO + 0.5) * d
+    y_fila = y0 + sentido * (y * LADO + 0.5) * d   # y de la primera fila de la tesela
+    if plano == "dinamico":
+        # re = x_min + i/(W-1) (x_max - x_min): el último píxel está en x_max
+        return replace(base, alpha_re=alpha[0], alpha_im=alpha[1], width=LADO, height=LADO,
+                       x_min=x_min, x_max=x_min + (LADO - 1) * d,
+                       y_min=y_fila, y_max=y_fila + (LADO - 1) * d)
+    # re = x_min + i/W (x_max - x_min), im = y_max - j/H (y_max - y_min)
+    return replace(base, width=LADO, height=LADO,
+                   x_min=x_min, x_max=x_min + LADO * d,
+                   y_min=y_fila - LADO * d, y_max=y_fila)
+
+
+class Trabajo:
+    """Cálculo de una tesela y número de peticiones que lo esperan."""
+
+    def __init__(self):
+        self.futuro = None
+        self.interesados = 1
+        self.cancelado = False
+
+
+class ServidorTeselas:
+    """Calcula, cachea y reparte las teselas; independiente de HTTP.
+
+    `dinamico` y `parametros` son los parámetros del plano completo de cada uno (región
+    del nivel 0, iteraciones, motor...).
+    """
+
+    def __init__(self, dinamico: Params = None, parametros_plano=None, workers: int = None,
+                 cache: cheby_halley_cache.CacheTeselas = None):
+        self.base = {
+            "dinamico": dinamico or Params(engine="numpy"),
+            "parametros": parametros_plano or parametros.PlanoParametros(engine="numpy"),
+        }
+        for P in self.base.values():
+            if hasattr(P, "finalize"):
+                P.finalize()
+            P.engine = motores.elegir(P.engine)
+        self.cache = cache
+        workers = workers or os.cpu_count() or 1
+        if "numba" in (P.engine for P in self.base.values()):
+            workers = 1   # numba ya reparte cada tesela entre todos los hilos
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tesela")
+        self._lock = threading.Lock()
+        self._trabajos = {}
+        self._memo = OrderedDict()
+        self.contadores = {"calculadas": 0, "unidas": 0, "canceladas": 0, "de_memoria": 0}
+
+    def clave(self, plano: str, alpha: str, z: int, x: int, y: int):
+        """Clave normalizada de la tesela; ValueError si no es válida."""
+        if plano not in PLANOS:
+            raise ValueError(f"Plano desconocido: {plano}")
+        if not 0 <= z <= ZOOM_MAX or not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+            raise ValueError(f"Tesela fuera del plano: {z}/{x}/{y}")
+        if plano == "parametros":
+            return plano, None, z, x, y
+        re, im = (float(t) for t in alpha.split(","))
+        return plano, (re, im), z, x, y
+
+    def pedir(self, k) -> Trabajo:
+        """Trabajo de la tesela k: el que ya está en curso o uno nuevo."""
+        with self._lock:
+            t = self._trabajos.get(k)
+            if t is not None and not t.cancelado:
+                t.interesados += 1
+                self.contadores["unidas"] += 1
+                return t
+            t = Trabajo()
+            self._trabajos[k] = t
+            t.futuro = self._pool.submit(self._calcular, k, t)
+            return t
+
+    def soltar(self, k, t: Trabajo):
+        """El cliente ya no espera la tesela; sin interesados, el trabajo se cancela."""
+        with self._lock:
+            t.interesados -= 1
+            if t.interesados > 0 or t.futuro.done():
+                return
+            t.cancelado = True
+            t.futuro.cancel()
+            self.contadores["canceladas"] += 1
+            if self._trabajos.get(k) is t:
+                del self._trabajos[k]
+
+    def png(self, k, esperar=None):
+        """PNG de la tesela k, o None si se cancela.
+
+        `esperar(futuro)` espera el resultado y puede devolver None para dejar de
+        esperar (p. ej. si el cliente se ha desconectado); por defecto espera sin más.
+        """
+        with self._lock:
+            datos = self._memo.get(k)
+            if datos is not None:
+                self._memo.move_to_end(k)
+                self.contadores["de_memoria"] += 1
+                return datos
+        t = self.pedir(k)
+        try:
+            datos = (esperar or (lambda f: f.result()))(t.futuro)
+        except CancelledError:
+            datos = None
+        if datos is None:
+            self.soltar(k, t)
+        return datos
+
+    def _calcular(self, k, t: Trabajo):
+        datos = None
+        try:
+            datos = self._render(k, lambda: t.cancelado)
+        finally:
+            # la tesela entra en _memo en el mismo bloque en que se retira el trabajo:
+            # ninguna petición puede encontrarse sin lo uno ni lo otro y volver a calcularla
+            with self._lock:
+                if datos is not None:
+                    self.contadores["calculadas"] += 1
+                    self._memo[k] = datos
+                    while len(self._memo) > PNG_MEMO:
+                        self._memo.popitem(last=False)
+                if self._trabajos.get(k) is t:
+                    del self._trabajos[k]
+        return datos
+
+    def _render(self, k, stop_flag):
+        plano, alpha, z, x, y = k
+        P = parametros_tesela(plano, self.base[plano], z, x, y, alpha)
+        if self.cache is not None:
+            res = cheby_halley_cache.clasificar_con_cache(plano, P, self.cache, stop_flag=stop_flag)
+        else:
+            res = CLASIFICAR[plano](P, stop_flag=stop_flag)
+        if res is None:
+            return None
+        if plano == "dinamico":
+            img = Image.fromarray(motor.colorear_dinamico(*res, P), "RGB")
+        else:
+            img = parametros.colorear(*res, P)
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        return buf.getvalue()
+
+    def estado(self) -> dict:
+        with self._lock:
+            estado = dict(self.contadores, en_curso=len(self._trabajos))
+        if self.cache is not None:
+            estado.update(cache_aciertos=self.cache.aciertos, cache_fallos=self.cache.fallos)
+        return estado
+
+    def cerrar(self):
+        with self._lock:
+            for t in self._trabajos.values():
+                t.cancelado = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ==========================
+# HTTP
+# ==========================
+def _visor(servidor: ServidorTeselas) -> bytes:
+    bases = {p: cuadrado_base(p, P) for p, P in servidor.base.items()}
+    return VISOR.replace("__BASES__", json.dumps(bases)).replace("__ZOOM_MAX__", str(ZOOM_MAX)).encode()
+
+
+class Peticion(BaseHTTPRequestHandler):
+    servidor: ServidorTeselas = None   # se fija en servir()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            pass   # el cliente cerró la conexión (el visor descarta teselas a menudo)
+
+    def _responder(self, tipo: str, datos: bytes, cache: bool = False):
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(datos)))
+        if cache:
+            self.send_header("Cache-Control", "max-age=86400")
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _desconectado(self) -> bool:
+        """True si el cliente ha cerrado la conexión mientras espera."""
+        try:
+            legible, _, _ = select.select([self.connection], [], [], 0)
+            return bool(legible) and self.connection.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _esperar(self, futuro):
+        while True:
+            try:
+                return futuro.result(timeout=ESPERA)
+            except TimeoutError:
+                if self._desconectado():
+                    return None
+
+    def do_GET(self):
+        ruta = unquote(urlparse(self.path).path)
+        if ruta in ("/", "/index.html"):
+            return self._responder("text/html; charset=utf-8", _visor(self.servidor))
+        if ruta == "/estado":
+            return self._responder("application/json", json.dumps(self.servidor.estado()).encode())
+        partes = ruta.strip("/").split("/")
+        try:
+            if len(partes) != 5 or not partes[4].endswith(".png"):
+                raise ValueError(ruta)
+            plano, alpha, z, x, y = partes[0], partes[1], int(partes[2]), int(partes[3]), int(partes[4][:-4])
+            k = self.servidor.clave(plano, alpha, z, x, y)
+        except ValueError:
+            return self.send_error(404, "Tesela no válida: /{plano}/{alpha}/{z}/{x}/{y}.png")
+        datos = self.servidor.png(k, self._esperar)
+        if datos is None:
+            self.close_connection = True
+            return
+        self._responder("image/png", datos, cache=True)
+
+
+def servir(servidor: ServidorTeselas, puerto: int = PUERTO, abrir: bool = False):
+    """Atiende peticiones en http://127.0.0.1:<puerto>/ hasta Ctrl+C."""
+    Peticion.servidor = servidor
+    http = ThreadingHTTPServer((HOST, puerto), Peticion)
+    http.daemon_threads = True
+    url = f"http://{HOST}:{http.server_port}/"
+    print(f"Sirviendo teselas en {url} (Ctrl+C para terminar)")
+    if abrir:
+        import webbrowser
+        threading.Timer(0.5, webbrowser.open, (url,)).start()
+    try:
+        http.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http.server_close()
+        servidor.cerrar()
+
+
+# Visor: mapa de teselas arrastrable con zoom con la rueda. Doble clic en el plano de
+# parámetros abre el plano dinámico de ese alpha.
+VISOR = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Chebyshev–Halley</title>
+<style>
+body{margin:0;overflow:hidden;font:13px sans-serif}
+#mapa{position:absolute;inset:0;background:#282828;cursor:grab;touch-action:none}
+#mapa img{position:absolute;width:256px;height:256px;user-select:none;-webkit-user-drag:none;pointer-events:none}
+#panel{position:absolute;top:8px;left:8px;z-index:1;background:#fffe;padding:6px 8px;border-radius:4px}
+</style></head><body>
+<div id="mapa"></div>
+<div id="panel">
+  <select id="plano"><option value="dinamico">dinámico</option><option value="parametros">parámetros</option></select>
+  α = <input id="alpha" value="-0.3,0.0" size="14">
+  z = <span id="zoom"></span> &nbsp; <span id="pos"></span>
+</div>
+<script>
+const LADO = 256, ZOOM_MAX = __ZOOM_MAX__, BASES = __BASES__;
+const mapa = document.getElementById("mapa"), plano = document.getElementById("plano"),
+      alpha = document.getElementById("alpha");
+let z = 1, cx = 0.5, cy = 0.5;   // centro de la vista, en fracciones del cuadrado base
+const imagenes = new Map();
+
+function origen() {
+  const total = LADO * 2 ** z;
+  return [cx * total - mapa.clientWidth / 2, cy * total - mapa.clientHeight / 2, total];
+}
+
+function dibujar() {
+  const [ox, oy] = origen(), n = 2 ** z, vistas = new Set();
+  const a = plano.value === "dinamico" ? encodeURIComponent(alpha.value.replace(/\\s/g, "")) : "-";
+  for (let ty = Math.max(0, Math.floor(oy / LADO)); ty < Math.min(n, Math.ceil((oy + mapa.clientHeight) / LADO)); ty++)
+    for (let tx = Math.max(0, Math.floor(ox / LADO)); tx < Math.min(n, Math.ceil((ox + mapa.clientWidth) / LADO)); tx++) {
+      const k = `/${plano.value}/${a}/${z}/${tx}/${ty}.png`;
+      vistas.add(k);
+      let img = imagenes.get(k);
+      if (!img) {
+        img = new Image();
+        img.src = k;
+        mapa.appendChild(img);
+        imagenes.set(k, img);
+      }
+      img.style.left = (tx * LADO - ox) + "px";
+      img.style.top = (ty * LADO - oy) + "px";
+    }
+  for (const [k, img] of imagenes)
+    if (!vistas.has(k)) {   // quitar src cancela la descarga y el servidor deja de calcularla
+      img.src = "";
+      img.remove();
+      imagenes.delete(k);
+    }
+  document.getElementById("zoom").textContent = z;
+}
+
+function complejo(mx, my) {
+  const [ox, oy, total] = origen(), [x0, y0, lado, sentido] = BASES[plano.value];
+  return [x0 + (ox + mx) / total * lado, y0 + sentido * (oy + my) / total * lado];
+}
+
+let arrastre = null;
+mapa.addEventListener("pointerdown", e => { arrastre = [e.clientX, e.clientY]; mapa.setPointerCapture(e.pointerId); });
+mapa.addEventListener("pointerup", () => { arrastre = null; });
+mapa.addEventListener("pointermove", e => {
+  const [re, im] = complejo(e.clientX, e.clientY);
+  document.getElementById("pos").textContent = `${re.toPrecision(10)} ${im < 0 ? "-" : "+"} ${Math.abs(im).toPrecision(10)}i`;
+  if (!arrastre) return;
+  const total = LADO * 2 ** z;
+  cx -= (e.clientX - arrastre[0]) / total;
+  cy -= (e.clientY - arrastre[1]) / total;
+  arrastre = [e.clientX, e.clientY];
+  dibujar();
+});
+mapa.addEventListener("wheel", e => {
+  e.preventDefault();
+  const nz = Math.min(ZOOM_MAX, Math.max(0, z + (e.deltaY < 0 ? 1 : -1)));
+  if (nz === z) return;
+  // el punto bajo el cursor queda fijo
+  const [ox, oy, total] = origen(), fx = (ox + e.clientX) / total, fy = (oy + e.clientY) / total;
+  z = nz;
+  cx = fx - (e.clientX - mapa.clientWidth / 2) / (LADO * 2 ** z);
+  cy = fy - (e.clientY - mapa.clientHeight / 2) / (LADO * 2 ** z);
+  dibujar();
+}, {passive: false});
+mapa.addEventListener("dblclick", e => {
+  if (plano.value !== "parametros") return;
+  const [re, im] = complejo(e.clientX, e.clientY);
+  alpha.value = `${re.toPrecision(8)},${im.toPrecision(8)}`;
+  plano.value = "dinamico";
+  z = 1; cx = cy = 0.5;
+  dibujar();
+});
+plano.addEventListener("change", () => { z = 1; cx = cy = 0.5; dibujar(); });
+alpha.addEventListener("change", dibujar);
+window.addEventListener("resize", dibujar);
+dibujar();
+</script></body></html>
+"""
+
+
+# ==========================
+# Main
+# ==========================
+if __name__ == "__main__":
+    array_engines = [m for m in motores.nombres() if motores.usa_arrays(m)]
+    parser = argparse.ArgumentParser(description="Servidor local de teselas de los planos de Chebyshev-Halley")
+    parser.add_argument('--port', type=int, default=PUERTO, help='Puerto en 127.0.0.1 (0: uno libre)')
+    parser.add_argument('--engine', choices=array_engines, default='numpy',
+                        help='Motor de arrays con el que se clasifican las teselas')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Hilos de cálculo (por defecto, uno por CPU)')
+    parser.add_argument('--iter-max', type=int, default=None,
+                        help='Iteraciones máximas de ambos planos (por defecto, las de cada script)')
+    parser.add_argument('--detect-cycles', action='store_true', help='Detectar ciclos atractores')
+    parser.add_argument('--no-cache', action='store_true', help='No usar la caché de teselas en disco')
+    parser.add_argument('--open', action='store_true', help='Abrir el visor en el navegador')
+    ns = parser.parse_args()
+
+    comunes = {"engine": ns.engine, "detect_cycles": ns.detect_cycles}
+    if ns.iter_max:
+        comunes["iter_max"] = ns.iter_max
+    servidor = ServidorTeselas(Params(**comunes), parametros.PlanoParametros(**comunes), ns.workers,
+                               None if ns.no_cache else cheby_halley_cache.cache_por_defecto())
+    servir(servidor, ns.port, ns.open)
@@ -0,0 +1,236 @@
+import time
+from dataclasses import replace
+
+import numpy as np
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motor as motor
+from cheby_halley_motor import CUENCA0, CUENCA1, DESCONOCIDO, ESCAPE, PERIODICO, POLO
+
+# ==========================
+# Motor de precisión simple (complex64) y resultados compactos
+# ==========================
+# Las mismas iteraciones que el motor vectorial pero con arrays complex64 (la mitad
+# de bytes por órbita activa que complex128) y con las iteraciones en uint16 en vez
+# de int32. Sirve para renders de tanteo y barridos grandes: la clasificación no es
+# exacta (las órbitas que pasan muy cerca de un radio de parada o de la frontera de
+# una cuenca pueden acabar de otra forma), y comprobar_precision mide qué fracción
+# de píxeles cambia de color respecto a la doble precisión de classify_color.
+#
+# Los puntos iniciales, los radios de parada y los puntos críticos se calculan en
+# doble precisión con cheby_halley_motor y se redondean al empezar: sólo la
+# iteración es en precisión simple. El operador se evalúa como z^3 (z - c)/(1 - c z)
+# dividiendo primero, para que z^4 no desborde antes de llegar al radio de escape.
+#
+# clasificar_compacto guarda el plano como un array estructurado COMPACTO (etiqueta
+# uint8 + iteraciones uint16, 3 bytes por píxel) en vez de etiquetas, iteraciones
+# int32 y RGB (8 bytes por píxel); sirve con cualquier motor.
+
+COMPACTO = np.dtype([("etiqueta", np.uint8), ("iteraciones", np.uint16)])
+ITER_MAX_COMPACTO = int(np.iinfo(np.uint16).max)
+
+
+def _tipo_iteraciones(iter_max: int):
+    return np.uint16 if iter_max <= ITER_MAX_COMPACTO else np.int32
+
+
+def _complejos(re, im):
+    z = np.empty(np.size(re), dtype=np.complex64)
+    z.real = np.ravel(re)
+    z.imag = np.ravel(im)
+    return z
+
+
+def _operador(z, c, tol):
+    """O_alpha en complex64 (c = 2*(alpha - 1), escalar o por órbita); den≈0 => inf."""
+    den = 1 - c*z
+    polo = np.abs(den) < tol
+    with np.errstate(all='ignore'):
+        w = (z*z) * (z * ((z - c) / den))
+    return np.where(polo, np.complex64(np.inf), w)
+
+
+def iterar_dinamico(zr, zi, a: complex, P):
+    """Como cheby_halley_motor.iterar_dinamico, en precisión simple.
+
+    Devuelve (etiquetas uint8, iteraciones uint16) con la forma de la entrada
+    (iteraciones int32 si iter_max no cabe en uint16). Una órbita que deja de ser
+    finita cuenta como escape.
+    """
+    forma = np.shape(zr)
+    z = _complejos(zr, zi)
+    etiquetas = np.full(z.size, DESCONOCIDO, dtype=np.uint8)
+    iteraciones = np.full(z.size, P.iter_max, dtype=_tipo_iteraciones(P.iter_max))
+    idx = np.arange(z.size)
+
+    c2 = 2*(a - 1)
+    c = np.complex64(c2)
+    r0, objetivos, otros = motor.basin_radii(a, P)
+    # cotas de pasos con el redondeo de float32
+    ulp = float(np.finfo(np.float32).eps)
+    cotas0 = cuencas.cotas_cero(c2, r0, P.eps, ulp)
+    cotas = [cuencas.cotas_fijo(t, c2, r, P.eps, ulp) for t, r in objetivos]
+    objetivos = [(np.complex64(t), r) for t, r in objetivos]
+    otros = [(np.complex64(f), r) for f, r in otros]
+    ref, k_ref, lim = z, 1, 1
+
+    for k in range(1, P.iter_max + 1):
+        if idx.size == 0:
+            break
+        m = np.abs(z)
+        n = np.full(z.size, k, dtype=iteraciones.dtype)
+        b1 = np.zeros(z.size, dtype=bool)
+        for (t, r), cota in zip(objetivos, cotas):
+            d = np.abs(z - t)
+            b1 |= (d < P.eps) | motor._cortar(d, r, cota, cuencas.pasos_fijo, P.eps, k, P.iter_max, n)
+        b0 = (m < P.eps) | motor._cortar(m, r0, cotas0, cuencas.pasos_cero, P.eps, k, P.iter_max, n)
+        b1 &= ~b0
+        esc = ~(m <= P.escape) & ~b0 & ~b1   # también NaN
+        hecho = b0 | b1 | esc
+        nunca = None
+        for f, r in otros:
+            dentro = (np.abs(z - f) < r) & ~hecho
+            nunca = dentro if nunca is None else nunca | dentro
+        ciclo = (np.abs(z - ref) < P.cycle_tol) & ~hecho if P.detect_cycles and k > k_ref else None
+        if ciclo is not None:
+            hecho |= ciclo
+        if hecho.any() or (nunca is not None and nunca.any()):
+            etiquetas[idx[b0]] = CUENCA0
+            etiquetas[idx[b1]] = CUENCA1
+            etiquetas[idx[esc]] = np.where(np.isinf(z[esc].real), POLO, ESCAPE)
+            iteraciones[idx[hecho]] = n[hecho]
+            if ciclo is not None:
+                etiquetas[idx[ciclo]] = PERIODICO
+                iteraciones[idx[ciclo]] = k - k_ref
+            if nunca is not None:
+                hecho |= nunca
+            sigue = ~hecho
+            idx, z, ref = idx[sigue], z[sigue], ref[sigue]
+        if k > k_ref and k - k_ref == lim:
+            ref, k_ref, lim = z, k, 2*lim
+        z = _operador(z, c, 1e-10)
+
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
+
+
+def iterar_parametros(ar, ai, iter_max: int, eps: float, detect_cycles: bool = False, cycle_tol: float = 1e-6,
+                      radios: bool = True):
+    """Como cheby_halley_motor.iterar_parametros, en precisión simple (ver iterar_dinamico)."""
+    forma = np.shape(ar)
+    ar = np.array(ar, dtype=float).ravel()
+    ai = np.array(ai, dtype=float).ravel()
+    etiquetas = np.full(ar.size, DESCONOCIDO, dtype=np.uint8)
+    iteraciones = np.full(ar.size, iter_max, dtype=_tipo_iteraciones(iter_max))
+    eps_inv = 1 / eps
+
+    with np.errstate(all='ignore'):
+        zr, zi, valido = motor.critico_secundario(ar, ai)
+    etiquetas[~valido] = POLO
+    iteraciones[~valido] = 0
+    radios = radios and not detect_cycles
+    discos = []
+    idx = np.flatnonzero(valido)
+    z = _complejos(zr[idx], zi[idx])
+    c = _complejos(2*(ar[idx] - 1), 2*ai[idx])
+    ref, n_ref, lim = z, 0, 1
+
+    for n in range(iter_max):
+        if idx.size == 0:
+            break
+        m = np.abs(z)
+        b0 = m < eps
+        esc = ~(m <= eps_inv) & ~b0
+        hecho = b0 | esc
+        ciclo = (np.abs(z - ref) < cycle_tol) & ~hecho if detect_cycles and n > n_ref else None
+        if ciclo is not None:
+            hecho |= ciclo
+        if radios and n == motor.PASO_DISCOS:
+            discos = [(_complejos(fr, fi), rho.astype(np.float32))
+                      for fr, fi, rho in motor._discos_parametros(ar[idx], ai[idx], eps, idx, etiquetas.size)]
+        nunca = None
+        for f, rho in (discos if n % motor.PASO_DISCOS == 0 else ()):
+            dentro = np.abs(z - f[idx]) < rho[idx]
+            nunca = dentro if nunca is None else nunca | dentro
+        if nunca is not None:
+            nunca &= ~hecho
+        if hecho.any() or (nunca is not None and nunca.any()):
+            etiquetas[idx[b0]] = CUENCA0
+            etiquetas[idx[esc]] = ESCAPE
+            iteraciones[idx[hecho]] = n
+            if ciclo is not None:
+                etiquetas[idx[ciclo]] = PERIODICO
+                iteraciones[idx[ciclo]] = n - n_ref
+            sigue = ~hecho if nunca is None else ~(hecho | nunca)
+            idx, z, c, ref = idx[sigue], z[sigue], c[sigue], ref[sigue]
+        if n > n_ref and n - n_ref == lim:
+            ref, n_ref, lim = z, n, 2*lim
+        z = _operador(z, c, 1e-12)
+
+    return etiquetas.reshape(forma), iteraciones.reshape(forma)
+
+
+def compactar(etiquetas, iteraciones):
+    """Array COMPACTO con la clasificación (etiquetas, iteraciones)."""
+    if np.size(iteraciones) and int(np.max(iteraciones)) > ITER_MAX_COMPACTO:
+        raise ValueError(f"Las iteraciones no caben en uint16 (máximo {ITER_MAX_COMPACTO})")
+    res = np.empty(np.shape(etiquetas), dtype=COMPACTO)
+    res["etiqueta"] = etiquetas
+    res["iteraciones"] = iteraciones
+    return res
+
+
+def clasificar_compacto(plano: str, P, progress_cb=None, stop_flag=None, lado: int = motor.LADO_TESELA):
+    """Clasifica el plano tesela a tesela con el motor de P en un array COMPACTO (height, width).
+
+    res["etiqueta"] y res["iteraciones"] se pasan tal cual a las funciones de color.
+    Devuelve None si se cancela mediante stop_flag.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    if P.iter_max > ITER_MAX_COMPACTO:
+        raise ValueError(f"iter_max = {P.iter_max} no cabe en uint16 (máximo {ITER_MAX_COMPACTO})")
+    tesela = motor.TESELAS[plano]
+    res = np.empty((P.height, P.width), dtype=COMPACTO)
+    lista = motor.teselas(P.width, P.height, lado)
+    for hechas, (i0, i1, j0, j1) in enumerate(lista, 1):
+        if stop_flag and stop_flag():
+            return None
+        e, n = tesela(P, i0, i1, j0, j1)
+        res["etiqueta"][j0:j1, i0:i1] = e
+        res["iteraciones"][j0:j1, i0:i1] = n
+        if progress_cb:
+            progress_cb(hechas, len(lista))
+    return res
+
+
+def comprobar_precision(plano: str, P) -> dict:
+    """Compara la clasificación en precisión simple con la de doble precisión.
+
+    La de doble precisión es la del motor numpy, idéntica a classify_color. Cuenta
+    los píxeles con distinta etiqueta y los que cambiarían de color (distinta
+    etiqueta o, en las etiquetas cuyo color depende de ellas, distintas iteraciones).
+    """
+    from cheby_halley_adaptativo import etiquetas_con_iteracion
+    if hasattr(P, "finalize"):
+        P.finalize()
+    clasificar = motor.clasificar_dinamico if plano == "dinamico" else motor.clasificar_parametros
+    t0 = time.perf_counter()
+    e_a, n_a = clasificar(replace(P, engine="numpy"))
+    t1 = time.perf_counter()
+    res = clasificar_compacto(plano, replace(P, engine="float32"))
+    t2 = time.perf_counter()
+    e_b, n_b = res["etiqueta"], res["iteraciones"]
+    con_iter = np.isin(e_a, etiquetas_con_iteracion(plano, P))
+    distintos = (e_a != e_b) | (con_iter & (n_a != n_b))
+    pixeles = P.width * P.height
+    return {
+        "pixeles": pixeles,
+        "distinta_etiqueta": int((e_a != e_b).sum()),
+        "distintos": int(distintos.sum()),
+        "fraccion_distintos": float(distintos.sum()) / pixeles,
+        "segundos_doble": t1 - t0,
+        "segundos_simple": t2 - t1,
+        "aceleracion": (t1 - t0) / max(t2 - t1, 1e-9),
+        "bytes_compacto": res.nbytes,
+        "bytes_doble": e_a.nbytes + n_a.nbytes + 3 * pixeles,   # etiquetas, iteraciones int32 y RGB
+    }
@@ -0,0 +1,79 @@
+import numpy as np
+
+import cheby_halley_motor as motor
+from cheby_halley_adaptativo import etiquetas_con_iteracion
+
+# ==========================
+# Suavizado de bordes (supermuestreo sólo en los bordes)
+# ==========================
+# Tras la primera pasada se marcan los píxeles de borde: los que tienen algún
+# vecino (en las 8 direcciones) de distinto color, es decir, con otra etiqueta o,
+# en las etiquetas cuyo color depende de ellas, con otras iteraciones. Sólo esos
+# píxeles se vuelven a calcular en una rejilla n x n de submuestras repartidas por
+# el píxel, y en la etapa de color se sustituye su color por la media de los de
+# sus submuestras. El resto del plano no se toca.
+
+PUNTOS_POR_LOTE = 1 << 18   # submuestras iteradas a la vez
+
+
+def bordes(plano: str, P, etiquetas, iteraciones):
+    """Máscara (height, width) de los píxeles con algún vecino de distinto color."""
+    con_iter = np.isin(etiquetas, etiquetas_con_iteracion(plano, P))
+    # clave de color: la etiqueta y, si su color depende de ellas, las iteraciones
+    clave = etiquetas.astype(np.int64) + np.where(con_iter, (iteraciones.astype(np.int64) + 1) << 3, 0)
+    mascara = np.zeros(clave.shape, dtype=bool)
+    H, W = clave.shape
+    for dj, di in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        # pares de píxeles (p, p + (dj, di)) dentro de la rejilla
+        a = slice(0, H - dj), slice(max(0, -di), W - max(0, di))
+        b = slice(dj, H), slice(max(0, di), W - max(0, -di))
+        d = clave[a] != clave[b]
+        mascara[a] |= d
+        mascara[b] |= d
+    return mascara
+
+
+def desplazamientos(n: int):
+    """Posiciones de una rejilla n x n dentro del píxel, relativas a su punto de muestra."""
+    return (np.arange(n) + 0.5) / n - 0.5
+
+
+def submuestrear(plano: str, P, etiquetas, iteraciones, n: int, stop_flag=None, contador: dict = None):
+    """Clasifica n x n submuestras de cada píxel de borde.
+
+    Devuelve (j, i, etiquetas, iteraciones): las coordenadas de los píxeles de
+    borde y la clasificación de sus submuestras, de forma (k, n*n). Es la parte de
+    cálculo del suavizado; mezclar() hace la de color. None si se cancela.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    pixeles = motor.PIXELES[plano]
+    j, i = np.nonzero(bordes(plano, P, etiquetas, iteraciones))
+    d = desplazamientos(n)
+    dj, di = (x.ravel() for x in np.meshgrid(d, d, indexing="ij"))
+    sub_e = np.empty((i.size, n * n), dtype=np.uint8)
+    sub_n = np.empty((i.size, n * n), dtype=np.int32)
+    por_lote = max(1, PUNTOS_POR_LOTE // (n * n))
+    for k0 in range(0, i.size, por_lote):
+        if stop_flag and stop_flag():
+            return None
+        k1 = min(k0 + por_lote, i.size)
+        # índices de píxel fraccionarios: la misma transformación que el píxel entero
+        sub_e[k0:k1], sub_n[k0:k1] = pixeles(P, i[k0:k1, None] + di, j[k0:k1, None] + dj)
+    if contador is not None:
+        contador["bordes"] = int(i.size)
+        contador["evaluados"] = int(i.size) * n * n
+    return j, i, sub_e, sub_n
+
+
+def mezclar(rgb, muestras, colorear):
+    """Sustituye en `rgb` el color de cada píxel de borde por la media de sus submuestras.
+
+    `colorear(etiquetas, iteraciones)` es la misma función de color del plano; se
+    aplica a las submuestras, así que cambiar los colores no obliga a recalcularlas.
+    """
+    j, i, sub_e, sub_n = muestras
+    if i.size:
+        colores = colorear(sub_e, sub_n).astype(np.float64)
+        rgb[j, i] = np.rint(colores.mean(axis=1)).astype(np.uint8)
+    return rgb
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import cheby_halley_cache
+import cheby_halley_motor as motor
+
+# ==========================
+# Renders interactivos por teselas
+# ==========================
+# La interfaz lanza un render nuevo en cuanto cambia un parámetro, y el anterior deja
+# de interesar. Para que el cambio se vea enseguida el plano se clasifica en teselas
+# pequeñas (LADO píxeles) empezando por el centro:
+# - la cancelación se comprueba entre tesela y tesela, así que un render sustituido
+#   se detiene en milisegundos y no al terminar un bloque de columnas;
+# - cada tesela terminada se entrega con `entregar` para pintarla sin esperar al
+#   resto del plano;
+# - las teselas se guardan en memoria (MemoTeselas) con la clave de
+#   cheby_halley_cache, que no depende de colores ni marcas: volver a un α o a un
+#   rango ya calculados, recolorear o repetir un render cancelado a medias reutiliza
+#   las teselas que siguen valiendo. Con la caché en disco también se consulta.
+
+LADO = 64
+MAX_TESELAS = 2048   # teselas en memoria (unos 40 MB con LADO = 64)
+
+
+class MemoTeselas:
+    """Teselas (etiquetas, iteraciones) en memoria con expulsión LRU, seguras entre hilos.
+
+    `aciertos` cuenta las teselas reutilizadas desde que se creó el objeto.
+    """
+
+    def __init__(self, maximo: int = MAX_TESELAS):
+        self.maximo = maximo
+        self.aciertos = 0
+        self._teselas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, k: str):
+        with self._lock:
+            res = self._teselas.get(k)
+            if res is not None:
+                self._teselas.move_to_end(k)
+                self.aciertos += 1
+            return res
+
+    def put(self, k: str, etiquetas, iteraciones):
+        with self._lock:
+            self._teselas[k] = (etiquetas, iteraciones)
+            self._teselas.move_to_end(k)
+            while len(self._teselas) > self.maximo:
+                self._teselas.popitem(last=False)
+
+
+def desde_el_centro(lista, width: int, height: int):
+    """Las teselas ordenadas por la distancia de su centro al del plano."""
+    cx, cy = width / 2, height / 2
+    return sorted(lista, key=lambda t: ((t[0] + t[1])/2 - cx)**2 + ((t[2] + t[3])/2 - cy)**2)
+
+
+def clasificar_por_teselas(plano: str, P, memo: MemoTeselas = None, entregar=None, progress_cb=None,
+                           stop_flag=None, cache=None, lado: int = LADO):
+    """(etiquetas, iteraciones) del plano, tesela a tesela desde el centro.
+
+    Llama a entregar(i0, i1, j0, j1, etiquetas, iteraciones) con cada tesela
+    terminada. Devuelve None si se cancela mediante stop_flag; las teselas ya
+    calculadas quedan en `memo`.
+    """
+    if hasattr(P, "finalize"):
+        P.finalize()
+    tesela = motor.TESELAS[plano]
+    etiquetas = np.empty((P.height, P.width), dtype=np.uint8)
+    iteraciones = np.empty((P.height, P.width), dtype=np.int32)
+    lista = desde_el_centro(motor.teselas(P.width, P.height, lado), P.width, P.height)
+    for hechas, t in enumerate(lista, 1):
+        if stop_flag and stop_flag():
+            return None
+        i0, i1, j0, j1 = t
+        k = cheby_halley_cache.clave(plano, P, t)
+        res = memo.get(k) if memo is not None else None
+        if res is None and cache is not None:
+            res = cache.get(k)
+            if res is not None and memo is not None:
+                memo.put(k, *res)
+        if res is None:
+            res = tesela(P, i0, i1, j0, j1)
+            if cache is not None:
+                cache.put(k, *res)
+            if memo is not None:
+                memo.put(k, *res)
+        etiquetas[j0:j1, i0:i1], iteraciones[j0:j1, i0:i1] = res
+        if entregar:
+            entregar(i0, i1, j0, j1, *res)
+        if progress_cb:
+            progress_cb(hechas, len(lista))
+    return etiquetas, iteraciones
@@ -0,0 +1,20 @@
+import pytest
+
+import cheby_halley_adaptativo as adaptativo
+from cheby_halley_nucleo import Params
+
+
+@pytest.mark.parametrize("modo", ["hsv", "#000000"])
+@pytest.mark.parametrize("alpha", [-0.3, 0.2, 3.2])
+def test_adaptativo_casi_igual_a_fuerza_bruta(alpha, modo):
+    P = Params(width=300, height=200, alpha_re=alpha, color_escape_mode=modo, use_cache=False)
+    rep = adaptativo.comprobar_adaptativo("dinamico", P)
+    assert rep["fraccion_distintos"] < 1e-4
+    assert rep["ahorro"] > 2
+
+
+def test_adaptativo_plano_parametros():
+    import cheby_halley_parametros as parametros
+    Q = parametros.PlanoParametros(width=150, height=120, use_cache=False)
+    rep = adaptativo.comprobar_adaptativo("parametros", Q)
+    assert rep["distintos"] == 0
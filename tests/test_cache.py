@@ -0,0 +1,70 @@
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import cheby_halley_cache as cache
+from cheby_halley_nucleo import Params
+
+TESELA = (0, 64, 0, 64)
+
+
+@pytest.mark.parametrize("plano", ["dinamico", "parametros"])
+def test_clave_cambia_con_cada_campo_de_calculo(plano):
+    P = Params()
+    P.finalize()
+    base = cache.clave(plano, P, TESELA)
+    assert cache.clave(plano, replace(P), TESELA) == base
+    for campo in cache.CAMPOS[plano]:
+        valor = getattr(P, campo)
+        if isinstance(valor, bool):
+            otro = not valor
+        elif isinstance(valor, str):
+            otro = "one" if valor != "one" else "s12"
+        else:
+            otro = valor * 2 + 1
+        assert cache.clave(plano, replace(P, **{campo: otro}), TESELA) != base, campo
+    assert cache.clave(plano, P, (0, 64, 64, 128)) != base
+
+
+def test_clave_no_depende_de_colores_ni_de_motores_exactos():
+    P = Params()
+    P.finalize()
+    base = cache.clave("dinamico", P, TESELA)
+    assert cache.clave("dinamico", replace(P, color_basin0=(1, 2, 3), outdir="x", workers=4), TESELA) == base
+    assert cache.clave("dinamico", replace(P, engine="python"), TESELA) == base
+    assert cache.clave("dinamico", replace(P, engine="float32"), TESELA) != base
+
+
+def _tesela(valor):
+    return np.full((64, 64), valor, dtype=np.uint8), np.full((64, 64), valor, dtype=np.int32)
+
+
+def test_get_tras_put(tmp_path):
+    c = cache.CacheTeselas(str(tmp_path))
+    assert c.get("ab" * 32) is None
+    e, n = _tesela(3)
+    c.put("ab" * 32, e, n)
+    e2, n2 = c.get("ab" * 32)
+    assert np.array_equal(e, e2) and np.array_equal(n, n2)
+    assert (c.aciertos, c.fallos) == (1, 1)
+    # otro objeto sobre el mismo directorio la encuentra (persistente)
+    assert cache.CacheTeselas(str(tmp_path)).get("ab" * 32) is not None
+
+
+def test_expulsion_lru(tmp_path):
+    c = cache.CacheTeselas(str(tmp_path))
+    claves = [f"{k:02d}" * 32 for k in range(4)]
+    c.put(claves[0], *_tesela(0))
+    tam = os.path.getsize(c._ruta(claves[0]))
+    c.vaciar()
+    c = cache.CacheTeselas(str(tmp_path), limite_mb=3.5 * tam / (1024 * 1024))
+    for k, clave in enumerate(claves[:3]):
+        c.put(clave, *_tesela(0))
+        os.utime(c._ruta(clave), (1000 + k, 1000 + k))   # usadas en este orden
+    assert c.get(claves[0]) is not None                  # la más antigua pasa a ser la más reciente
+    c.put(claves[3], *_tesela(0))                       # supera el límite: se expulsa la de uso más antiguo
+    presentes = [os.path.exists(c._ruta(clave)) for clave in claves]
+    assert presentes == [True, False, True, True]
+    assert c._total <= cache.NIVEL_BAJO * c.limite
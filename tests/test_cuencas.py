@@ -0,0 +1,56 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import cheby_halley_cuencas as cuencas
+import cheby_halley_motor as motor
+import cheby_halley_parametros as parametros
+from cheby_halley_nucleo import Params
+
+ALPHAS = [complex(-0.3, 0), complex(2, 0.3), complex(0.2, 0.1), complex(3.2, 0.2)]
+
+
+@pytest.mark.parametrize("iter_max", [10, 30])
+@pytest.mark.parametrize("alpha", ALPHAS)
+def test_radios_no_cambian_el_plano_dinamico(alpha, iter_max):
+    P = Params(width=160, height=120, alpha_re=alpha.real, alpha_im=alpha.imag, iter_max=iter_max,
+               color_escape_mode="hsv", use_cache=False)
+    rep = cuencas.comprobar_radios("dinamico", P)
+    assert rep["distintos"] == 0
+    assert rep["cortadas"] > 0
+    # también las iteraciones de las cuencas, que no intervienen en el color
+    zr, zi = motor.puntos_dinamico(P, 0, P.width)
+    e_a, n_a = motor.iterar_dinamico(zr, zi, alpha, replace(P, basin_radii=False))
+    e_b, n_b = motor.iterar_dinamico(zr, zi, alpha, P)
+    assert np.array_equal(e_a, e_b)
+    assert np.array_equal(n_a, n_b)
+
+
+@pytest.mark.parametrize("iter_max", [10, 30, 200])
+def test_radios_no_cambian_el_plano_de_parametros(iter_max):
+    Q = parametros.PlanoParametros(width=150, height=120, iter_max=iter_max, use_cache=False)
+    rep = cuencas.comprobar_radios("parametros", Q)
+    assert rep["distintos"] == 0
+
+
+@pytest.mark.parametrize("alpha", ALPHAS)
+def test_pasos_acotan_los_de_la_iteracion(alpha):
+    P = Params(alpha_re=alpha.real, alpha_im=alpha.imag)
+    P.finalize()
+    c = 2*(alpha - 1)
+    r0, objetivos, _ = cuencas.radios_dinamico(alpha, P.eps, P.escape, P.basin2_mode)
+    discos = [(0j, cuencas.cotas_cero(c, r0, P.eps), cuencas.pasos_cero, r0)]
+    discos += [(t, cuencas.cotas_fijo(t, c, r, P.eps), cuencas.pasos_fijo, r) for t, r in objetivos if r > P.eps]
+    rng = np.random.default_rng(0)
+    for centro, cotas, pasos, r in discos:
+        for u in rng.random((200, 2)):
+            z = centro + r * u[0] * np.exp(2j*np.pi*u[1])
+            if abs(z - centro) < P.eps:
+                continue
+            j_min, j_max = pasos(abs(z - centro), cotas, P.eps)
+            j = 0
+            while abs(z - centro) >= P.eps:
+                z = z**3 * (z - c) / (1 - c*z)
+                j += 1
+            assert j_min <= j <= j_max
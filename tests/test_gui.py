@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("PIL.ImageTk")
+
+from cheby_halley_dinamico_gui import App  # noqa: E402
+from cheby_halley_nucleo import Params  # noqa: E402
+
+
+class Widget:
+    """Sustituto de un widget de Tk: guarda lo que se le configura."""
+
+    def __init__(self):
+        self.opciones = {}
+
+    def configure(self, **kw):
+        self.opciones.update(kw)
+
+    def __setitem__(self, k, v):
+        self.opciones[k] = v
+
+
+class Raiz:
+    """Sustituto de la ventana: after() no programa nada, sólo apunta la llamada."""
+
+    def __init__(self):
+        self.pendientes = []
+
+    def after(self, ms, fn, *args):
+        self.pendientes.append((fn, args))
+
+
+def app_sin_ventana():
+    """Una App con sus atributos de estado pero sin Tk (no hace falta pantalla)."""
+    app = App.__new__(App)
+    app.root = Raiz()
+    app.P = Params(width=40, height=30, iter_max=30)
+    app.job = None
+    app.gen = 0
+    app._tiles = None
+    app.current_image = app.current_base = app.current_data = None
+    app.last_stats = app.checkpoint = app.view_P = None
+    app.current_full = False
+    app.save_after_render = False
+    app.status = Widget()
+    for nombre in ('btn_cancel', 'btn_save', 'btn_recolor', 'btn_export', 'btn_continue'):
+        setattr(app, nombre, Widget())
+    app.show_stats = SimpleNamespace(get=lambda: False)
+    app._draw_param_marker = lambda: None
+    app._show_image_on_canvas = lambda img: None
+    return app
+
+
+def terminar(app, job):
+    """Espera al hilo y hace los sondeos que haría el bucle de Tk hasta el final."""
+    job.thread.join(timeout=60)
+    assert not job.thread.is_alive()
+    while app.root.pendientes:
+        fn, args = app.root.pendientes.pop(0)
+        fn(*args)
+    app._poll_worker(job)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "python"])
+def test_poll_worker_render_terminado(engine):
+    app = app_sin_ventana()
+    P = Params(width=40, height=30, iter_max=30, engine=engine, use_cache=False)
+    app._start_render(P, full=True)
+    job = app.job
+    terminar(app, job)
+    assert app.job is None
+    assert app.status.opciones["text"].startswith("Listo – render completado")
+    assert app.current_full
+    assert app.current_image.size == (40, 30)
+    assert app.btn_save.opciones["state"] == "normal"
+
+
+def test_poll_worker_guarda_al_terminar():
+    app = app_sin_ventana()
+    guardado = []
+    app.on_save = lambda: guardado.append(True)
+    app.save_after_render = True
+    app._start_render(Params(width=40, height=30, iter_max=30, use_cache=False), full=True)
+    terminar(app, app.job)
+    assert guardado == [True]
+    assert not app.save_after_render
+
+
+def test_poll_worker_ignora_render_sustituido():
+    app = app_sin_ventana()
+    app._start_render(Params(width=40, height=30, iter_max=30, use_cache=False), full=True)
+    viejo = app.job
+    app._start_render(Params(width=40, height=30, iter_max=30, alpha_re=0.5, use_cache=False), full=True)
+    nuevo = app.job
+    assert viejo.stop
+    viejo.thread.join(timeout=60)
+    app._poll_worker(viejo)
+    assert app.job is nuevo
+    terminar(app, nuevo)
+    assert app.view_P.alpha_re == 0.5
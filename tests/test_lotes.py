@@ -0,0 +1,18 @@
+from dataclasses import replace
+
+import cheby_halley_lotes as lotes
+from cheby_halley_nucleo import Params
+
+
+def test_huella_incluye_basin_radii():
+    P = Params()
+    assert "basin_radii" in lotes._huella(P)
+    assert lotes._huella(P) != lotes._huella(replace(P, basin_radii=False))
+
+
+def test_huella_ignora_campos_sin_efecto():
+    P = Params()
+    Q = replace(P, outdir="otra", filename_prefix="x_", workers=8, use_cache=False)
+    assert lotes._huella(P) == lotes._huella(Q)
+    assert lotes._huella(P) == lotes._huella(replace(P, engine="numpy"))
+    assert lotes._huella(P) != lotes._huella(replace(P, engine="float32"))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import cheby_halley_medida as medida
+import cheby_halley_motor as motor
+from cheby_halley_nucleo import Params
+
+
+def _fracciones_por_pixeles(P):
+    etiquetas, _ = motor.clasificar_dinamico(P)
+    conteos = np.bincount(np.take(medida._DESENLACE, etiquetas).ravel(), minlength=len(medida.DESENLACES))
+    return dict(zip(medida.DESENLACES, conteos / etiquetas.size))
+
+
+@pytest.mark.parametrize("alpha", [-0.3, 0.2, 3.2])
+def test_fracciones_como_el_recuento_de_pixeles(alpha):
+    P = Params(alpha_re=alpha, width=600, height=400, use_cache=False)
+    P.finalize()
+    res = medida.medir(P, ancho=0.01, semilla=1)
+    assert res["convergido"]
+    assert sum(res["conteos"].values()) == res["puntos"]
+    pixeles = _fracciones_por_pixeles(P)
+    for d in medida.DESENLACES:
+        lo, hi = res["intervalos"][d]
+        # la rejilla también es una muestra: se admite su propio error de discretización
+        assert lo - 2e-3 <= pixeles[d] <= hi + 2e-3, d
+        assert 2*res["semianchos"][d] <= 0.01
+
+
+def test_misma_semilla_mismo_resultado():
+    P = Params(alpha_re=0.2, use_cache=False)
+    a = medida.medir(P, ancho=0.05, semilla=7)
+    b = medida.medir(P, ancho=0.05, semilla=7)
+    assert a["conteos"] == b["conteos"]
+
+
+def test_max_puntos():
+    res = medida.medir(Params(alpha_re=3.2, use_cache=False), ancho=1e-6, lote=1000, max_puntos=2500)
+    assert res["puntos"] == 2500 and not res["convergido"]
+
+
+def test_intervalo_de_wilson():
+    centro, semiancho = medida.intervalo(0, 100, 1.96)
+    assert centro - semiancho == pytest.approx(0.0, abs=1e-12) and semiancho > 0
+    centro, semiancho = medida.intervalo(50, 100, 1.96)
+    assert centro == pytest.approx(0.5) and semiancho == pytest.approx(0.0961, abs=1e-3)
+
+
+def test_halton():
+    u = medida.halton(1, 8, 2)
+    assert np.allclose(u, [0.5, 0.25, 0.75, 0.125, 0.625, 0.375, 0.875, 0.0625])
@@ -0,0 +1,53 @@
+import pytest
+
+import cheby_halley_motores as motores
+import cheby_halley_parametros as parametros
+import cheby_halley_simple as simple
+from cheby_halley_nucleo import Params, render_plane
+
+ALPHAS = [(-0.3, 0.0), (0.2, 0.1), (3.2, 0.2)]
+
+
+def _dinamico(engine, alpha, **kw):
+    re, im = alpha
+    P = Params(width=80, height=60, alpha_re=re, alpha_im=im, engine=engine, use_cache=False, **kw)
+    return render_plane(P, marks=False).tobytes()
+
+
+@pytest.mark.parametrize("alpha", ALPHAS)
+@pytest.mark.parametrize("opciones", [{}, {"detect_cycles": True}, {"basin2_mode": "one", "color_escape_mode": "#203040"}])
+def test_numpy_igual_que_python_dinamico(alpha, opciones):
+    assert _dinamico("numpy", alpha, **opciones) == _dinamico("python", alpha, **opciones)
+
+
+def test_numpy_igual_que_python_parametros():
+    Q = parametros.PlanoParametros(width=60, height=48, use_cache=False)
+    a = parametros.construir_imagen(Q, motor="numpy")
+    b = parametros.construir_imagen(Q, motor="python")
+    assert a.tobytes() == b.tobytes()
+
+
+@pytest.mark.skipif("numba" not in motores.disponibles(), reason="Numba no está instalado")
+@pytest.mark.parametrize("alpha", ALPHAS)
+def test_numba_igual_que_numpy(alpha):
+    assert _dinamico("numba", alpha) == _dinamico("numpy", alpha)
+
+
+@pytest.mark.parametrize("alpha", ALPHAS)
+def test_float32_cerca_de_doble_precision_dinamico(alpha):
+    re, im = alpha
+    P = Params(width=120, height=80, alpha_re=re, alpha_im=im, use_cache=False)
+    assert simple.comprobar_precision("dinamico", P)["fraccion_distintos"] < 1e-3
+
+
+def test_float32_cerca_de_doble_precision_parametros():
+    Q = parametros.PlanoParametros(width=120, height=96, use_cache=False)
+    assert simple.comprobar_precision("parametros", Q)["fraccion_distintos"] < 1e-2
+
+
+def test_registro():
+    assert motores.exacto("numpy") and motores.exacto("python")
+    assert not motores.exacto("float32")
+    assert motores.usa_arrays("float32") and not motores.usa_arrays("python")
+    with pytest.raises(ValueError):
+        motores.elegir("no-existe")
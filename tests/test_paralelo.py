@@ -0,0 +1,34 @@
+import numpy as np
+
+import cheby_halley_cache
+import cheby_halley_motor as motor
+import cheby_halley_paralelo as paralelo
+import cheby_halley_parametros as parametros
+from cheby_halley_nucleo import Params, render_plane
+
+
+def test_dinamico_con_cuatro_procesos_igual_que_con_uno():
+    P = Params(width=150, height=100, alpha_re=0.2, alpha_im=0.1, use_cache=False)
+    uno = render_plane(P, marks=False)
+    P4 = Params(width=150, height=100, alpha_re=0.2, alpha_im=0.1, use_cache=False, workers=4)
+    assert render_plane(P4, marks=False).tobytes() == uno.tobytes()
+
+
+def test_parametros_con_cuatro_procesos_igual_que_con_uno():
+    Q = parametros.PlanoParametros(width=90, height=72, use_cache=False)
+    a = parametros.construir_imagen(Q, motor="numpy")
+    b = parametros.construir_imagen(Q, motor="numpy", workers=4)
+    assert a.tobytes() == b.tobytes()
+
+
+def test_paralelo_con_cache(tmp_path):
+    # la segunda vez todas las teselas salen de la caché, sin lanzar cálculos
+    P = Params(width=100, height=70, alpha_re=-0.3, use_cache=True)
+    P.finalize()
+    e, n = motor.clasificar_dinamico(P)
+    cache = cheby_halley_cache.CacheTeselas(str(tmp_path))
+    a = paralelo.clasificar_paralelo("dinamico", P, 4, lado=32, cache=cache)
+    b = paralelo.clasificar_paralelo("dinamico", P, 4, lado=32, cache=cache)
+    for res in (a, b):
+        assert np.array_equal(res[0], e) and np.array_equal(res[1], n)
+    assert cache.aciertos > 0
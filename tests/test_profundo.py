@@ -0,0 +1,74 @@
+from dataclasses import replace
+from decimal import Decimal, localcontext
+
+import numpy as np
+import pytest
+
+import cheby_halley_motor as motor
+import cheby_halley_parametros as parametros
+import cheby_halley_profundo as profundo
+from cheby_halley_nucleo import Params
+
+# Puntos de la frontera entre la cuenca de 0 y la de infinito con más cifras que las
+# que pide la vista más pequeña, obtenidos por bisección con la iteración en alta
+# precisión: todas las vistas centradas en ellos tienen las dos cuencas.
+DINAMICO = ("0.9539392024557038381982163002742102806762165914872212609", "0.3")      # alpha = -0.3
+PARAMETROS = ("1.31187236329792012348088510809910441828265515921581499676", "1.3333")
+
+
+def _dinamico():
+    return Params(width=48, height=32, alpha_re=-0.3, iter_max=400, use_cache=False)
+
+
+def _parametros():
+    return parametros.PlanoParametros(width=48, height=40, iter_max=400, use_cache=False)
+
+
+@pytest.mark.parametrize("ancho", [1e-14, 1e-25, 1e-40])
+@pytest.mark.parametrize("plano, centro, params", [("dinamico", DINAMICO, _dinamico),
+                                                   ("parametros", PARAMETROS, _parametros)])
+def test_profundo_igual_que_alta_precision(plano, centro, params, ancho):
+    P = params()
+    etiquetas, _ = profundo.clasificar_profundo(plano, P, *centro, ancho)
+    assert {motor.CUENCA0, motor.ESCAPE} <= set(np.unique(etiquetas).tolist())
+    rep = profundo.comprobar_profundo(plano, P, *centro, ancho, muestras=60)
+    assert rep["distintos"] == 0
+    assert rep["sin_referencia"] == 0
+
+
+@pytest.mark.parametrize("plano, centro, params", [("dinamico", DINAMICO, _dinamico),
+                                                   ("parametros", PARAMETROS, _parametros)])
+def test_profundo_igual_que_doble_precision_a_poco_zoom(plano, centro, params):
+    P = params()
+    ancho = 1e-3
+    e, n = profundo.clasificar_profundo(plano, P, *centro, ancho)
+    x_min, x_max, y_min, y_max = profundo.region(plano, P, *centro, ancho)
+    Q = replace(P, x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
+    clasificar = motor.clasificar_dinamico if plano == "dinamico" else motor.clasificar_parametros
+    e2, n2 = clasificar(Q)
+    # sólo puede cambiar algún píxel pegado a la frontera (la región se redondea a doble)
+    assert (e != e2).sum() <= 2
+
+
+@pytest.mark.parametrize("ancho", [1e-14, 1e-25])
+@pytest.mark.parametrize("plano, centro, params", [("dinamico", DINAMICO, _dinamico),
+                                                   ("parametros", PARAMETROS, _parametros)])
+def test_profundo_con_varias_referencias(plano, centro, params, ancho, monkeypatch):
+    # con el centro a 0.3 anchos de la frontera, la referencia se resuelve antes que los
+    # píxeles más cercanos a ella; con TAU enorme ningún píxel pasa a su propia órbita y
+    # los que se quedan sin referencia necesitan otra
+    with localcontext() as ctx:
+        ctx.prec = 80
+        centro = (str(Decimal(centro[0]) + Decimal(ancho) * Decimal("0.3")), centro[1])
+    esperado, _ = profundo.clasificar_profundo(plano, params(), *centro, ancho)
+    monkeypatch.setattr(profundo, "TAU", 1e6)
+    P = params()
+    contador = {}
+    e, _ = profundo.clasificar_profundo(plano, P, *centro, ancho, contador)
+    assert contador["referencias"] > 1
+    assert contador["propia"] == 0
+    # sin el paso a la propia órbita alguna iteración puede variar en uno por redondeo
+    assert np.array_equal(e, esperado)
+    rep = profundo.comprobar_profundo(plano, P, *centro, ancho, muestras=60)
+    assert rep["distintos"] == 0
+    assert rep["referencias"] > 1
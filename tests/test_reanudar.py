@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import cheby_halley_motor as motor
+import cheby_halley_parametros as parametros
+import cheby_halley_reanudar as reanudar
+from cheby_halley_nucleo import Params, render_plane
+
+
+def _params(iter_max, **kw):
+    return Params(width=90, height=60, alpha_re=0.2, alpha_im=0.1, iter_max=iter_max, use_cache=False, **kw)
+
+
+@pytest.mark.parametrize("opciones", [{}, {"detect_cycles": True}])
+def test_reanudar_dinamico_igual_que_desde_cero(tmp_path, monkeypatch, opciones):
+    monkeypatch.setattr(reanudar, "PUNTOS_POR_LOTE", 1000)   # varios lotes por plano
+    ruta = str(tmp_path / "plano.npz")
+    corto = render_plane(_params(8, **opciones), marks=False, checkpoint=ruta)
+    assert reanudar.cargar(ruta).pendientes() > 0
+    assert corto.tobytes() == render_plane(_params(8, **opciones), marks=False).tobytes()
+    for iter_max in (20, 60):
+        seguido = render_plane(_params(iter_max, **opciones), marks=False, checkpoint=ruta)
+        assert seguido.tobytes() == render_plane(_params(iter_max, **opciones), marks=False).tobytes()
+    assert reanudar.cargar(ruta).iter_max == 60
+
+
+def test_reanudar_parametros_igual_que_desde_cero(tmp_path):
+    ruta = str(tmp_path / "parametros.npz")
+    Q = parametros.PlanoParametros(width=60, height=48, iter_max=10, use_cache=False)
+    parametros.construir_imagen(Q, punto_control=ruta)
+    Q.iter_max = 40
+    seguido = parametros.construir_imagen(Q, punto_control=ruta)
+    assert seguido.tobytes() == parametros.construir_imagen(Q, motor="numpy").tobytes()
+
+
+def test_punto_control_incompatible_empieza_de_cero():
+    P = _params(10)
+    P.finalize()
+    e, n, punto = reanudar.clasificar("dinamico", P)
+    otro = _params(30, eps=1e-4)
+    otro.finalize()
+    assert not reanudar.compatible(punto, "dinamico", otro)
+    e2, n2, _ = reanudar.clasificar("dinamico", otro, punto)
+    e3, n3 = motor.clasificar_dinamico(otro)
+    assert np.array_equal(e2, e3) and np.array_equal(n2, n3)
+
+
+def test_desde_clasificacion():
+    P = _params(10)
+    P.finalize()
+    punto = reanudar.desde_clasificacion("dinamico", P, *motor.clasificar_dinamico(P))
+    Q = _params(40)
+    Q.finalize()
+    e, n, _ = reanudar.clasificar("dinamico", Q, punto)
+    e2, n2 = motor.clasificar_dinamico(Q)
+    assert np.array_equal(e, e2) and np.array_equal(n, n2)
@@ -0,0 +1,125 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import cheby_halley_servidor as servidor
+from cheby_halley_nucleo import Params
+
+
+@pytest.fixture
+def teselas():
+    s = servidor.ServidorTeselas(Params(iter_max=40, engine="numpy"), workers=2)
+    yield s
+    s.cerrar()
+
+
+def _bloquear(s):
+    """Sustituye el cálculo de s por uno que espera a `soltar` y cuenta las llamadas."""
+    soltar = threading.Event()
+    llamadas = []
+
+    def render(k, stop_flag):
+        llamadas.append(k)
+        while not soltar.wait(0.01):
+            if stop_flag():
+                return None
+        return b"png"
+
+    s._render = render
+    return soltar, llamadas
+
+
+def test_peticiones_simultaneas_comparten_el_calculo(teselas):
+    soltar, llamadas = _bloquear(teselas)
+    k = teselas.clave("dinamico", "-0.3,0", 2, 1, 3)
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(teselas.png(k))) for _ in range(5)]
+    for h in hilos:
+        h.start()
+    while teselas.contadores["unidas"] < 4:
+        threading.Event().wait(0.01)
+    soltar.set()
+    for h in hilos:
+        h.join(timeout=10)
+    assert resultados == [b"png"] * 5
+    assert llamadas == [k]
+    assert teselas.contadores["calculadas"] == 1
+    # la siguiente sale de la memoria, sin calcular
+    assert teselas.png(k) == b"png"
+    assert teselas.contadores["de_memoria"] == 1 and llamadas == [k]
+
+
+def test_sin_interesados_se_cancela(teselas):
+    soltar, llamadas = _bloquear(teselas)
+    k = teselas.clave("parametros", "-", 1, 0, 1)
+    t = teselas.pedir(k)
+    teselas.pedir(k)
+    teselas.soltar(k, t)
+    assert not t.cancelado   # aún espera otro cliente
+    teselas.soltar(k, t)
+    assert t.cancelado
+    assert teselas.contadores["canceladas"] == 1
+    assert teselas.estado()["en_curso"] == 0
+    # una petición nueva lanza otro cálculo en lugar de unirse al cancelado
+    soltar.set()
+    assert teselas.png(k) == b"png"
+
+
+@pytest.fixture
+def url(teselas):
+    servidor.Peticion.servidor = teselas
+    http = ThreadingHTTPServer((servidor.HOST, 0), servidor.Peticion)
+    http.daemon_threads = True
+    hilo = threading.Thread(target=http.serve_forever, args=(0.05,), daemon=True)
+    hilo.start()
+    yield f"http://{servidor.HOST}:{http.server_port}"
+    http.shutdown()
+    http.server_close()
+
+
+def test_la_tesela_entra_en_memoria_antes_de_retirar_el_trabajo(teselas):
+    k = teselas.clave("dinamico", "-0.3,0", 1, 0, 0)
+    en_memoria = []
+
+    class Trabajos(dict):
+        def __delitem__(self, clave):
+            en_memoria.append(clave in teselas._memo)
+            super().__delitem__(clave)
+
+    teselas._trabajos = Trabajos()
+    teselas._render = lambda k, stop_flag: b"png"
+    assert teselas.png(k) == b"png"
+    assert en_memoria == [True]
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=30) as r:
+        return r.status, r.headers["Content-Type"], r.read()
+
+
+def test_http_tesela_y_estado(url):
+    estado, tipo, datos = _get(url + "/dinamico/-0.3,0.0/0/0/0.png")
+    assert estado == 200 and tipo == "image/png" and datos.startswith(b"\x89PNG")
+    estado, tipo, datos = _get(url + "/estado")
+    assert json.loads(datos)["calculadas"] == 1
+    assert _get(url + "/")[1].startswith("text/html")
+
+
+@pytest.mark.parametrize("ruta", [
+    "/otro/-0.3,0/0/0/0.png",          # plano desconocido
+    "/dinamico/-0.3,0/1/2/0.png",      # x fuera del nivel
+    "/dinamico/-0.3,0/1/0/-1.png",
+    f"/dinamico/-0.3,0/{servidor.ZOOM_MAX + 1}/0/0.png",
+    "/dinamico/abc/0/0/0.png",         # alpha mal escrito
+    "/dinamico/-0.3,0/0/0/0.jpg",
+    "/dinamico/-0.3,0/0/0.png",
+    "/parametros/-/0/0/x.png",
+])
+def test_http_404(url, ruta):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(url + ruta)
+    assert e.value.code == 404